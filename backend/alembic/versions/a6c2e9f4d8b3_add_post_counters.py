@@ -0,0 +1,46 @@
+"""Add comment_count and reaction_counts to posts
+
+Revision ID: a6c2e9f4d8b3
+Revises: f5a3d8e2b6c1
+Create Date: 2026-02-05 00:00:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c2e9f4d8b3'
+down_revision: Union[str, None] = 'f5a3d8e2b6c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('comment_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('posts', sa.Column('reaction_counts', sa.JSON(), nullable=False, server_default='{}'))
+
+    op.execute(
+        "UPDATE posts SET comment_count = "
+        "(SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id)"
+    )
+
+    bind = op.get_bind()
+    counts = {}
+    for post_id, type_, count in bind.execute(
+        sa.text("SELECT post_id, type, COUNT(*) FROM reactions GROUP BY post_id, type")
+    ):
+        counts.setdefault(post_id, {})[type_] = count
+    if counts:
+        bind.execute(
+            sa.text("UPDATE posts SET reaction_counts = :counts WHERE id = :id"),
+            [{'id': post_id, 'counts': json.dumps(c)} for post_id, c in counts.items()],
+        )
+
+
+def downgrade() -> None:
+    op.drop_column('posts', 'reaction_counts')
+    op.drop_column('posts', 'comment_count')
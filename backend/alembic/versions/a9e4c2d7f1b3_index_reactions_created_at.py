@@ -0,0 +1,25 @@
+"""Index reactions by creation time for the startup counter replay
+
+Revision ID: a9e4c2d7f1b3
+Revises: f1a7c3e9b5d2
+Create Date: 2026-02-11 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e4c2d7f1b3'
+down_revision: Union[str, None] = 'f1a7c3e9b5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_reactions_created_at', 'reactions', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reactions_created_at', table_name='reactions')
@@ -0,0 +1,35 @@
+"""Add parent_comment_id and a (post_id, id) index to comments
+
+Revision ID: b7d1f3a9c2e5
+Revises: a6c2e9f4d8b3
+Create Date: 2026-02-06 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d1f3a9c2e5'
+down_revision: Union[str, None] = 'a6c2e9f4d8b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('comments') as batch_op:
+        batch_op.add_column(sa.Column('parent_comment_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_comments_parent_comment_id', 'comments',
+            ['parent_comment_id'], ['id'], ondelete='CASCADE',
+        )
+    op.create_index('ix_comments_post_id_id', 'comments', ['post_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_post_id_id', table_name='comments')
+    with op.batch_alter_table('comments') as batch_op:
+        batch_op.drop_constraint('fk_comments_parent_comment_id', type_='foreignkey')
+        batch_op.drop_column('parent_comment_id')
@@ -0,0 +1,42 @@
+"""Add coalescing columns and inbox indexes to notifications
+
+Revision ID: c8e2a4b6d1f7
+Revises: b7d1f3a9c2e5
+Create Date: 2026-02-07 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2a4b6d1f7'
+down_revision: Union[str, None] = 'b7d1f3a9c2e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('group_key', sa.String(length=100), nullable=True))
+    op.add_column('notifications', sa.Column('count', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('notifications', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE notifications SET updated_at = created_at")
+    with op.batch_alter_table('notifications') as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+    op.create_index('ix_notifications_user_id_id', 'notifications', ['user_id', 'id'], unique=False)
+    op.create_index(
+        'uq_notifications_unread_group', 'notifications', ['user_id', 'group_key'], unique=True,
+        sqlite_where=sa.text('is_read = 0'), postgresql_where=sa.text('is_read = false'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_notifications_unread_group', table_name='notifications')
+    op.drop_index('ix_notifications_user_id_id', table_name='notifications')
+    with op.batch_alter_table('notifications') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('count')
+        batch_op.drop_column('group_key')
@@ -0,0 +1,78 @@
+"""Add full-text search indexes
+
+Revision ID: d2f6a9c4e1b7
+Revises: c7d4e8f21a3b
+Create Date: 2026-02-02 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6a9c4e1b7'
+down_revision: Union[str, None] = 'c7d4e8f21a3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (fts table, indexed columns, postgres tsvector source)
+SEARCH_TABLES = {
+    'posts': ('posts_fts', ('title', 'content'), "coalesce(title, '') || ' ' || content"),
+    'scene_posts': ('scene_posts_fts', ('content',), 'content'),
+    'characters': (
+        'characters_fts',
+        ('name', 'short_bio', 'long_bio'),
+        "name || ' ' || coalesce(short_bio, '') || ' ' || coalesce(long_bio, '')",
+    ),
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    for table, (fts, columns, source) in SEARCH_TABLES.items():
+        if dialect == 'postgresql':
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('english', {source})) STORED"
+            )
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)"
+            )
+        elif dialect == 'sqlite':
+            cols = ', '.join(columns)
+            new_vals = ', '.join(f'new.{c}' for c in columns)
+            old_vals = ', '.join(f'old.{c}' for c in columns)
+            op.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{cols}, content='{table}', content_rowid='id', tokenize='porter unicode61')"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END"
+            )
+            # Index rows that existed before the triggers
+            op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    for table, (fts, _, _) in SEARCH_TABLES.items():
+        if dialect == 'postgresql':
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+        elif dialect == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
@@ -0,0 +1,35 @@
+"""Add ai_usage table for daily AI quotas
+
+Revision ID: d9f3b5c7e2a8
+Revises: c8e2a4b6d1f7
+Create Date: 2026-02-08 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f3b5c7e2a8'
+down_revision: Union[str, None] = 'c8e2a4b6d1f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ai_usage',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('requests', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('tokens', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ai_usage')
@@ -0,0 +1,32 @@
+"""Add seed_versions ledger
+
+Revision ID: e2b8d4f6a1c9
+Revises: d9f3b5c7e2a8
+Create Date: 2026-02-09 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8d4f6a1c9'
+down_revision: Union[str, None] = 'd9f3b5c7e2a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'seed_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('applied_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('seed_versions')
@@ -0,0 +1,72 @@
+"""Add character_tags and tag_counts
+
+Revision ID: e4b8c1d7f2a9
+Revises: d2f6a9c4e1b7
+Create Date: 2026-02-03 00:00:00.000000
+
+"""
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8c1d7f2a9'
+down_revision: Union[str, None] = 'd2f6a9c4e1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _parse_tags(raw):
+    seen = {}
+    for part in (raw or '').split(','):
+        tag = part.strip().lower()[:50]
+        if tag:
+            seen.setdefault(tag, None)
+    return list(seen)
+
+
+def upgrade() -> None:
+    character_tags = op.create_table(
+        'character_tags',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('character_id', sa.Integer(), nullable=False),
+        sa.Column('tag', sa.String(length=50), nullable=False),
+        sa.ForeignKeyConstraint(['character_id'], ['characters.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('character_id', 'tag', name='uq_character_tags_character_id_tag'),
+    )
+    op.create_index(op.f('ix_character_tags_id'), 'character_tags', ['id'], unique=False)
+    op.create_index('ix_character_tags_tag_character_id', 'character_tags', ['tag', 'character_id'], unique=False)
+
+    tag_counts = op.create_table(
+        'tag_counts',
+        sa.Column('tag', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('tag'),
+    )
+
+    # Backfill from the comma-separated characters.tags column
+    rows = op.get_bind().execute(
+        sa.text("SELECT id, tags, visibility FROM characters WHERE tags IS NOT NULL AND tags != ''")
+    ).fetchall()
+    links = []
+    counts = Counter()
+    for character_id, raw, visibility in rows:
+        tags = _parse_tags(raw)
+        links.extend({'character_id': character_id, 'tag': t} for t in tags)
+        if str(visibility).upper() == 'PUBLIC':
+            counts.update(tags)
+    if links:
+        op.bulk_insert(character_tags, links)
+    if counts:
+        op.bulk_insert(tag_counts, [{'tag': t, 'count': c} for t, c in counts.items()])
+
+
+def downgrade() -> None:
+    op.drop_table('tag_counts')
+    op.drop_index('ix_character_tags_tag_character_id', table_name='character_tags')
+    op.drop_index(op.f('ix_character_tags_id'), table_name='character_tags')
+    op.drop_table('character_tags')
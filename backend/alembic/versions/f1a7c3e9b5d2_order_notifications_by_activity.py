@@ -0,0 +1,29 @@
+"""Index notifications by latest activity for the inbox
+
+Revision ID: f1a7c3e9b5d2
+Revises: e2b8d4f6a1c9
+Create Date: 2026-02-10 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3e9b5d2'
+down_revision: Union[str, None] = 'e2b8d4f6a1c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_notifications_user_id_updated_at_id', 'notifications', ['user_id', 'updated_at', 'id'], unique=False
+    )
+    op.drop_index('ix_notifications_user_id_id', table_name='notifications')
+
+
+def downgrade() -> None:
+    op.create_index('ix_notifications_user_id_id', 'notifications', ['user_id', 'id'], unique=False)
+    op.drop_index('ix_notifications_user_id_updated_at_id', table_name='notifications')
@@ -0,0 +1,34 @@
+"""Add unique constraint on reactions (post_id, user_id, type)
+
+Revision ID: f5a3d8e2b6c1
+Revises: e4b8c1d7f2a9
+Create Date: 2026-02-04 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a3d8e2b6c1'
+down_revision: Union[str, None] = 'e4b8c1d7f2a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Remove duplicates left by the old check-then-insert path, keeping the oldest
+    op.execute(
+        "DELETE FROM reactions WHERE id NOT IN ("
+        "SELECT min_id FROM (SELECT MIN(id) AS min_id FROM reactions GROUP BY post_id, user_id, type) AS keep"
+        ")"
+    )
+    with op.batch_alter_table('reactions') as batch_op:
+        batch_op.create_unique_constraint('uq_reactions_post_id_user_id_type', ['post_id', 'user_id', 'type'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('reactions') as batch_op:
+        batch_op.drop_constraint('uq_reactions_post_id_user_id_type', type_='unique')
@@ -1,32 +1,203 @@
 """AI-powered content generation routes."""
-from fastapi import APIRouter, Depends
+import json
+import time
+from typing import AsyncIterator
+
+import anyio
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from app.core.dependencies import get_current_user
+from app.core.metrics import metrics
 from app.models.user import User
 from app.schemas.ai import (
+    AIJob,
+    AIJobCreate,
+    AIUsage,
     CharacterBioRequest,
     CharacterBioResponse,
     SceneRequest,
     SceneResponse
 )
-from app.services.ai_service import ai_client
+from app.services.ai_cache import generate
+from app.services.ai_jobs import JobQueueFull, TooManyActiveJobs, ai_jobs, load_job
+from app.services.ai_quota import (
+    QuotaExceeded,
+    charge_requests,
+    charge_tokens,
+    estimate_tokens,
+    get_usage,
+    refund_requests,
+    seconds_until_reset
+)
+from app.services.ai_service import AIClient, AIProviderError, get_ai_client
 
 router = APIRouter()
 
 
+def _quota_exceeded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Daily AI quota exceeded",
+        headers={"Retry-After": str(seconds_until_reset())}
+    )
+
+
+async def _charge(user_id: int, requests: int = 1) -> None:
+    try:
+        await charge_requests(user_id, requests)
+    except QuotaExceeded:
+        raise _quota_exceeded()
+
+
 @router.post("/character-bio", response_model=CharacterBioResponse)
-def generate_character_bio(
+async def generate_character_bio(
     request: CharacterBioRequest,
-    current_user: User = Depends(get_current_user)
+    fresh: bool = Query(False, description="Skip the cache and generate a new result"),
+    current_user: User = Depends(get_current_user),
+    ai_client: AIClient = Depends(get_ai_client)
 ) -> CharacterBioResponse:
-    """Generate AI character bio (MVP stub with fake data)."""
-    return ai_client.generate_character_bio(request)
+    """Generate an AI character bio. Identical requests are served from cache."""
+    await _charge(current_user.id)
+    try:
+        response = await generate("character_bio", request, ai_client, refresh=fresh)
+    except AIProviderError:
+        await refund_requests(current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="AI provider unavailable"
+        )
+    await charge_tokens(current_user.id, estimate_tokens(request.model_dump_json(), response.model_dump_json()))
+    return response
 
 
 @router.post("/scene", response_model=SceneResponse)
-def generate_scene(
+async def generate_scene(
     request: SceneRequest,
-    current_user: User = Depends(get_current_user)
+    fresh: bool = Query(False, description="Skip the cache and generate a new result"),
+    current_user: User = Depends(get_current_user),
+    ai_client: AIClient = Depends(get_ai_client)
 ) -> SceneResponse:
-    """Generate AI scene (MVP stub with fake data)."""
-    return ai_client.generate_scene(request)
+    """Generate an AI scene. Identical requests are served from cache."""
+    await _charge(current_user.id)
+    try:
+        response = await generate("scene", request, ai_client, refresh=fresh)
+    except AIProviderError:
+        await refund_requests(current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="AI provider unavailable"
+        )
+    await charge_tokens(current_user.id, estimate_tokens(request.model_dump_json(), response.model_dump_json()))
+    return response
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _scene_events(
+    http_request: Request, request: SceneRequest, ai_client: AIClient, user_id: int
+) -> AsyncIterator[str]:
+    started = time.perf_counter()
+    first_token = True
+    finished = False
+    streamed = []
+    chunks = ai_client.stream_scene(request)
+    try:
+        async for chunk in chunks:
+            if first_token:
+                metrics.observe(
+                    "ai_time_to_first_token_seconds", time.perf_counter() - started, provider=ai_client.provider
+                )
+                first_token = False
+            if await http_request.is_disconnected():
+                break
+            streamed.append(chunk)
+            yield _sse("token", {"text": chunk})
+        else:
+            finished = True
+            yield _sse("done", {})
+    except AIProviderError:
+        finished = True
+        if not streamed:
+            await refund_requests(user_id)
+        yield _sse("error", {"detail": "AI provider unavailable"})
+    finally:
+        # Closing the chunk iterator closes the upstream HTTP stream; shield it
+        # so a cancelled (disconnected) response still gets to clean up
+        with anyio.CancelScope(shield=True):
+            await chunks.aclose()
+            await charge_tokens(user_id, estimate_tokens(request.model_dump_json(), "".join(streamed)))
+        if not finished:
+            metrics.inc("ai_stream_cancelled_total", provider=ai_client.provider)
+
+
+@router.post("/scene/stream")
+async def stream_scene(
+    http_request: Request,
+    request: SceneRequest,
+    current_user: User = Depends(get_current_user),
+    ai_client: AIClient = Depends(get_ai_client)
+) -> StreamingResponse:
+    """Stream an AI scene as Server-Sent Events.
+
+    Emits ``token`` events with ``{"text": ...}`` chunks, then ``done``, or
+    ``error`` if the provider fails. Disconnecting cancels the upstream call.
+    """
+    await _charge(current_user.id)
+    return StreamingResponse(
+        _scene_events(http_request, request, ai_client, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/jobs", response_model=AIJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    job: AIJobCreate = Body(...),
+    current_user: User = Depends(get_current_user),
+    ai_client: AIClient = Depends(get_ai_client)
+) -> AIJob:
+    """Queue a background generation of one or more bios or scenes.
+
+    Poll ``GET /ai/jobs/{id}`` for progress and results. Each item counts
+    against the daily quota.
+    """
+    await _charge(current_user.id, len(job.requests))
+    try:
+        return await ai_jobs.submit(current_user.id, job, ai_client)
+    except TooManyActiveJobs:
+        await refund_requests(current_user.id, len(job.requests))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many AI jobs in progress"
+        )
+    except JobQueueFull:
+        await refund_requests(current_user.id, len(job.requests))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI job queue is full, try again shortly"
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=AIJob)
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+) -> AIJob:
+    """Status, progress and results of one of your AI jobs."""
+    job = await load_job(job_id)
+    if job is None or job.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.get("/usage", response_model=AIUsage)
+async def get_ai_usage(current_user: User = Depends(get_current_user)) -> AIUsage:
+    """Your AI requests and tokens used today, and the daily limits."""
+    return await get_usage(current_user.id)
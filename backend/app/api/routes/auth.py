@@ -11,6 +11,7 @@ from app.core.dependencies import get_current_user
 from app.core.admin_seed import auto_join_commons
 from app.models.user import User as UserModel
 from app.schemas.user import UserCreate, User, Token, LoginRequest
+from app.services.autocomplete import username_index
 
 router = APIRouter()
 
@@ -48,6 +49,7 @@ def register(request: Request, user_data: UserCreate, db: Session = Depends(get_
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    username_index.add(db_user.id, db_user.username)
 
     # Auto-join The Commons
     auto_join_commons(db_user.id, db)
@@ -1,16 +1,28 @@
 """Character routes."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
+from app.core.conditional import make_etag, not_modified, validator_headers
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_current_user_optional
+from app.core.fieldsets import FieldSelector, Fieldset
+from app.core.responses import model_list_response
 from app.models.user import User
-from app.models.character import Character as CharacterModel
-from app.schemas.character import Character, CharacterCreate, CharacterUpdate
+from app.models.character import Character as CharacterModel, VisibilityEnum
+from app.models.character_tag import CharacterTag, TagCount as TagCountModel
+from app.models.post import Post as PostModel
+from app.schemas.autocomplete import Suggestion
+from app.schemas.character import Character, CharacterCreate, CharacterUpdate, TagCount
+from app.services.autocomplete import character_name_index, index_character, unindex_character
+from app.services.character_tags import parse_tags, release_character_tags, sync_character_tags
+from app.services.entity_cache import character_cache, post_cache
 
 router = APIRouter()
 
+character_fields = FieldSelector(Character, CharacterModel, previews=("short_bio", "long_bio"))
+
 
 @router.post("/", response_model=Character, status_code=status.HTTP_201_CREATED)
 def create_character(
@@ -24,35 +36,111 @@ def create_character(
         owner_id=current_user.id
     )
     db.add(db_character)
+    db.flush()
+    sync_character_tags(db, db_character)
     db.commit()
     db.refresh(db_character)
+    index_character(db_character)
     return db_character
 
 
 @router.get("/", response_model=List[Character])
 def list_my_characters(
+    fieldset: Fieldset = Depends(character_fields),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> List[Character]:
+) -> Response:
     """List current user's characters."""
-    characters = db.query(CharacterModel).filter(
+    characters = fieldset.apply(db.query(CharacterModel)).filter(
         CharacterModel.owner_id == current_user.id
     ).all()
-    return characters
+    return model_list_response(fieldset.schema, characters)
+
+
+@router.get("/search", response_model=List[Character])
+def search_characters(
+    tags: Optional[str] = Query(None, description="Comma-separated tags"),
+    match: Literal["all", "any"] = Query("all"),
+    species: Optional[str] = Query(None),
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=100),
+    fieldset: Fieldset = Depends(character_fields),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_db)
+) -> Response:
+    """Find characters by tags (all or any of them) and species.
+
+    Returns public characters, plus the caller's own.
+    """
+    query = fieldset.apply(db.query(CharacterModel))
+
+    visible = [CharacterModel.visibility == VisibilityEnum.PUBLIC]
+    if current_user:
+        visible.append(CharacterModel.owner_id == current_user.id)
+    query = query.filter(or_(*visible))
+
+    wanted = parse_tags(tags)
+    if wanted:
+        tagged = db.query(CharacterTag.character_id).filter(CharacterTag.tag.in_(wanted))
+        if match == "all":
+            tagged = tagged.group_by(CharacterTag.character_id).having(
+                func.count(CharacterTag.tag) == len(wanted)
+            )
+        query = query.filter(CharacterModel.id.in_(tagged))
+
+    if species:
+        query = query.filter(func.lower(CharacterModel.species) == species.strip().lower())
+
+    characters = query.order_by(CharacterModel.id.desc()).offset(skip).limit(limit).all()
+    return model_list_response(fieldset.schema, characters)
+
+
+@router.get("/tags", response_model=List[TagCount])
+def list_popular_tags(
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+) -> List[TagCount]:
+    """Most used tags across public characters, for tag clouds."""
+    return db.query(TagCountModel).order_by(
+        TagCountModel.count.desc(), TagCountModel.tag.asc()
+    ).limit(limit).all()
+
+
+@router.get("/autocomplete", response_model=List[Suggestion])
+def autocomplete_character_names(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1),
+    db: Session = Depends(get_db)
+) -> List[Suggestion]:
+    """Public character names starting with ``q`` (case-insensitive)."""
+    return [Suggestion(id=i, name=n) for i, n in character_name_index.search(db, q, limit)]
 
 
 @router.get("/{character_id}", response_model=Character)
 def get_character(
     character_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ) -> Character:
     """Get a character by ID."""
-    character = db.query(CharacterModel).filter(CharacterModel.id == character_id).first()
+    character = character_cache.get(
+        character_id, lambda: db.query(CharacterModel).filter(CharacterModel.id == character_id).first()
+    )
     if not character:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Character not found"
         )
+    headers = validator_headers(
+        make_etag("character", character.id, character.updated_at),
+        character.updated_at,
+        public=character.visibility == VisibilityEnum.PUBLIC,
+    )
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    response.headers.update(headers)
     return character
 
 
@@ -76,11 +164,18 @@ def update_character(
             detail="Not authorized to update this character"
         )
 
+    old_tags = parse_tags(character.tags)
+    old_name = character.name
+    was_public = character.visibility == VisibilityEnum.PUBLIC
+
     for field, value in character_update.model_dump(exclude_unset=True).items():
         setattr(character, field, value)
 
+    sync_character_tags(db, character, old_tags, was_public)
     db.commit()
+    character_cache.invalidate(character_id)
     db.refresh(character)
+    index_character(character, old_name, was_public)
     return character
 
 
@@ -103,5 +198,11 @@ def delete_character(
             detail="Not authorized to delete this character"
         )
 
+    # Deleting nulls posts.character_id, so their cached copies go too
+    post_ids = list(db.scalars(select(PostModel.id).where(PostModel.character_id == character_id)))
+    release_character_tags(db, character)
     db.delete(character)
     db.commit()
+    character_cache.invalidate(character_id)
+    post_cache.invalidate(*post_ids)
+    unindex_character(character_id)
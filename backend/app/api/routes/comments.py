@@ -1,17 +1,57 @@
 """Comment routes."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.responses import model_list_response
+from app.core.dependencies import get_current_user, parse_id_list
 from app.models.user import User
 from app.models.comment import Comment as CommentModel
 from app.models.post import Post as PostModel
-from app.schemas.comment import Comment, CommentCreate
+from app.schemas.comment import Comment, CommentCreate, PostCommentPreview
+from app.services.notifications import NEW_COMMENT, notifier
+from app.services.post_counters import increment_comment_count
 
 router = APIRouter()
 
+MAX_PREVIEW_POSTS = 100
+
+
+def _with_names(query):
+    """Eager-load the author and character so names serialize without extra queries."""
+    return query.options(
+        joinedload(CommentModel.author_user),
+        joinedload(CommentModel.character),
+    )
+
+
+@router.get("/", response_model=List[PostCommentPreview])
+def preview_comments(
+    post_ids: str = Query(..., description="Comma-separated post IDs (max 100)"),
+    per_post: int = Query(3, ge=1, le=20),
+    db: Session = Depends(get_db)
+) -> List[PostCommentPreview]:
+    """The latest ``per_post`` comments for each of many posts, in one query."""
+    ids = parse_id_list(post_ids, MAX_PREVIEW_POSTS, name="post_ids")
+    ranked = select(
+        CommentModel.id,
+        func.row_number().over(
+            partition_by=CommentModel.post_id,
+            order_by=CommentModel.id.desc(),
+        ).label("rn"),
+    ).where(CommentModel.post_id.in_(ids)).subquery()
+
+    comments = _with_names(db.query(CommentModel)).join(
+        ranked, ranked.c.id == CommentModel.id
+    ).filter(ranked.c.rn <= per_post).order_by(CommentModel.id.asc()).all()
+
+    by_post: dict[int, list] = {post_id: [] for post_id in ids}
+    for comment in comments:
+        by_post[comment.post_id].append(comment)
+    return [PostCommentPreview(post_id=post_id, comments=by_post[post_id]) for post_id in ids]
+
 
 @router.post("/posts/{post_id}/comments", response_model=Comment, status_code=status.HTTP_201_CREATED)
 def create_comment(
@@ -29,24 +69,53 @@ def create_comment(
             detail="Post not found"
         )
 
+    if comment_data.parent_comment_id is not None:
+        parent = db.query(CommentModel.post_id).filter(
+            CommentModel.id == comment_data.parent_comment_id
+        ).first()
+        if not parent or parent.post_id != post_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Parent comment not found on this post"
+            )
+
     db_comment = CommentModel(
         **comment_data.model_dump(),
         post_id=post_id,
         author_user_id=current_user.id
     )
     db.add(db_comment)
+    increment_comment_count(db, post_id)
     db.commit()
     db.refresh(db_comment)
+    notifier.publish(NEW_COMMENT, current_user.id, post_id=post_id, comment_id=db_comment.id)
     return db_comment
 
 
 @router.get("/posts/{post_id}/comments", response_model=List[Comment])
 def list_post_comments(
     post_id: int,
+    after_id: Optional[int] = Query(None, description="Return comments after this comment ID"),
+    limit: int = Query(50, ge=1, le=100),
+    parent_comment_id: Optional[int] = Query(None, description="Only replies to this comment"),
+    top_level: bool = Query(False, description="Only comments that are not replies"),
     db: Session = Depends(get_db)
-) -> List[Comment]:
-    """List comments on a post."""
-    comments = db.query(CommentModel).filter(
-        CommentModel.post_id == post_id
-    ).order_by(CommentModel.created_at.asc()).all()
-    return comments
+) -> Response:
+    """List comments on a post, oldest first.
+
+    Paginate by passing the ``X-Next-Cursor`` response header back as ``after_id``.
+    """
+    query = _with_names(db.query(CommentModel)).filter(CommentModel.post_id == post_id)
+    if parent_comment_id is not None:
+        query = query.filter(CommentModel.parent_comment_id == parent_comment_id)
+    elif top_level:
+        query = query.filter(CommentModel.parent_comment_id.is_(None))
+    if after_id is not None:
+        query = query.filter(CommentModel.id > after_id)
+
+    comments = query.order_by(CommentModel.id.asc()).limit(limit + 1).all()
+    headers = {}
+    if len(comments) > limit:
+        comments = comments[:limit]
+        headers["X-Next-Cursor"] = str(comments[-1].id)
+    return model_list_response(Comment, comments, headers=headers)
@@ -0,0 +1,77 @@
+"""Notification routes."""
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.responses import model_list_response
+from app.core.dependencies import get_current_user
+from app.models.notification import Notification as NotificationModel
+from app.models.user import User
+from app.schemas.notification import MarkRead, Notification, UnreadCount
+from app.services.notifications import get_unread_count, inbox_position, mark_read_up_to
+
+router = APIRouter()
+
+
+def _encode_cursor(notification: NotificationModel) -> str:
+    return f"{notification.updated_at.isoformat()}_{notification.id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        updated_at, notification_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(updated_at), int(notification_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+@router.get("/", response_model=List[Notification])
+def list_notifications(
+    before: Optional[str] = Query(None, description="Cursor from X-Next-Cursor"),
+    limit: int = Query(20, ge=1, le=100),
+    unread_only: bool = Query(False),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Response:
+    """List the current user's notifications, most recent activity first.
+
+    A coalesced group moves back to the top when it gains activity.
+    Paginate by passing the ``X-Next-Cursor`` response header back as ``before``.
+    """
+    query = db.query(NotificationModel).filter(NotificationModel.user_id == current_user.id)
+    if unread_only:
+        query = query.filter(NotificationModel.is_read.is_(False))
+    if before is not None:
+        query = query.filter(inbox_position() < tuple_(*_decode_cursor(before)))
+
+    notifications = query.order_by(
+        NotificationModel.updated_at.desc(), NotificationModel.id.desc()
+    ).limit(limit + 1).all()
+    headers = {}
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        headers["X-Next-Cursor"] = _encode_cursor(notifications[-1])
+    return model_list_response(Notification, notifications, headers=headers)
+
+
+@router.get("/unread-count", response_model=UnreadCount)
+def unread_count(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> UnreadCount:
+    """Unread notification count for the header badge (cached per user)."""
+    return UnreadCount(unread_count=get_unread_count(db, current_user.id))
+
+
+@router.post("/read", response_model=UnreadCount)
+def mark_read(
+    data: MarkRead,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> UnreadCount:
+    """Mark notifications up to ``up_to_id`` (in inbox order) as read; returns the new unread count."""
+    mark_read_up_to(db, current_user.id, data.up_to_id, data.updated_at)
+    return UnreadCount(unread_count=get_unread_count(db, current_user.id))
@@ -1,26 +1,51 @@
 """Post routes."""
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session, selectinload
 
+from app.core.conditional import make_etag, not_modified, validator_headers
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.fieldsets import FieldSelector, Fieldset
+from app.core.responses import model_list_response
+from app.core.dependencies import get_current_user, get_current_user_optional
 from app.core.admin_seed import auto_join_commons
 from app.models.user import User
 from app.models.post import Post as PostModel
 from app.models.realm import Realm as RealmModel, RealmMembership as RealmMembershipModel
 from app.schemas.post import Post, PostCreate
+from app.services.entity_cache import post_cache
+from app.services.reactions import summarize_reactions
+from app.services.realm_cache import get_realm_by_id
 
 router = APIRouter()
 
+post_fields = FieldSelector(Post, PostModel, previews=("content",))
+
+
+def _post_list_response(
+    db: Session, posts: List[PostModel], fieldset: Fieldset, include_reactions: bool, user_id: Optional[int]
+) -> Response:
+    """Serialize posts with the requested fields, adding reaction summaries if asked."""
+    if not include_reactions or "reaction_summary" not in fieldset:
+        return model_list_response(fieldset.schema, posts)
+    summaries = summarize_reactions(db, [p.id for p in posts], user_id)
+    results = []
+    for p in posts:
+        out = fieldset.schema.model_validate(p)
+        out.reaction_summary = summaries[p.id]
+        results.append(out)
+    return model_list_response(fieldset.schema, results)
+
 
 @router.get("/feed", response_model=List[Post])
 def get_feed(
     skip: int = 0,
     limit: int = 50,
+    include_reactions: bool = Query(False),
+    fieldset: Fieldset = Depends(post_fields),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> List[Post]:
+) -> Response:
     """Get feed of posts from realms the user is a member of."""
     # Fallback: ensure user is a member of The Commons
     auto_join_commons(current_user.id, db)
@@ -33,16 +58,16 @@ def get_feed(
     realm_ids = [m.realm_id for m in memberships]
 
     if not realm_ids:
-        return []
+        return model_list_response(fieldset.schema, [])
 
     # Get posts from those realms, eager-load author for username
-    posts = db.query(PostModel).options(
+    posts = fieldset.apply(db.query(PostModel)).options(
         selectinload(PostModel.author_user)
     ).filter(
         PostModel.realm_id.in_(realm_ids)
     ).order_by(PostModel.created_at.desc()).offset(skip).limit(limit).all()
 
-    return posts
+    return _post_list_response(db, posts, fieldset, include_reactions, current_user.id)
 
 
 @router.post("/realms/{realm_id}/posts", response_model=Post, status_code=status.HTTP_201_CREATED)
@@ -81,31 +106,50 @@ def list_realm_posts(
     realm_id: int,
     skip: int = 0,
     limit: int = 50,
+    include_reactions: bool = Query(False),
+    fieldset: Fieldset = Depends(post_fields),
+    current_user: Optional[User] = Depends(get_current_user_optional),
     db: Session = Depends(get_db)
-) -> List[Post]:
+) -> Response:
     """List posts in a realm."""
-    posts = db.query(PostModel).options(
+    posts = fieldset.apply(db.query(PostModel)).options(
         selectinload(PostModel.author_user)
     ).filter(
         PostModel.realm_id == realm_id
     ).order_by(PostModel.created_at.desc()).offset(skip).limit(limit).all()
-    return posts
+
+    user_id = current_user.id if current_user else None
+    return _post_list_response(db, posts, fieldset, include_reactions, user_id)
 
 
 @router.get("/{post_id}", response_model=Post)
 def get_post(
     post_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ) -> Post:
     """Get a single post."""
-    post = db.query(PostModel).options(
+    post = post_cache.get(post_id, lambda: db.query(PostModel).options(
         selectinload(PostModel.author_user)
-    ).filter(PostModel.id == post_id).first()
+    ).filter(PostModel.id == post_id).first())
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
+    # Only posts in public realms may be stored by shared caches
+    realm = get_realm_by_id(db, post.realm_id) if post.realm_id is not None else None
+    public = post.realm_id is None or (realm is not None and realm.is_public)
+    # Counter updates leave updated_at alone, so the counters are part of the ETag
+    headers = validator_headers(
+        make_etag("post", post.id, post.updated_at, post.comment_count, post.reaction_counts),
+        public=public,
+    )
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    response.headers.update(headers)
     return post
 
 
@@ -130,3 +174,4 @@ def delete_post(
 
     db.delete(post)
     db.commit()
+    post_cache.invalidate(post_id)
@@ -1,16 +1,57 @@
 """Reaction routes."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_current_user_optional, parse_id_list
 from app.models.user import User
 from app.models.reaction import Reaction as ReactionModel
-from app.models.post import Post as PostModel
-from app.schemas.reaction import Reaction, ReactionCreate
+from app.schemas.reaction import Reaction, ReactionCreate, ReactionSummary, ReactionToggle
+from app.services.reactions import (
+    find_reaction,
+    insert_reaction,
+    remove_reaction,
+    summarize_reactions,
+)
+from app.services.reaction_buffer import record_reaction_delta
+from app.services.notifications import NEW_REACTION, notifier
 
 router = APIRouter()
 
+MAX_SUMMARY_POSTS = 100
+
+
+def _add_reaction(db: Session, post_id: int, user_id: int, type: str):
+    """Insert a reaction, falling back to the existing one; 404 if the post is missing.
+
+    Returns ``(reaction, created)``.
+    """
+    reaction = insert_reaction(db, post_id, user_id, type)
+    if reaction is not None:
+        record_reaction_delta(db, post_id, type, 1)
+        return reaction, True
+
+    reaction = find_reaction(db, post_id, user_id, type)
+    if reaction is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found"
+        )
+    return reaction, False
+
+
+@router.get("/summary", response_model=List[ReactionSummary])
+def get_reaction_summaries(
+    post_ids: str = Query(..., description="Comma-separated post IDs (max 100)"),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_db)
+) -> List[ReactionSummary]:
+    """Reaction counts per type, plus the caller's own reactions, for many posts."""
+    ids = parse_id_list(post_ids, MAX_SUMMARY_POSTS, name="post_ids")
+    summaries = summarize_reactions(db, ids, current_user.id if current_user else None)
+    return [summaries[post_id] for post_id in ids]
+
 
 @router.post("/posts/{post_id}/reactions", response_model=Reaction, status_code=status.HTTP_201_CREATED)
 def create_reaction(
@@ -19,34 +60,32 @@ def create_reaction(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> Reaction:
-    """Add a reaction to a post."""
-    # Check if post exists
-    post = db.query(PostModel).filter(PostModel.id == post_id).first()
-    if not post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Post not found"
-        )
+    """Add a reaction to a post. Reacting twice with the same type is a no-op."""
+    reaction, created = _add_reaction(db, post_id, current_user.id, reaction_data.type)
+    db.commit()
+    if created:
+        notifier.publish(NEW_REACTION, current_user.id, post_id=post_id, reaction_type=reaction_data.type)
+    return reaction
+
+
+@router.post("/posts/{post_id}/reactions/toggle", response_model=ReactionToggle)
+def toggle_reaction(
+    post_id: int,
+    reaction_data: ReactionCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> ReactionToggle:
+    """Remove the caller's reaction of this type if present, otherwise add it."""
+    if remove_reaction(db, post_id, current_user.id, reaction_data.type):
+        record_reaction_delta(db, post_id, reaction_data.type, -1)
+        db.commit()
+        return ReactionToggle(reacted=False)
 
-    # Check if user already reacted with this type
-    existing_reaction = db.query(ReactionModel).filter(
-        ReactionModel.post_id == post_id,
-        ReactionModel.user_id == current_user.id,
-        ReactionModel.type == reaction_data.type
-    ).first()
-
-    if existing_reaction:
-        return existing_reaction
-
-    db_reaction = ReactionModel(
-        **reaction_data.model_dump(),
-        post_id=post_id,
-        user_id=current_user.id
-    )
-    db.add(db_reaction)
+    reaction, created = _add_reaction(db, post_id, current_user.id, reaction_data.type)
     db.commit()
-    db.refresh(db_reaction)
-    return db_reaction
+    if created:
+        notifier.publish(NEW_REACTION, current_user.id, post_id=post_id, reaction_type=reaction_data.type)
+    return ReactionToggle(reacted=True, reaction=Reaction.model_validate(reaction))
 
 
 @router.delete("/{reaction_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -68,5 +107,6 @@ def delete_reaction(
             detail="Not authorized to delete this reaction"
         )
 
+    record_reaction_delta(db, reaction.post_id, reaction.type, -1)
     db.delete(reaction)
     db.commit()
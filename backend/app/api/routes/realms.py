@@ -1,17 +1,30 @@
 """Realm routes."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
+from app.core.conditional import make_etag, not_modified, validator_headers
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.realm import Realm as RealmModel, RealmMembership as RealmMembershipModel
 from app.schemas.realm import Realm, RealmCreate, RealmMembership
+from app.services.realm_cache import (
+    get_public_realms,
+    get_realm_by_id,
+    get_realm_by_slug,
+    invalidate_realms,
+)
 
 router = APIRouter()
 
 
+def _realm_headers(realm: Realm) -> dict[str, str]:
+    return validator_headers(
+        make_etag("realm", realm.id, realm.updated_at), realm.updated_at, public=realm.is_public
+    )
+
+
 @router.post("/", response_model=Realm, status_code=status.HTTP_201_CREATED)
 def create_realm(
     realm_data: RealmCreate,
@@ -43,17 +56,42 @@ def create_realm(
     )
     db.add(membership)
     db.commit()
+    invalidate_realms()
 
     return db_realm
 
 
 @router.get("/", response_model=List[Realm])
 def list_realms(
+    request: Request,
+    response: Response,
     search: Optional[str] = Query(None),
     public_only: bool = Query(True),
     db: Session = Depends(get_db)
 ) -> List[Realm]:
-    """List realms with optional search."""
+    """List realms with optional search.
+
+    The plain public listing is the realm browse page's default view and is
+    served from the realm cache, with an ETag over its count, newest id and
+    latest update.
+    """
+    if public_only and not search:
+        realms = get_public_realms(db)
+        headers = validator_headers(
+            make_etag(
+                "realms",
+                len(realms),
+                max((r.id for r in realms), default=0),
+                max((r.updated_at for r in realms), default=None),
+            ),
+            public=True,
+        )
+        unchanged = not_modified(request, headers)
+        if unchanged is not None:
+            return unchanged
+        response.headers.update(headers)
+        return realms
+
     query = db.query(RealmModel)
 
     if public_only:
@@ -66,18 +104,47 @@ def list_realms(
     return realms
 
 
+@router.get("/by-slug/{slug}", response_model=Realm)
+def get_realm_slug(
+    slug: str,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+) -> Realm:
+    """Get a realm by slug."""
+    realm = get_realm_by_slug(db, slug)
+    if not realm:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Realm not found"
+        )
+    headers = _realm_headers(realm)
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    response.headers.update(headers)
+    return realm
+
+
 @router.get("/{realm_id}", response_model=Realm)
 def get_realm(
     realm_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ) -> Realm:
     """Get a realm by ID."""
-    realm = db.query(RealmModel).filter(RealmModel.id == realm_id).first()
+    realm = get_realm_by_id(db, realm_id)
     if not realm:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Realm not found"
         )
+    headers = _realm_headers(realm)
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    response.headers.update(headers)
     return realm
 
 
@@ -1,18 +1,23 @@
 """Scene routes."""
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func
 
+from app.core.conditional import make_etag, not_modified, validator_headers
 from app.core.database import get_db
+from app.core.responses import model_list_response
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.scene import Scene as SceneModel, SceneVisibilityEnum
 from app.models.scene_post import ScenePost as ScenePostModel
+from app.models.character import Character as CharacterModel
 from app.models.realm import RealmMembership as RealmMembershipModel
 from app.schemas.scene import SceneCreate, SceneOut
 from app.schemas.scene_post import ScenePostCreate, ScenePostOut
+from app.services.entity_cache import scene_cache
+from app.services.notifications import NEW_SCENE_POST, notifier
 
 router = APIRouter()
 
@@ -30,7 +35,7 @@ def _require_realm_membership(db: Session, user_id: int, realm_id: int) -> None:
         )
 
 
-def _check_scene_access(scene: SceneModel, user_id: int) -> None:
+def _check_scene_access(scene: Union[SceneModel, SceneOut], user_id: int) -> None:
     """Raise 403 if user cannot access a scene based on visibility."""
     if scene.visibility == SceneVisibilityEnum.PRIVATE:
         if scene.created_by_user_id != user_id:
@@ -55,6 +60,18 @@ def _scene_to_out(scene: SceneModel, post_count: int) -> SceneOut:
     )
 
 
+def _load_scene(db: Session, scene_id: int) -> Optional[SceneOut]:
+    """Fetch a scene with its post count, through the entity cache."""
+    def load() -> Optional[SceneOut]:
+        scene = db.query(SceneModel).filter(SceneModel.id == scene_id).first()
+        if not scene:
+            return None
+        count = db.query(func.count(ScenePostModel.id)).filter(ScenePostModel.scene_id == scene.id).scalar() or 0
+        return _scene_to_out(scene, count)
+
+    return scene_cache.get(scene_id, load)
+
+
 @router.post("/", response_model=SceneOut, status_code=status.HTTP_201_CREATED)
 def create_scene(
     data: SceneCreate,
@@ -112,11 +129,13 @@ def list_scenes(
 @router.get("/{scene_id}", response_model=SceneOut)
 def get_scene(
     scene_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> SceneOut:
     """Get a single scene."""
-    scene = db.query(SceneModel).filter(SceneModel.id == scene_id).first()
+    scene = _load_scene(db, scene_id)
     if not scene:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Scene not found")
 
@@ -124,18 +143,25 @@ def get_scene(
         _require_realm_membership(db, current_user.id, scene.realm_id)
     _check_scene_access(scene, current_user.id)
 
-    count = db.query(func.count(ScenePostModel.id)).filter(ScenePostModel.scene_id == scene.id).scalar() or 0
-    return _scene_to_out(scene, count)
+    # New turns change post_count without touching updated_at, so there is no
+    # Last-Modified to offer; the ETag covers both
+    headers = validator_headers(make_etag("scene", scene.id, scene.updated_at, scene.post_count))
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    response.headers.update(headers)
+    return scene
 
 
 @router.get("/{scene_id}/posts", response_model=List[ScenePostOut])
 def list_scene_posts(
     scene_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> List[ScenePostOut]:
+) -> Response:
     """List all posts (turns) in a scene, ordered chronologically."""
-    scene = db.query(SceneModel).filter(SceneModel.id == scene_id).first()
+    scene = _load_scene(db, scene_id)
     if not scene:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Scene not found")
 
@@ -143,6 +169,24 @@ def list_scene_posts(
         _require_realm_membership(db, current_user.id, scene.realm_id)
     _check_scene_access(scene, current_user.id)
 
+    # Turns are append-only; the transcript changes when one is added or
+    # deleted, or when a character it shows is renamed or deleted
+    summary = (
+        db.query(
+            func.count(ScenePostModel.id),
+            func.max(ScenePostModel.id),
+            func.count(ScenePostModel.character_id),
+            func.max(CharacterModel.updated_at),
+        )
+        .outerjoin(CharacterModel, ScenePostModel.character_id == CharacterModel.id)
+        .filter(ScenePostModel.scene_id == scene_id)
+        .one()
+    )
+    headers = validator_headers(make_etag("scene_posts", scene_id, *summary))
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+
     posts = (
         db.query(ScenePostModel)
         .options(selectinload(ScenePostModel.author), selectinload(ScenePostModel.character))
@@ -151,20 +195,7 @@ def list_scene_posts(
         .all()
     )
 
-    return [
-        ScenePostOut(
-            id=p.id,
-            scene_id=p.scene_id,
-            author_user_id=p.author_user_id,
-            author_username=p.author.username if p.author else None,
-            character_id=p.character_id,
-            character_name=p.character.name if p.character else None,
-            content=p.content,
-            reply_to_id=p.reply_to_id,
-            created_at=p.created_at,
-        )
-        for p in posts
-    ]
+    return model_list_response(ScenePostOut, posts, headers=headers)
 
 
 @router.post("/{scene_id}/posts", response_model=ScenePostOut, status_code=status.HTTP_201_CREATED)
@@ -192,7 +223,9 @@ def create_scene_post(
     )
     db.add(post)
     db.commit()
+    scene_cache.invalidate(scene_id)  # post_count changed
     db.refresh(post)
+    notifier.publish(NEW_SCENE_POST, current_user.id, scene_id=scene_id, scene_post_id=post.id)
 
     # Eager load for response
     db.refresh(post, attribute_names=["author", "character"])
@@ -0,0 +1,54 @@
+"""Full-text search routes."""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_user_optional
+from app.models.user import User
+from app.models.post import ContentTypeEnum, PostKindEnum
+from app.schemas.search import SearchHit
+from app.services.search import ALL_KINDS, search as run_search
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[SearchHit])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kinds: Optional[str] = Query(None, description="Comma-separated subset of: post, scene_post, character"),
+    realm_id: Optional[int] = Query(None),
+    content_type: Optional[ContentTypeEnum] = Query(None),
+    post_kind: Optional[PostKindEnum] = Query(None),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+    db: Session = Depends(get_db)
+) -> List[SearchHit]:
+    """Search story content, ranked by relevance with highlighted snippets.
+
+    Only content the caller may read is returned: public realms and realms
+    they belong to, non-private scenes in their realms, and public characters
+    (plus their own).
+    """
+    selected = ALL_KINDS
+    if kinds:
+        selected = tuple(k.strip() for k in kinds.split(",") if k.strip())
+        unknown = set(selected) - set(ALL_KINDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search kinds: {', '.join(sorted(unknown))}"
+            )
+
+    return run_search(
+        db,
+        q,
+        user_id=current_user.id if current_user else None,
+        kinds=selected,
+        realm_id=realm_id,
+        content_type=content_type,
+        post_kind=post_kind.value if post_kind else None,
+        limit=limit,
+        offset=offset,
+    )
@@ -1,11 +1,14 @@
 """User routes."""
-from fastapi import APIRouter, Depends
+from typing import List
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User as UserModel
+from app.schemas.autocomplete import Suggestion
 from app.schemas.user import User, UserUpdate
+from app.services.autocomplete import username_index
 
 router = APIRouter()
 
@@ -33,3 +36,13 @@ def update_current_user(
     db.commit()
     db.refresh(current_user)
     return current_user
+
+
+@router.get("/autocomplete", response_model=List[Suggestion])
+def autocomplete_usernames(
+    q: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(10, ge=1),
+    db: Session = Depends(get_db)
+) -> List[Suggestion]:
+    """Usernames starting with ``q`` (case-insensitive), for mention pickers."""
+    return [Suggestion(id=i, name=n) for i, n in username_index.search(db, q, limit)]
@@ -0,0 +1,83 @@
+"""OwlQuill maintenance commands.
+
+Usage (from backend/):
+    python -m app.cli repair-counters
+    python -m app.cli seed [--force]
+    python -m app.cli profile-startup [--top 25]
+"""
+import argparse
+import logging
+
+from app.core.database import SessionLocal
+
+
+def repair_counters(args: argparse.Namespace) -> None:
+    """Recompute denormalized post counters from comments and reactions."""
+    from app.services.post_counters import repair_post_counters
+
+    db = SessionLocal()
+    try:
+        fixed = repair_post_counters(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Repaired counters on {fixed} posts")
+
+
+def seed(args: argparse.Namespace) -> None:
+    """Run pending startup seeds (admin user, Commons, starter content)."""
+    from app.core.seeding import run_seeds
+
+    completed = run_seeds(force=args.force)
+    print(f"Applied seeds: {', '.join(completed) or 'none'}")
+
+
+def profile_startup(args: argparse.Namespace) -> None:
+    """Report import times and lifespan step durations of a cold worker."""
+    import asyncio
+    import time
+
+    from app.core.startup import import_profile, startup_timings
+
+    rows = import_profile()
+    total = next(cumulative for name, _, cumulative in rows if name == "app.main")
+    print(f"import app.main: {total * 1000:.0f} ms (fresh interpreter, -X importtime)")
+    print(f"slowest {args.top} modules by self time:")
+    for name, own, cumulative in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"  {own * 1000:8.1f} ms self {cumulative * 1000:8.1f} ms cumulative  {name}")
+
+    from app.main import app, lifespan
+
+    async def cycle() -> None:
+        async with lifespan(app):
+            pass
+
+    started = time.perf_counter()
+    asyncio.run(cycle())
+    print(f"lifespan startup + shutdown: {(time.perf_counter() - started) * 1000:.0f} ms")
+    for step, seconds in startup_timings.items():
+        print(f"  {seconds * 1000:8.1f} ms  {step}")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="OwlQuill maintenance commands")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    repair = subcommands.add_parser("repair-counters", help=repair_counters.__doc__)
+    repair.add_argument("--batch-size", type=int, default=500)
+    repair.set_defaults(func=repair_counters)
+
+    seed_cmd = subcommands.add_parser("seed", help=seed.__doc__)
+    seed_cmd.add_argument("--force", action="store_true", help="Rerun every seed regardless of the ledger")
+    seed_cmd.set_defaults(func=seed)
+
+    profile = subcommands.add_parser("profile-startup", help=profile_startup.__doc__)
+    profile.add_argument("--top", type=int, default=25)
+    profile.set_defaults(func=profile_startup)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
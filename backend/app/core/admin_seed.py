@@ -1,20 +1,29 @@
 """Admin user and Commons realm seed on startup."""
 import logging
 import os
+from typing import Callable
 
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
 from app.core.security import get_password_hash
+from app.services.realm_cache import invalidate_realms
 from app.models.user import User
 from app.models.realm import Realm as RealmModel, RealmMembership as RealmMembershipModel
 
 logger = logging.getLogger(__name__)
 
 
-def ensure_admin_user() -> None:
+def admin_configured() -> bool:
+    """Whether ADMIN_EMAIL and ADMIN_PASSWORD are both set."""
+    return bool(os.environ.get("ADMIN_EMAIL") and os.environ.get("ADMIN_PASSWORD"))
+
+
+def ensure_admin_user(session_factory: Callable[[], Session] = SessionLocal) -> bool:
     """Ensure admin user exists based on environment variables.
 
+    Returns False if it could not run (not configured, or failed).
+
     Env vars:
         ADMIN_EMAIL (required): Admin email address
         ADMIN_PASSWORD (required): Admin password (will be hashed)
@@ -28,9 +37,9 @@ def ensure_admin_user() -> None:
 
     # Skip if no admin credentials configured
     if not admin_email or not admin_password:
-        return
+        return False
 
-    db: Session = SessionLocal()
+    db: Session = session_factory()
     try:
         existing = db.query(User).filter(User.email == admin_email).first()
 
@@ -52,31 +61,34 @@ def ensure_admin_user() -> None:
             logger.info(f"Admin password reset: {admin_email}")
         else:
             logger.info(f"Admin ensured: {admin_email}")
+        return True
     except Exception as e:
         db.rollback()
         logger.error(f"Failed to ensure admin user: {e}")
+        return False
     finally:
         db.close()
 
 
-def ensure_commons_realm() -> None:
+def ensure_commons_realm(session_factory: Callable[[], Session] = SessionLocal) -> bool:
     """Ensure The Commons realm exists. Called on startup.
 
     Requires at least one user to exist (as owner). If no users exist,
-    the realm will be created on first user registration instead.
+    the realm will be created on first user registration instead and this
+    returns False.
     """
-    db: Session = SessionLocal()
+    db: Session = session_factory()
     try:
         existing = db.query(RealmModel).filter(RealmModel.is_commons == True).first()
         if existing:
             logger.info("The Commons realm ensured")
-            return
+            return True
 
         # Need an owner — use the first available user
         owner = db.query(User).first()
         if not owner:
             logger.info("No users yet — The Commons will be created on first registration")
-            return
+            return False
 
         commons = RealmModel(
             name="The Commons",
@@ -98,10 +110,13 @@ def ensure_commons_realm() -> None:
         )
         db.add(membership)
         db.commit()
+        invalidate_realms()
         logger.info("The Commons realm created")
+        return True
     except Exception as e:
         db.rollback()
         logger.error(f"Failed to ensure Commons realm: {e}")
+        return False
     finally:
         db.close()
 
@@ -113,6 +128,7 @@ def auto_join_commons(user_id: int, db: Session) -> None:
     """
     try:
         commons = db.query(RealmModel).filter(RealmModel.is_commons == True).first()
+        created = False
 
         if not commons:
             # Create The Commons with this user as owner
@@ -128,6 +144,7 @@ def auto_join_commons(user_id: int, db: Session) -> None:
             )
             db.add(commons)
             db.flush()
+            created = True
 
         existing = db.query(RealmMembershipModel).filter(
             RealmMembershipModel.realm_id == commons.id,
@@ -142,5 +159,7 @@ def auto_join_commons(user_id: int, db: Session) -> None:
             )
             db.add(membership)
             db.commit()
+        if created:
+            invalidate_realms()
     except Exception as e:
         logger.error(f"Failed to auto-join Commons for user {user_id}: {e}")
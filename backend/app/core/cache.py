@@ -0,0 +1,279 @@
+"""Pluggable key/value cache with in-process and Redis backends."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+class CacheBackend:
+    """Minimal string key/value cache interface."""
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """Set ``key`` only if it is absent; return whether it was set."""
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def delete_if_equal(self, key: str, value: str) -> bool:
+        """Atomically delete ``key`` only if it holds ``value``; return whether it did."""
+        raise NotImplementedError
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        """Atomically add ``amount``; with ``ttl``, also (re)set the key's expiry."""
+        raise NotImplementedError
+
+    def incr_if_present(self, key: str, amount: int) -> Optional[int]:
+        """Atomically add ``amount`` to an existing integer value, keeping its expiry.
+
+        Returns the new value, or None (changing nothing) if ``key`` is
+        missing or does not hold an integer.
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Thread-safe in-process cache. Entries expire lazily on read.
+
+    With ``max_entries`` set, the least recently used entry is evicted once
+    the cache is full.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self._data: OrderedDict[str, tuple[str, Optional[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _get_live(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._get_live(key)
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._store(key, value, expires_at)
+
+    def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if self._get_live(key) is not None:
+                return False
+            self._store(key, value, expires_at)
+            return True
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def delete_if_equal(self, key: str, value: str) -> bool:
+        with self._lock:
+            if self._get_live(key) != value:
+                return False
+            del self._data[key]
+            return True
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        with self._lock:
+            current = self._get_live(key)
+            if ttl:
+                expires_at = time.monotonic() + ttl
+            else:
+                expires_at = self._data[key][1] if current is not None else None
+            value = int(current or 0) + amount
+            self._store(key, str(value), expires_at)
+            return value
+
+    def incr_if_present(self, key: str, amount: int) -> Optional[int]:
+        with self._lock:
+            current = self._get_live(key)
+            try:
+                value = int(current) + amount
+            except (TypeError, ValueError):
+                return None
+            self._store(key, str(value), self._data[key][1])
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_DELETE_IF_EQUAL = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_INCR_IF_PRESENT = """
+local value = redis.call('get', KEYS[1])
+if value and string.match(value, '^-?%d+$') then
+    return redis.call('incrby', KEYS[1], ARGV[1])
+end
+return false
+"""
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-backed cache shared by all workers."""
+
+    def __init__(self, url: Optional[str] = None, client=None) -> None:
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self._client = client
+        self._delete_if_equal = client.register_script(_DELETE_IF_EQUAL)
+        self._incr_if_present = client.register_script(_INCR_IF_PRESENT)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self._client.set(key, value, ex=ttl or None)
+
+    def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        return bool(self._client.set(key, value, ex=ttl or None, nx=True))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self._client.delete(*keys)
+
+    def delete_if_equal(self, key: str, value: str) -> bool:
+        return bool(self._delete_if_equal(keys=[key], args=[value]))
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        if not ttl:
+            return int(self._client.incrby(key, amount))
+        pipe = self._client.pipeline()  # MULTI/EXEC: both or neither
+        pipe.incrby(key, amount)
+        pipe.expire(key, ttl)
+        return int(pipe.execute()[0])
+
+    def incr_if_present(self, key: str, amount: int) -> Optional[int]:
+        value = self._incr_if_present(keys=[key], args=[amount])
+        return int(value) if value is not None else None
+
+    def clear(self) -> None:
+        self._client.flushdb()
+
+
+class TieredCacheBackend(CacheBackend):
+    """A small in-process LRU in front of a shared backend.
+
+    Reads try the local tier first and copy shared hits into it; writes go
+    to both. Local entries expire after ``local_ttl`` seconds, which bounds
+    how long this process can miss a change made by another worker.
+    """
+
+    def __init__(self, shared: CacheBackend, local_ttl: int, max_entries: int) -> None:
+        self.shared = shared
+        self.local = MemoryCacheBackend(max_entries=max_entries)
+        self.local_ttl = local_ttl
+
+    def _local_ttl(self, ttl: Optional[int]) -> int:
+        return min(ttl, self.local_ttl) if ttl else self.local_ttl
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.local.get(key)
+        if value is None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value, self.local_ttl)
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self.shared.set(key, value, ttl)
+        self.local.set(key, value, self._local_ttl(ttl))
+
+    def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        if not self.shared.add(key, value, ttl):
+            return False
+        self.local.set(key, value, self._local_ttl(ttl))
+        return True
+
+    def delete(self, *keys: str) -> None:
+        self.shared.delete(*keys)
+        self.local.delete(*keys)
+
+    def delete_if_equal(self, key: str, value: str) -> bool:
+        self.local.delete(key)
+        return self.shared.delete_if_equal(key, value)
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        self.local.delete(key)
+        return self.shared.incr(key, amount, ttl)
+
+    def incr_if_present(self, key: str, amount: int) -> Optional[int]:
+        self.local.delete(key)
+        return self.shared.incr_if_present(key, amount)
+
+    def clear(self) -> None:
+        self.shared.clear()
+        self.local.clear()
+
+
+_cache: Optional[CacheBackend] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> CacheBackend:
+    """Return the process-wide cache backend selected by CACHE_BACKEND."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if settings.CACHE_BACKEND == "redis":
+                    _cache = RedisCacheBackend(settings.REDIS_URL)
+                else:
+                    _cache = MemoryCacheBackend()
+    return _cache
+
+
+def namespace_version(namespace: str) -> int:
+    """Return the current version of a cache namespace."""
+    return int(get_cache().get(f"{namespace}:version") or 0)
+
+
+def bump_namespace(namespace: str) -> int:
+    """Invalidate every key in a namespace by moving it to a new version."""
+    return get_cache().incr(f"{namespace}:version")
+
+
+def versioned_key(namespace: str, *parts: object) -> str:
+    """Build a cache key bound to the namespace's current version."""
+    suffix = ":".join(str(p) for p in parts)
+    return f"{namespace}:v{namespace_version(namespace)}:{suffix}"
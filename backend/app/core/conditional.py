@@ -0,0 +1,77 @@
+"""HTTP validators and conditional GET.
+
+Entity ETags hash the identity and version of a row (``id`` plus
+``updated_at``, and any counters that change without touching it). List
+ETags hash a summary such as count, max id and max ``updated_at``. Both are
+computed before the response is serialized, and for lists ideally from an
+aggregate query before any rows are loaded. A request whose
+``If-None-Match`` (or, lacking one, ``If-Modified-Since``) still matches
+gets an empty 304.
+
+ETags are weak: the same JSON may be sent gzip-encoded or not.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+def make_etag(*parts: Any) -> str:
+    """A weak ETag over ``parts`` (JSON-encodable, datetimes allowed)."""
+    digest = hashlib.sha1(json.dumps(parts, default=str, sort_keys=True).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive-UTC or aware datetime as an HTTP date."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None, public: bool = False) -> dict[str, str]:
+    """ETag, Last-Modified and Cache-Control for a response.
+
+    Public resources may be stored by shared caches for
+    HTTP_CACHE_MAX_AGE_SECONDS; everything else must be revalidated by the
+    client and is never stored by shared caches.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if public:
+        headers["Cache-Control"] = f"public, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}"
+    else:
+        headers["Cache-Control"] = "private, no-cache"
+    return headers
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _not_modified_since(if_modified_since: str, last_modified: str) -> bool:
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def not_modified(request: Request, headers: dict[str, str]) -> Optional[Response]:
+    """A 304 carrying ``headers`` if the request's validators still match, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _etag_matches(if_none_match, headers["ETag"])
+    elif "Last-Modified" in headers and "if-modified-since" in request.headers:
+        matched = _not_modified_since(request.headers["if-modified-since"], headers["Last-Modified"])
+    else:
+        matched = False
+    return Response(status_code=304, headers=headers) if matched else None
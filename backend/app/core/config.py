@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./owlquill.db"
     DB_ECHO: bool = False
+    # Run pending seeds (admin, Commons, starter content) at boot; with false,
+    # run "python -m app.cli seed" on deploy instead
+    SEED_ON_STARTUP: bool = True
 
     # Security
     # In production (DEBUG=false), SECRET_KEY must be set via environment.
@@ -30,15 +33,104 @@ class Settings(BaseSettings):
     # Dev default allows common localhost ports and Replit preview domains.
     BACKEND_CORS_ORIGINS: str = ""
 
+    # Production server (python -m app.serve)
+    WEB_CONCURRENCY: int = 0  # worker processes; 0 = one per available CPU
+    WEB_MAX_WORKERS: int = 8  # cap for the automatic worker count
+    THREADPOOL_TOKENS: int = 40  # per-worker threads for sync routes and DB calls
+    GRACEFUL_TIMEOUT_SECONDS: int = 30  # drain window for in-flight requests on SIGTERM
+    KEEPALIVE_SECONDS: int = 5
+
+    # Response compression (gzip, or brotli when the package is installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024  # smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_THREAD_MIN_BYTES: int = 64 * 1024  # compress larger bodies off the event loop
+
     # Rate limiting
     RATE_LIMIT_AUTH: str = "5/minute"  # Auth endpoint rate limit
 
-    # Redis (stubbed for now)
+    # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
-    # AI (stubbed)
+    # Cache - "memory" keeps entries per process, "redis" shares them via REDIS_URL
+    CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    REALM_CACHE_TTL_SECONDS: int = 300
+
+    # Cache-aside for single posts, characters and scenes. With CACHE_BACKEND=redis
+    # a per-process LRU sits in front of Redis and may lag other workers'
+    # writes by up to ENTITY_CACHE_LOCAL_TTL_SECONDS; with memory it is the only tier.
+    ENTITY_CACHE_ENABLED: bool = True
+    ENTITY_CACHE_TTL_SECONDS: int = 300
+    ENTITY_CACHE_LOCAL_TTL_SECONDS: int = 5
+    ENTITY_CACHE_LOCAL_MAX_ENTRIES: int = 5_000
+
+    # Cache-Control max-age for public resources; they always carry an ETag,
+    # so 0 means "store, but revalidate every time"
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 0
+
+    # Reaction counter write-behind buffer. 0 = update posts.reaction_counts
+    # synchronously on every reaction; >0 = aggregate and flush every N ms.
+    REACTION_BUFFER_FLUSH_MS: int = 0
+    # On startup, rebuild counters for posts with reactions newer than this
+    # (covers deltas lost if a worker died before flushing).
+    REACTION_BUFFER_REPLAY_SECONDS: int = 300
+
+    # Autocomplete (in-process prefix indexes)
+    AUTOCOMPLETE_MAX_RESULTS: int = 20
+    AUTOCOMPLETE_REFRESH_SECONDS: int = 30  # how often to pick up rows added by other workers
+    # Without CACHE_BACKEND=redis workers cannot see each other's invalidations,
+    # so indexes of mutable rows are reloaded in full this often instead
+    AUTOCOMPLETE_FULL_RELOAD_SECONDS: int = 600
+
+    # Notifications - "memory" queues events per process, "redis" uses a
+    # Redis stream (REDIS_URL) drained by a consumer group
+    NOTIFICATION_QUEUE: Literal["memory", "redis"] = "memory"
+    NOTIFICATION_STREAM: str = "owlquill:notifications"
+    NOTIFICATION_BATCH_SIZE: int = 500
+    NOTIFICATION_UNREAD_TTL_SECONDS: int = 300  # cached unread badge count
+    # Stream entries a consumer read but did not ack for this long (it died)
+    # are claimed by another worker
+    NOTIFICATION_CLAIM_IDLE_SECONDS: int = 60
+    NOTIFICATION_MAX_DELIVERIES: int = 5  # then a failing event is dropped
+
+    # AI - "fake" needs no network; real providers share one pooled HTTP client
     AI_PROVIDER: Literal["fake", "openai", "anthropic"] = "fake"
     AI_API_KEY: str = ""
+    AI_BASE_URL: str = ""  # empty = provider default
+    AI_MODEL: str = ""  # empty = provider default
+    AI_MAX_CONCURRENCY: int = 8  # concurrent upstream calls per process
+    AI_MAX_RETRIES: int = 3
+    AI_RETRY_BACKOFF_SECONDS: float = 0.5
+    AI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    AI_READ_TIMEOUT_SECONDS: float = 60.0
+    AI_HTTP2: bool = True  # needs h2 (httpx[http2]); falls back to HTTP/1.1 with a warning
+
+    # AI response cache - identical requests are served without a provider call
+    AI_CACHE_ENABLED: bool = True
+    AI_CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    AI_CACHE_TTL_SECONDS: int = 60 * 60 * 24
+    AI_CACHE_MAX_ENTRIES: int = 10_000  # memory backend only (LRU)
+    # Identical in-flight requests always share one provider call per process.
+    # Distributed mode also locks across workers (needs AI_CACHE_BACKEND=redis).
+    AI_SINGLEFLIGHT_DISTRIBUTED: bool = False
+    AI_SINGLEFLIGHT_LOCK_SECONDS: int = 120
+
+    # Background AI jobs (records live in the CACHE_BACKEND)
+    AI_JOB_WORKERS: int = 4
+    AI_JOB_QUEUE_SIZE: int = 100
+    AI_JOB_MAX_ACTIVE_PER_USER: int = 3  # queued + running
+    AI_JOB_RESULT_TTL_SECONDS: int = 60 * 60
+    # Per-user active-job counters expire this long after their last change
+    # or job progress, so jobs lost with a crashed worker stop counting
+    AI_JOB_ACTIVE_TTL_SECONDS: int = 15 * 60
+
+    # Daily per-user AI quotas (UTC days, 0 = unlimited). "memory" counts per
+    # process and flushes to the ai_usage table; "redis" counts in REDIS_URL.
+    AI_DAILY_REQUEST_LIMIT: int = 200
+    AI_DAILY_TOKEN_LIMIT: int = 200_000
+    AI_QUOTA_BACKEND: Literal["memory", "redis"] = "memory"
+    AI_USAGE_FLUSH_SECONDS: float = 10.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
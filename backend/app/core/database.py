@@ -19,6 +19,15 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def dialect_insert(db: Session, model):
+    """Return an INSERT construct supporting ON CONFLICT for the session's dialect."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
 def get_db() -> Generator[Session, None, None]:
     """Dependency for getting database sessions."""
     db = SessionLocal()
@@ -56,3 +56,28 @@ def get_current_user_optional(
         return get_current_user(credentials, db)
     except HTTPException:
         return None
+
+
+def parse_id_list(raw: str, max_items: int, name: str = "ids") -> list[int]:
+    """Parse a comma-separated list of integer IDs from a query parameter.
+
+    Duplicates are dropped while keeping the caller's order.
+    """
+    try:
+        ids = list(dict.fromkeys(int(part) for part in raw.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{name} must be a comma-separated list of integers",
+        )
+    if not ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{name} must not be empty",
+        )
+    if len(ids) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {max_items} {name} allowed",
+        )
+    return ids
@@ -0,0 +1,118 @@
+"""Sparse fieldsets for list endpoints.
+
+``?fields=id,name`` returns only the named fields and ``?exclude=long_bio``
+everything but those. ``?preview_chars=N`` cuts the route's long text fields
+to their first N characters. Unrequested columns are left out of the SELECT
+with ``load_only``, and previews are computed with ``substr`` in SQL (into a
+``query_expression`` named ``<column>_preview`` on the model), so large text
+that the client does not need never leaves the database. ``id`` is always
+returned.
+
+Routes take a ``Fieldset`` from a ``FieldSelector`` dependency, call
+``apply`` on their query and serialize with ``fieldset.schema``.
+"""
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, create_model
+from pydantic.fields import FieldInfo
+from sqlalchemy import func, inspect as sa_inspect
+from sqlalchemy.orm import Query as ORMQuery, load_only, with_expression
+
+ALWAYS = frozenset({"id"})
+
+
+def preview_attr(column: str) -> str:
+    """Name of the model's query_expression holding a preview of ``column``."""
+    return f"{column}_preview"
+
+
+@lru_cache(maxsize=None)
+def _projection(schema: type[BaseModel], fields: frozenset[str], previews: frozenset[str]) -> type[BaseModel]:
+    """A copy of ``schema`` with only ``fields``, reading previews from their expressions."""
+    definitions = {}
+    for name, info in schema.model_fields.items():
+        if name not in fields:
+            continue
+        if name in previews:
+            info = FieldInfo.merge_field_infos(info, validation_alias=preview_attr(name))
+        definitions[name] = (info.annotation, info)
+    return create_model(f"{schema.__name__}Fields", __config__=schema.model_config, **definitions)
+
+
+def _parse(value: Optional[str]) -> frozenset[str]:
+    return frozenset(f.strip() for f in (value or "").split(",") if f.strip())
+
+
+class Fieldset:
+    """The fields one request asked for."""
+
+    def __init__(
+        self,
+        schema: type[BaseModel],
+        model: type,
+        fields: frozenset[str],
+        preview_chars: Optional[int] = None,
+        previews: frozenset[str] = frozenset(),
+    ) -> None:
+        self.model = model
+        self.fields = fields
+        self.preview_chars = preview_chars
+        self.previews = previews & fields if preview_chars else frozenset()
+        if fields == frozenset(schema.model_fields) and not self.previews:
+            self.schema = schema
+        else:
+            self.schema = _projection(schema, fields, self.previews)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.fields
+
+    def apply(self, query: ORMQuery) -> ORMQuery:
+        """Load only the selected columns (plus keys) and compute previews in SQL."""
+        mapper = sa_inspect(self.model)
+        table_columns = [c.key for c in self.model.__table__.columns]
+        keep = [
+            key for key in table_columns
+            if (key in self.fields and key not in self.previews)
+            or mapper.columns[key].primary_key
+            or mapper.columns[key].foreign_keys
+        ]
+        options = []
+        if len(keep) < len(table_columns):
+            options.append(load_only(*(getattr(self.model, key) for key in keep)))
+        for column in self.previews:
+            options.append(with_expression(
+                getattr(self.model, preview_attr(column)),
+                func.substr(getattr(self.model, column), 1, self.preview_chars),
+            ))
+        return query.options(*options) if options else query
+
+
+class FieldSelector:
+    """Dependency reading ``fields``, ``exclude`` and ``preview_chars`` for a schema.
+
+    ``previews`` names the text columns ``preview_chars`` applies to.
+    """
+
+    def __init__(self, schema: type[BaseModel], model: type, previews: tuple[str, ...] = ()) -> None:
+        self.schema = schema
+        self.model = model
+        self.previews = frozenset(previews)
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+        exclude: Optional[str] = Query(None, description="Comma-separated fields to leave out"),
+        preview_chars: Optional[int] = Query(None, ge=1, description="Truncate long text fields to N characters"),
+    ) -> Fieldset:
+        known = frozenset(self.schema.model_fields)
+        wanted, unwanted = _parse(fields), _parse(exclude)
+        unknown = (wanted | unwanted) - known
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        selected = ((wanted or known) - unwanted) | ALWAYS
+        return Fieldset(self.schema, self.model, selected, preview_chars, self.previews)
@@ -0,0 +1,83 @@
+"""In-process metrics exposed in Prometheus text format at ``/metrics``.
+
+Counters only go up; summaries record a count, sum and max of observations
+(e.g. latencies). Values are per process, so scrape each worker separately.
+"""
+import threading
+from collections import defaultdict
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = (
+        k + '="' + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for k, v in key
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class Metrics:
+    """Thread-safe registry of labelled counters and summaries."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, float]] = defaultdict(lambda: defaultdict(float))
+        self._summaries: dict[str, dict[LabelKey, list[float]]] = defaultdict(dict)
+
+    def inc(self, name: str, amount: float = 1, **labels: object) -> None:
+        """Add ``amount`` to a counter."""
+        with self._lock:
+            self._counters[name][_label_key(labels)] += amount
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        """Record one observation in a summary."""
+        key = _label_key(labels)
+        with self._lock:
+            entry = self._summaries[name].setdefault(key, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += value
+            entry[2] = max(entry[2], value)
+
+    def value(self, name: str, **labels: object) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def summary(self, name: str, **labels: object) -> dict[str, float]:
+        """Count, sum and max of a summary."""
+        with self._lock:
+            count, total, peak = self._summaries.get(name, {}).get(_label_key(labels), (0, 0.0, 0.0))
+        return {"count": count, "sum": total, "max": peak}
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name in sorted(self._summaries):
+                lines.append(f"# TYPE {name} summary")
+                for key, (count, total, peak) in sorted(self._summaries[name].items()):
+                    labels = _format_labels(key)
+                    lines.append(f"{name}_count{labels} {count:g}")
+                    lines.append(f"{name}_sum{labels} {total:g}")
+                    lines.append(f"{name}_max{labels} {peak:g}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Forget all values (tests)."""
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+metrics = Metrics()
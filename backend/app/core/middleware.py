@@ -0,0 +1,157 @@
+"""ASGI middleware."""
+import gzip
+from typing import Optional
+
+from anyio import to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+class ApiPrefixMiddleware:
+    """Serve every route under ``/api`` as well as at the root.
+
+    Rather than registering each router twice, requests for ``/api/...``
+    get ``/api`` appended to their ``root_path``, which routing strips
+    before matching. URLs the app builds (redirects, docs) keep the prefix.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str = "/api") -> None:
+        self.app = app
+        self.prefix = prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            mounted = scope.get("root_path", "") + self.prefix
+            path = scope["path"]
+            if path == mounted or path.startswith(mounted + "/"):
+                scope = {**scope, "root_path": mounted}
+        await self.app(scope, receive, send)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str, available: tuple[str, ...]) -> Optional[str]:
+    """Pick the best of ``available`` for an Accept-Encoding header, or None.
+
+    Highest q-value wins; ties go to the earlier (preferred) encoding.
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+        if coding:
+            weights[coding.strip().lower()] = q
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+class CompressionMiddleware:
+    """gzip/brotli-compress complete responses and count bytes per route.
+
+    Responses are compressed when the client accepts an encoding we can
+    produce, the body is at least COMPRESSION_MIN_BYTES of a text-like
+    type, and it is not already encoded. Bodies of COMPRESSION_THREAD_MIN_BYTES
+    or more are compressed in a worker thread so the event loop keeps
+    serving. Streamed responses (several body messages, e.g. SSE) pass
+    through untouched.
+
+    ``http_response_bytes_total{route,encoding}`` counts bytes sent and
+    ``http_response_body_bytes_total{route}`` the bytes before encoding.
+    Must sit inside ApiPrefixMiddleware to see the matched route.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        if settings.COMPRESSION_ENABLED:
+            accept = Headers(scope=scope).get("accept-encoding", "")
+            encoding = negotiate_encoding(accept, available_encodings())
+        start: Optional[Message] = None
+        streaming = False
+
+        def count(sent: int, raw: int, coding: str) -> None:
+            route = _route_label(scope)
+            metrics.inc("http_response_bytes_total", sent, route=route, encoding=coding)
+            metrics.inc("http_response_body_bytes_total", raw, route=route)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, streaming
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if streaming or message.get("more_body", False):
+                if not streaming:
+                    streaming = True
+                    await send(start)
+                count(len(body), len(body), "identity")
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start)
+            raw_size = len(body)
+            compressible = (
+                start["status"] not in (204, 304)
+                and "content-encoding" not in headers
+                and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            )
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+            if compressible and encoding and raw_size >= settings.COMPRESSION_MIN_BYTES:
+                if raw_size >= settings.COMPRESSION_THREAD_MIN_BYTES:
+                    body = await to_thread.run_sync(compress, body, encoding)
+                else:
+                    body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                count(len(body), raw_size, encoding)
+            else:
+                count(raw_size, raw_size, "identity")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
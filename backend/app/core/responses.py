@@ -0,0 +1,32 @@
+"""JSON responses.
+
+ORJSONResponse is the app's default response class. List endpoints that
+return many ORM rows go further with ``model_list_response``: the rows are
+validated into the output schema once (``from_attributes``) and encoded by
+pydantic's serializer, instead of FastAPI validating them again against
+``response_model``, walking the result with ``jsonable_encoder`` and then
+encoding it. Routes keep ``response_model`` for the OpenAPI schema.
+"""
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+def dump_model_list(model: type[BaseModel], items: Iterable[Any]) -> bytes:
+    """Validate ORM rows (or ``model`` instances) as ``model`` and encode them."""
+    adapter = _list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
+
+
+def model_list_response(
+    model: type[BaseModel], items: Iterable[Any], headers: Optional[dict[str, str]] = None
+) -> Response:
+    """A JSON array response of ``items`` serialized as ``model``."""
+    return Response(dump_model_list(model, items), media_type="application/json", headers=headers)
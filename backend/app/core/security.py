@@ -1,22 +1,28 @@
 """Security utilities for password hashing and JWT tokens."""
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from jose import jwt
-from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """The password hashing context, built (and passlib imported) on first use."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -0,0 +1,122 @@
+"""Versioned startup seeding.
+
+Each seed (admin user, Commons realm, starter content) runs once per
+version instead of on every worker boot: ``seed_versions`` records the
+version of each seed that has completed, so a boot with nothing to do costs
+one query. When something is pending the worker takes a Postgres advisory
+lock, so only one worker seeds; the others wait on the lock, re-read the
+ledger and find nothing left. A seed that cannot complete yet (no users
+exist) is not recorded and is retried on the next run.
+
+Bump a seed's version to rerun it; the seeds themselves are idempotent.
+The admin seed is keyed by a hash of the configured admin identity, so
+changing ADMIN_EMAIL or ADMIN_USERNAME creates the new admin on next boot.
+``python -m app.cli seed`` runs the same thing out of band, so deployments
+can set SEED_ON_STARTUP=false.
+"""
+import hashlib
+import logging
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterator, NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.admin_seed import admin_configured, ensure_admin_user, ensure_commons_realm
+from app.core.database import SessionLocal, dialect_insert
+from app.core.starter_seed import ensure_starter_realms_and_posts
+from app.models.seed_version import SeedVersion
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key for pg_advisory_lock
+SEED_LOCK_ID = 0x0A1F_5EED
+
+
+class Seed(NamedTuple):
+    name: str
+    version: int
+    run: Callable[[Callable[[], Session]], bool]
+    always: bool = False  # ignore the ledger (e.g. ADMIN_FORCE_RESET)
+
+
+def admin_seed_name() -> str:
+    """Ledger name of the admin seed for the configured admin identity."""
+    identity = f"{os.environ.get('ADMIN_EMAIL', '')}\0{os.environ.get('ADMIN_USERNAME', 'admin')}"
+    return f"admin_user:{hashlib.sha256(identity.encode()).hexdigest()[:16]}"
+
+
+def configured_seeds() -> list[Seed]:
+    """Seeds that apply in this environment, in run order."""
+    seeds = []
+    if admin_configured():
+        force_reset = os.environ.get("ADMIN_FORCE_RESET", "").lower() == "true"
+        seeds.append(Seed(admin_seed_name(), 1, ensure_admin_user, always=force_reset))
+    seeds.append(Seed("commons_realm", 1, ensure_commons_realm))
+    # Bump when STARTER_REALMS gains realms or posts
+    seeds.append(Seed("starter_content", 1, ensure_starter_realms_and_posts))
+    return seeds
+
+
+def applied_versions(session_factory: Callable[[], Session] = SessionLocal) -> dict[str, int]:
+    db = session_factory()
+    try:
+        return dict(db.query(SeedVersion.name, SeedVersion.version))
+    finally:
+        db.close()
+
+
+def _pending(seeds: list[Seed], applied: dict[str, int]) -> list[Seed]:
+    return [seed for seed in seeds if seed.always or applied.get(seed.name, 0) < seed.version]
+
+
+def _record(session_factory: Callable[[], Session], seed: Seed) -> None:
+    db = session_factory()
+    try:
+        stmt = dialect_insert(db, SeedVersion).values(name=seed.name, version=seed.version, applied_at=datetime.utcnow())
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[SeedVersion.name],
+            set_={"version": stmt.excluded.version, "applied_at": stmt.excluded.applied_at},
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+@contextmanager
+def seed_lock(session_factory: Callable[[], Session] = SessionLocal) -> Iterator[None]:
+    """Hold the cross-worker seed lock (Postgres only; SQLite is single-host)."""
+    db = session_factory()
+    postgres = db.get_bind().dialect.name == "postgresql"
+    try:
+        if postgres:
+            db.execute(text("SELECT pg_advisory_lock(:id)"), {"id": SEED_LOCK_ID})
+        yield
+    finally:
+        if postgres:
+            db.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": SEED_LOCK_ID})
+        db.close()
+
+
+def run_seeds(session_factory: Callable[[], Session] = SessionLocal, force: bool = False) -> list[str]:
+    """Run every pending seed; return the names that completed.
+
+    ``force`` reruns all seeds regardless of the ledger.
+    """
+    seeds = configured_seeds()
+    if not force and not _pending(seeds, applied_versions(session_factory)):
+        return []
+
+    completed = []
+    with seed_lock(session_factory):
+        # Another worker may have seeded while this one waited for the lock
+        pending = seeds if force else _pending(seeds, applied_versions(session_factory))
+        for seed in pending:
+            if seed.run(session_factory):
+                _record(session_factory, seed)
+                completed.append(seed.name)
+            else:
+                logger.info("Seed '%s' incomplete; will retry on next run", seed.name)
+    return completed
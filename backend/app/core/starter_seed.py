@@ -1,10 +1,13 @@
 """Seed starter realms and posts for onboarding (idempotent)."""
 import logging
 import os
+from typing import Callable
 
+from sqlalchemy import exists, select
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
+from app.services.realm_cache import invalidate_realms
 from app.models.user import User
 from app.models.realm import Realm as RealmModel, RealmMembership as RealmMembershipModel
 from app.models.post import Post as PostModel, ContentTypeEnum
@@ -193,13 +196,15 @@ def _seed_marker(slug: str, post_key: str) -> str:
     return f"\n\n[seed:starter:{slug}:{post_key}]"
 
 
-def ensure_starter_realms_and_posts() -> None:
+def ensure_starter_realms_and_posts(session_factory: Callable[[], Session] = SessionLocal) -> bool:
     """Create starter realms and posts if they don't already exist.
 
     Idempotent: uses realm slug for realm dedup and a seed marker in post
-    content for post dedup. Safe to call on every startup.
+    content for post dedup. Existing realms, memberships and markers are
+    looked up with one query each. Returns False if it could not run yet
+    (no users) or failed.
     """
-    db: Session = SessionLocal()
+    db: Session = session_factory()
     try:
         # --- Find an author user ---
         admin_email = os.environ.get("ADMIN_EMAIL")
@@ -210,63 +215,61 @@ def ensure_starter_realms_and_posts() -> None:
             author = db.query(User).order_by(User.id).first()
         if author is None:
             logger.info("Starter seed: no users exist yet — skipping")
-            return
+            return False
 
+        slugs = [realm_def["slug"] for realm_def in STARTER_REALMS]
+        realms = {
+            realm.slug: realm
+            for realm in db.query(RealmModel).filter(RealmModel.slug.in_(slugs))
+        }
         for realm_def in STARTER_REALMS:
-            slug = realm_def["slug"]
-            realm = db.query(RealmModel).filter(RealmModel.slug == slug).first()
-
-            if realm is None:
-                realm = RealmModel(
-                    name=realm_def["name"],
-                    slug=slug,
-                    tagline=realm_def["tagline"],
-                    description=realm_def["description"],
-                    genre=realm_def["genre"],
-                    is_public=True,
-                    is_commons=False,
-                    owner_id=author.id,
-                )
-                db.add(realm)
-                db.flush()  # get realm.id
-                logger.info("Starter seed: created realm '%s'", realm_def["name"])
-            else:
+            if realm_def["slug"] in realms:
                 logger.info("Starter seed: realm '%s' already exists", realm_def["name"])
-
-            # Ensure author membership
-            membership = (
-                db.query(RealmMembershipModel)
-                .filter(
-                    RealmMembershipModel.realm_id == realm.id,
-                    RealmMembershipModel.user_id == author.id,
-                )
-                .first()
+                continue
+            realm = RealmModel(
+                name=realm_def["name"],
+                slug=realm_def["slug"],
+                tagline=realm_def["tagline"],
+                description=realm_def["description"],
+                genre=realm_def["genre"],
+                is_public=True,
+                is_commons=False,
+                owner_id=author.id,
             )
-            if membership is None:
-                db.add(
-                    RealmMembershipModel(
-                        realm_id=realm.id,
-                        user_id=author.id,
-                        role="owner",
-                    )
-                )
-
-            # Seed posts
-            for post_def in realm_def["posts"]:
-                marker = _seed_marker(slug, post_def["key"])
+            db.add(realm)
+            realms[realm_def["slug"]] = realm
+            logger.info("Starter seed: created realm '%s'", realm_def["name"])
+        db.flush()  # get realm ids
+        realm_ids = [realm.id for realm in realms.values()]
 
-                exists = (
-                    db.query(PostModel.id)
-                    .filter(
-                        PostModel.realm_id == realm.id,
-                        PostModel.content.contains(marker),
-                    )
-                    .first()
-                )
-                if exists:
-                    continue
+        # Ensure author membership
+        member_of = {
+            realm_id
+            for (realm_id,) in db.query(RealmMembershipModel.realm_id).filter(
+                RealmMembershipModel.realm_id.in_(realm_ids),
+                RealmMembershipModel.user_id == author.id,
+            )
+        }
+        for realm_id in realm_ids:
+            if realm_id not in member_of:
+                db.add(RealmMembershipModel(realm_id=realm_id, user_id=author.id, role="owner"))
 
-                post = PostModel(
+        # Seed posts: one query reports which markers are already present
+        markers = {
+            _seed_marker(realm_def["slug"], post_def["key"]): (realms[realm_def["slug"]], realm_def, post_def)
+            for realm_def in STARTER_REALMS
+            for post_def in realm_def["posts"]
+        }
+        present = db.execute(select(*(
+            exists().where(PostModel.realm_id == realm.id, PostModel.content.contains(marker))
+            for marker, (realm, _, _) in markers.items()
+        ))).one()
+        existing = {marker for marker, found in zip(markers, present) if found}
+        for marker, (realm, realm_def, post_def) in markers.items():
+            if marker in existing:
+                continue
+            db.add(
+                PostModel(
                     realm_id=realm.id,
                     author_user_id=author.id,
                     character_id=None,
@@ -275,17 +278,20 @@ def ensure_starter_realms_and_posts() -> None:
                     content_type=post_def["content_type"],
                     post_kind=post_def["post_kind"],
                 )
-                db.add(post)
-                logger.info(
-                    "Starter seed: created post '%s' in '%s'",
-                    post_def["title"],
-                    realm_def["name"],
-                )
+            )
+            logger.info(
+                "Starter seed: created post '%s' in '%s'",
+                post_def["title"],
+                realm_def["name"],
+            )
 
         db.commit()
+        invalidate_realms()
         logger.info("Starter seed: complete")
+        return True
     except Exception as e:
         db.rollback()
         logger.error("Starter seed failed: %s", e)
+        return False
     finally:
         db.close()
@@ -0,0 +1,50 @@
+"""Worker cold-start profiling.
+
+The lifespan wraps each startup and shutdown step in ``startup_step`` so
+their durations are kept in ``startup_timings`` and exported as the
+``startup_step_seconds`` metric. ``import_profile`` runs ``python -X
+importtime`` on the app in a fresh interpreter. ``python -m app.cli
+profile-startup`` prints both.
+"""
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.core.metrics import metrics
+
+startup_timings: dict[str, float] = {}
+
+
+@contextmanager
+def startup_step(name: str) -> Iterator[None]:
+    """Time one lifespan step."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        startup_timings[name] = elapsed
+        metrics.observe("startup_step_seconds", elapsed, step=name)
+
+
+def import_profile(module: str = "app.main") -> list[tuple[str, float, float]]:
+    """Import ``module`` in a fresh interpreter under ``-X importtime``.
+
+    Returns ``(module, self_seconds, cumulative_seconds)`` per imported
+    module, in import order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
@@ -1,35 +1,71 @@
 """OwlQuill FastAPI application."""
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import APIRouter, FastAPI
+from anyio import to_thread
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.core.config import settings
-from app.core.admin_seed import ensure_admin_user, ensure_commons_realm
-from app.core.starter_seed import ensure_starter_realms_and_posts
-from app.api.routes import auth, users, characters, realms, posts, comments, reactions, ai, scenes
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.core.middleware import ApiPrefixMiddleware, CompressionMiddleware
+from app.core.seeding import run_seeds
+from app.core.startup import startup_step
+from app.services.ai_jobs import ai_jobs
+from app.services.ai_quota import usage_store
+from app.services.ai_service import close_ai_client
+from app.services.notifications import notifier
+from app.services.reaction_buffer import reaction_buffer, replay_recent_reactions
+from app.api.routes import (
+    auth, users, characters, realms, posts, comments, reactions, notifications, ai, scenes, search,
+)
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
-    ensure_admin_user()
-    ensure_commons_realm()
-    try:
-        ensure_starter_realms_and_posts()
-    except Exception:
-        pass  # logged inside; never crash startup
+    # Threads available to sync routes and other to_thread work in this worker
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_TOKENS
+    if settings.SEED_ON_STARTUP:
+        with startup_step("seed"):
+            try:
+                run_seeds()
+            except Exception:
+                logger.exception("Startup seeding failed")  # never crash startup
+    if reaction_buffer.enabled:
+        with startup_step("reaction_replay"):
+            db = SessionLocal()
+            try:
+                replay_recent_reactions(db, settings.REACTION_BUFFER_REPLAY_SECONDS)
+            finally:
+                db.close()
+            reaction_buffer.start()
+    with startup_step("workers"):
+        notifier.start()
+        usage_store.start()
+        await ai_jobs.start()
     yield
-    # Shutdown (nothing to do)
+    # Shutdown
+    with startup_step("shutdown"):
+        await ai_jobs.stop()
+        usage_store.stop()
+        notifier.stop()
+        reaction_buffer.stop()
+        await close_ai_client()
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add rate limiter state and exception handler
@@ -43,8 +79,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Compress large responses; inside the /api rewrite so it sees the matched route
+app.add_middleware(CompressionMiddleware)
+
+# Serve all routes under /api/* as well
+app.add_middleware(ApiPrefixMiddleware, prefix="/api")
+
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(users.router, prefix="/users", tags=["users"])
@@ -53,21 +96,10 @@ app.include_router(realms.router, prefix="/realms", tags=["realms"])
 app.include_router(posts.router, prefix="/posts", tags=["posts"])
 app.include_router(comments.router, prefix="/comments", tags=["comments"])
 app.include_router(reactions.router, prefix="/reactions", tags=["reactions"])
+app.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 app.include_router(ai.router, prefix="/ai", tags=["ai"])
 app.include_router(scenes.router, prefix="/scenes", tags=["scenes"])
-
-# Mirror all routes under /api/* prefix
-api_router = APIRouter(prefix="/api")
-api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(characters.router, prefix="/characters", tags=["characters"])
-api_router.include_router(realms.router, prefix="/realms", tags=["realms"])
-api_router.include_router(posts.router, prefix="/posts", tags=["posts"])
-api_router.include_router(comments.router, prefix="/comments", tags=["comments"])
-api_router.include_router(reactions.router, prefix="/reactions", tags=["reactions"])
-api_router.include_router(ai.router, prefix="/ai", tags=["ai"])
-api_router.include_router(scenes.router, prefix="/scenes", tags=["scenes"])
-app.include_router(api_router)
+app.include_router(search.router, prefix="/search", tags=["search"])
 
 
 @app.get("/health")
@@ -76,6 +108,12 @@ def health_check() -> dict:
     return {"status": "ok", "service": "owlquill-backend"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics_endpoint() -> str:
+    """Process metrics in Prometheus text format."""
+    return metrics.render()
+
+
 @app.get("/")
 def root() -> dict:
     """Root endpoint."""
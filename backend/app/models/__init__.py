@@ -1,6 +1,7 @@
 """Database models."""
 from app.models.user import User
 from app.models.character import Character, VisibilityEnum
+from app.models.character_tag import CharacterTag, TagCount
 from app.models.realm import Realm, RealmMembership
 from app.models.post import Post, ContentTypeEnum, PostKindEnum
 from app.models.comment import Comment
@@ -8,11 +9,16 @@ from app.models.reaction import Reaction
 from app.models.notification import Notification
 from app.models.scene import Scene, SceneVisibilityEnum
 from app.models.scene_post import ScenePost
+from app.models.ai_usage import AIUsage
+from app.models.seed_version import SeedVersion
+from app.models import search_index  # noqa: F401 - registers full-text index DDL
 
 __all__ = [
     "User",
     "Character",
     "VisibilityEnum",
+    "CharacterTag",
+    "TagCount",
     "Realm",
     "RealmMembership",
     "Post",
@@ -24,4 +30,6 @@ __all__ = [
     "Scene",
     "SceneVisibilityEnum",
     "ScenePost",
+    "AIUsage",
+    "SeedVersion",
 ]
@@ -0,0 +1,18 @@
+"""Per-user daily AI usage model."""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Integer
+
+from app.core.database import Base
+
+
+class AIUsage(Base):
+    """Requests and tokens one user spent on AI generation in one UTC day."""
+
+    __tablename__ = "ai_usage"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    requests = Column(Integer, default=0, nullable=False)
+    tokens = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -1,7 +1,7 @@
 """Character model."""
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 import enum
 
 from app.core.database import Base
@@ -31,12 +31,16 @@ class Character(Base):
     long_bio = Column(Text, nullable=True)
     avatar_url = Column(String, nullable=True)
     portrait_url = Column(String, nullable=True)  # Character portrait for RP sheets
-    tags = Column(String, nullable=True)  # Stored as comma-separated for MVP
+    tags = Column(String, nullable=True)  # Comma-separated; normalized copy in character_tags
     visibility = Column(SQLEnum(VisibilityEnum), default=VisibilityEnum.PUBLIC, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Truncated bios, filled by list queries asking for ?preview_chars
+    short_bio_preview = query_expression()
+    long_bio_preview = query_expression()
 
     # Relationships
     owner = relationship("User", back_populates="characters")
     posts = relationship("Post", back_populates="character")
     comments = relationship("Comment", back_populates="character")
+    tag_links = relationship("CharacterTag", back_populates="character", cascade="all, delete-orphan")
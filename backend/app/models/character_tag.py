@@ -0,0 +1,31 @@
+"""Normalized character tag models."""
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class CharacterTag(Base):
+    """One tag on one character (inverted index over Character.tags)."""
+
+    __tablename__ = "character_tags"
+    __table_args__ = (
+        UniqueConstraint("character_id", "tag", name="uq_character_tags_character_id_tag"),
+        Index("ix_character_tags_tag_character_id", "tag", "character_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    character_id = Column(Integer, ForeignKey("characters.id", ondelete="CASCADE"), nullable=False)
+    tag = Column(String(50), nullable=False)
+
+    # Relationships
+    character = relationship("Character", back_populates="tag_links")
+
+
+class TagCount(Base):
+    """Number of public characters carrying each tag, for tag clouds."""
+
+    __tablename__ = "tag_counts"
+
+    tag = Column(String(50), primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
@@ -1,6 +1,6 @@
 """Comment model."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -10,11 +10,15 @@ class Comment(Base):
     """Comment model for posts."""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_post_id_id", "post_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
     author_user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     character_id = Column(Integer, ForeignKey("characters.id", ondelete="SET NULL"), nullable=True)
+    parent_comment_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -23,3 +27,18 @@ class Comment(Base):
     post = relationship("Post", back_populates="comments")
     author_user = relationship("User", back_populates="comments")
     character = relationship("Character", back_populates="comments")
+    parent = relationship("Comment", remote_side=[id], backref="replies")
+
+    @property
+    def author_username(self) -> str | None:
+        """Return the author's username."""
+        if self.author_user:
+            return self.author_user.username
+        return None
+
+    @property
+    def character_name(self) -> str | None:
+        """Return the name of the character the comment was written as."""
+        if self.character:
+            return self.character.name
+        return None
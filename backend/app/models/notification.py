@@ -1,22 +1,38 @@
 """Notification model."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
 
 
 class Notification(Base):
-    """Notification model (MVP stub)."""
+    """A notification for one user.
+
+    Similar events (e.g. reactions on the same post) share a ``group_key`` and
+    are coalesced into one unread row whose ``count`` grows and whose
+    ``updated_at`` moves forward. The inbox is ordered by (updated_at, id).
+    """
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        # At most one unread row per group; the target of the coalescing upsert
+        Index(
+            "uq_notifications_unread_group", "user_id", "group_key", unique=True,
+            sqlite_where=text("is_read = 0"), postgresql_where=text("is_read = false"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    type = Column(String, nullable=False)  # new_comment, new_post_in_realm, etc.
-    payload = Column(Text, nullable=True)  # JSON stored as text for MVP
+    type = Column(String, nullable=False)  # new_comment, new_reaction, new_scene_post
+    payload = Column(Text, nullable=True)  # JSON of the latest event in the group
+    group_key = Column(String(100), nullable=True)
+    count = Column(Integer, default=1, server_default="1", nullable=False)
     is_read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="notifications")
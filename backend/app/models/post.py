@@ -1,7 +1,7 @@
 """Post model for story snippets/scenes."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Enum as SQLEnum
+from sqlalchemy.orm import query_expression, relationship
 import enum
 
 from app.core.database import Base
@@ -34,8 +34,14 @@ class Post(Base):
     content = Column(Text, nullable=False)
     content_type = Column(SQLEnum(ContentTypeEnum), default=ContentTypeEnum.IC, nullable=False)
     post_kind = Column(String, default="general", nullable=False)
+    # Denormalized counters, maintained by the comment/reaction routes
+    # (see app.services.post_counters for the drift repair job)
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)
+    reaction_counts = Column(JSON, default=dict, nullable=False)  # {"like": 3, "heart": 1}
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Truncated content, filled by list queries asking for ?preview_chars
+    content_preview = query_expression()
 
     # Relationships
     realm = relationship("Realm", back_populates="posts")
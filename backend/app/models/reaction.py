@@ -1,6 +1,6 @@
 """Reaction model."""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -10,6 +10,11 @@ class Reaction(Base):
     """Reaction model for posts."""
 
     __tablename__ = "reactions"
+    __table_args__ = (
+        UniqueConstraint("post_id", "user_id", "type", name="uq_reactions_post_id_user_id_type"),
+        # replay_recent_reactions scans recent rows at startup
+        Index("ix_reactions_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
@@ -25,3 +25,17 @@ class ScenePost(Base):
     author = relationship("User", backref="scene_posts")
     character = relationship("Character", backref="scene_posts")
     reply_to = relationship("ScenePost", remote_side=[id], backref="replies")
+
+    @property
+    def author_username(self) -> str | None:
+        """Return the author's username."""
+        if self.author:
+            return self.author.username
+        return None
+
+    @property
+    def character_name(self) -> str | None:
+        """Return the name of the character the turn was written as."""
+        if self.character:
+            return self.character.name
+        return None
@@ -0,0 +1,73 @@
+"""Full-text search index DDL attached to the content tables.
+
+SQLite gets FTS5 external-content tables kept in sync by triggers; Postgres
+gets a generated ``search_vector`` tsvector column with a GIN index. The
+statements are registered on ``Base.metadata`` so ``create_all``/``drop_all``
+(tests, fresh dev databases) build the same indexes as the migration.
+"""
+from sqlalchemy import DDL, event
+
+from app.core.database import Base
+
+# table -> (fts table, indexed columns)
+SQLITE_FTS_TABLES = {
+    "posts": ("posts_fts", ("title", "content")),
+    "scene_posts": ("scene_posts_fts", ("content",)),
+    "characters": ("characters_fts", ("name", "short_bio", "long_bio")),
+}
+
+# table -> tsvector source expression
+POSTGRES_TSVECTOR_SOURCES = {
+    "posts": "coalesce(title, '') || ' ' || content",
+    "scene_posts": "content",
+    "characters": "name || ' ' || coalesce(short_bio, '') || ' ' || coalesce(long_bio, '')",
+}
+
+
+def sqlite_create_statements(table: str) -> list[str]:
+    """Return the FTS5 table and sync triggers for a content table."""
+    fts, columns = SQLITE_FTS_TABLES[table]
+    cols = ", ".join(columns)
+    new_vals = ", ".join(f"new.{c}" for c in columns)
+    old_vals = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END",
+    ]
+
+
+def sqlite_drop_statements(table: str) -> list[str]:
+    """Return statements that remove the FTS5 table and its triggers."""
+    fts, _ = SQLITE_FTS_TABLES[table]
+    return [
+        f"DROP TRIGGER IF EXISTS {fts}_ai",
+        f"DROP TRIGGER IF EXISTS {fts}_ad",
+        f"DROP TRIGGER IF EXISTS {fts}_au",
+        f"DROP TABLE IF EXISTS {fts}",
+    ]
+
+
+def postgres_create_statements(table: str) -> list[str]:
+    """Return the generated tsvector column and GIN index for a content table."""
+    source = POSTGRES_TSVECTOR_SOURCES[table]
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('english', {source})) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)",
+    ]
+
+
+for _table in SQLITE_FTS_TABLES:
+    for _stmt in sqlite_create_statements(_table):
+        event.listen(Base.metadata, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+    for _stmt in sqlite_drop_statements(_table):
+        event.listen(Base.metadata, "before_drop", DDL(_stmt).execute_if(dialect="sqlite"))
+    for _stmt in postgres_create_statements(_table):
+        event.listen(Base.metadata, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
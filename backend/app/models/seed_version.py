@@ -0,0 +1,16 @@
+"""Seed ledger model."""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.core.database import Base
+
+
+class SeedVersion(Base):
+    """Latest completed version of one startup seed."""
+
+    __tablename__ = "seed_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -1,7 +1,10 @@
 """AI-related schemas."""
-from typing import Optional
+from datetime import date, datetime
+from typing import Annotated, Any, Literal, Optional, Union
 from pydantic import BaseModel, Field
 
+MAX_JOB_BATCH = 20
+
 
 class CharacterBioRequest(BaseModel):
     """Request schema for AI character bio generation."""
@@ -30,3 +33,40 @@ class SceneResponse(BaseModel):
     """Response schema for AI scene generation."""
     scene: str
     dialogue: str
+
+
+class CharacterBioJobCreate(BaseModel):
+    """Generate one or more character bios in the background."""
+    kind: Literal["character_bio"]
+    requests: list[CharacterBioRequest] = Field(..., min_length=1, max_length=MAX_JOB_BATCH)
+
+
+class SceneJobCreate(BaseModel):
+    """Generate one or more scenes in the background."""
+    kind: Literal["scene"]
+    requests: list[SceneRequest] = Field(..., min_length=1, max_length=MAX_JOB_BATCH)
+
+
+AIJobCreate = Annotated[Union[CharacterBioJobCreate, SceneJobCreate], Field(discriminator="kind")]
+
+
+class AIJob(BaseModel):
+    """Status and, once finished, results of a background AI job."""
+    id: str
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    total: int
+    completed: int = 0
+    results: list[dict[str, Any]] = Field(default_factory=list)
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class AIUsage(BaseModel):
+    """A user's AI usage today against the daily limits (0 = unlimited)."""
+    day: date
+    requests: int
+    tokens: int
+    request_limit: int
+    token_limit: int
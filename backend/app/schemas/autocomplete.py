@@ -0,0 +1,8 @@
+"""Autocomplete schemas."""
+from pydantic import BaseModel
+
+
+class Suggestion(BaseModel):
+    """A single type-ahead suggestion."""
+    id: int
+    name: str
@@ -51,3 +51,11 @@ class Character(CharacterBase):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class TagCount(BaseModel):
+    """Tag with the number of public characters using it."""
+    tag: str
+    count: int
+
+    model_config = {"from_attributes": True}
@@ -8,6 +8,7 @@ class CommentBase(BaseModel):
     """Base comment schema."""
     content: str = Field(..., min_length=1)
     character_id: Optional[int] = None
+    parent_comment_id: Optional[int] = None
 
 
 class CommentCreate(CommentBase):
@@ -25,7 +26,15 @@ class Comment(CommentBase):
     id: int
     post_id: int
     author_user_id: int
+    author_username: Optional[str] = None
+    character_name: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class PostCommentPreview(BaseModel):
+    """The latest few comments on one post."""
+    post_id: int
+    comments: list[Comment]
@@ -0,0 +1,42 @@
+"""Notification schemas."""
+import json
+from datetime import datetime
+from typing import Any, Optional
+from pydantic import BaseModel, field_validator
+
+
+class Notification(BaseModel):
+    """Notification schema."""
+    id: int
+    type: str
+    payload: Optional[dict[str, Any]] = None
+    count: int
+    is_read: bool
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
+
+    @field_validator("payload", mode="before")
+    @classmethod
+    def parse_payload(cls, value: Any) -> Any:
+        """Payloads are stored as JSON text."""
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+
+class MarkRead(BaseModel):
+    """Mark every notification up to and including ``up_to_id`` as read.
+
+    "Up to" follows inbox order, (updated_at, id). Pass the ``updated_at`` of
+    that notification as the client saw it, so a group that gained activity
+    since then stays unread; it defaults to the row's current value.
+    """
+    up_to_id: int
+    updated_at: Optional[datetime] = None
+
+
+class UnreadCount(BaseModel):
+    """Unread notification count."""
+    unread_count: int
@@ -4,6 +4,7 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 from app.models.post import ContentTypeEnum, PostKindEnum
+from app.schemas.reaction import ReactionSummary
 
 
 class PostBase(BaseModel):
@@ -33,7 +34,10 @@ class Post(PostBase):
     realm_id: Optional[int] = None
     author_user_id: int
     author_username: Optional[str] = None
+    comment_count: int = 0
+    reaction_counts: dict[str, int] = Field(default_factory=dict)
     created_at: datetime
     updated_at: datetime
+    reaction_summary: Optional[ReactionSummary] = None
 
     model_config = {"from_attributes": True}
@@ -1,5 +1,6 @@
 """Reaction schemas."""
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, Field
 
 
@@ -21,3 +22,16 @@ class Reaction(ReactionBase):
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class ReactionToggle(BaseModel):
+    """Result of toggling a reaction on or off."""
+    reacted: bool
+    reaction: Optional[Reaction] = None
+
+
+class ReactionSummary(BaseModel):
+    """Per-type reaction counts for a post and the caller's own reactions."""
+    post_id: int
+    counts: dict[str, int] = Field(default_factory=dict)
+    my_reactions: list[str] = Field(default_factory=list)
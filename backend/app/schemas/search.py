@@ -0,0 +1,19 @@
+"""Search schemas."""
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+SearchKind = Literal["post", "scene_post", "character"]
+
+
+class SearchHit(BaseModel):
+    """A single ranked full-text search result."""
+    kind: SearchKind
+    id: int
+    title: Optional[str] = None
+    snippet: str
+    rank: float
+    realm_id: Optional[int] = None
+    scene_id: Optional[int] = None
+    created_at: datetime
@@ -0,0 +1,116 @@
+"""Production server: gunicorn managing Uvicorn workers.
+
+Usage (from backend/):
+    python -m app.serve [--workers N] [--bind 0.0.0.0:8000]
+
+- Worker count is WEB_CONCURRENCY, or one per CPU available to the process
+  (capped at WEB_MAX_WORKERS); async workers need no more than that.
+- The app is imported once in the master and forked (``preload_app``), so
+  workers share the imported code and start serving immediately.
+- Pending seeds run once in the master before forking; workers then skip
+  seeding in their lifespan. The engine's pool is disposed before forking
+  so no database connection is shared between processes.
+- SIGTERM drains gracefully: workers stop accepting, finish in-flight
+  requests for up to GRACEFUL_TIMEOUT_SECONDS, then run lifespan shutdown
+  (flushing buffered counters). Each worker's anyio thread limiter is set
+  to THREADPOOL_TOKENS at startup.
+"""
+import argparse
+import logging
+import os
+from typing import Any, Optional
+
+from gunicorn.app.base import BaseApplication
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects affinity masks)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def default_workers(cpus: Optional[int] = None) -> int:
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    return max(1, min(cpus or available_cpus(), settings.WEB_MAX_WORKERS))
+
+
+def _post_fork(server: Any, worker: Any) -> None:
+    from app.core.database import engine
+
+    # Belt and braces: never reuse a pooled connection inherited from the master
+    engine.dispose(close=False)
+
+
+def _worker_int(worker: Any) -> None:
+    logger.info("Worker %s interrupted; draining", worker.pid)
+
+
+class OwlQuillServer(BaseApplication):
+    """gunicorn application serving ``app.main:app``."""
+
+    def __init__(self, options: dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+
+        return app
+
+
+def prepare_master() -> None:
+    """Seed once before forking, then leave workers nothing to seed."""
+    from app.core.database import engine
+    from app.core.seeding import run_seeds
+
+    if settings.SEED_ON_STARTUP:
+        try:
+            completed = run_seeds()
+            logger.info("Seeds applied in master: %s", ", ".join(completed) or "none")
+        except Exception:
+            logger.exception("Seeding in master failed; continuing")
+        settings.SEED_ON_STARTUP = False
+    engine.dispose()
+
+
+def options(workers: int, bind: str) -> dict[str, Any]:
+    return {
+        "bind": bind,
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "graceful_timeout": settings.GRACEFUL_TIMEOUT_SECONDS,
+        "keepalive": settings.KEEPALIVE_SECONDS,
+        "post_fork": _post_fork,
+        "worker_int": _worker_int,
+        "accesslog": None,
+        "errorlog": "-",
+    }
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description="Run OwlQuill in production")
+    parser.add_argument("--workers", type=int, default=None, help="default: WEB_CONCURRENCY or one per CPU")
+    parser.add_argument("--bind", default=f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+    args = parser.parse_args()
+
+    workers = args.workers or default_workers()
+    prepare_master()
+    logger.info("Starting %d workers on %s", workers, args.bind)
+    OwlQuillServer(options(workers, args.bind)).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Content-addressed cache for AI generations.
+
+Bio and scene generation are pure functions of the request fields, so
+results are cached under a SHA-256 of the canonical request JSON plus the
+provider, model and prompt version. A repeated generation is served without
+touching the provider; ``refresh=True`` skips the lookup but still stores
+the new result.
+
+AI_CACHE_BACKEND=memory keeps a TTL'd LRU of AI_CACHE_MAX_ENTRIES per
+process; redis shares entries across workers (size is then bounded by the
+server's maxmemory policy).
+
+Concurrent identical requests that miss the cache share one provider call
+(single-flight). With AI_SINGLEFLIGHT_DISTRIBUTED the leader also takes a
+short lock in the cache backend, and other workers wait for its result to
+land in the (then necessarily shared) cache instead of calling the provider.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import uuid
+from typing import Optional
+
+from anyio import to_thread
+from pydantic import BaseModel
+
+from app.core.cache import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.schemas.ai import CharacterBioResponse, SceneResponse
+from app.services.ai_service import PROMPT_VERSION, AIClient
+from app.services.singleflight import SingleFlight
+
+# kind -> (AIClient method, response model)
+GENERATIONS: dict[str, tuple[str, type[BaseModel]]] = {
+    "character_bio": ("generate_character_bio", CharacterBioResponse),
+    "scene": ("generate_scene", SceneResponse),
+}
+
+
+def request_fingerprint(kind: str, request: BaseModel, client: AIClient) -> str:
+    """Stable hash of everything that determines a generation's output."""
+    canonical = json.dumps(
+        {
+            "kind": kind,
+            "provider": client.provider,
+            "model": client.model,
+            "prompt_version": PROMPT_VERSION,
+            "request": request.model_dump(mode="json"),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class AIResponseCache:
+    """Stores serialized AI responses by request fingerprint."""
+
+    def __init__(self, backend: CacheBackend, ttl: int) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    async def _run(self, fn, *args):
+        # The in-process backend never blocks; Redis round-trips go to a thread
+        if isinstance(self.backend, MemoryCacheBackend):
+            return fn(*args)
+        return await to_thread.run_sync(fn, *args)
+
+    async def get(self, key: str, response_model: type[BaseModel]) -> Optional[BaseModel]:
+        raw = await self._run(self.backend.get, key)
+        return response_model.model_validate_json(raw) if raw is not None else None
+
+    async def set(self, key: str, response: BaseModel) -> None:
+        await self._run(self.backend.set, key, response.model_dump_json(), self.ttl)
+
+    async def acquire_lock(self, key: str, ttl: int) -> Optional[str]:
+        """Take ``lock:<key>``; return the owner token, or None if held elsewhere."""
+        token = uuid.uuid4().hex
+        return token if await self._run(self.backend.add, f"lock:{key}", token, ttl) else None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        """Drop ``lock:<key>`` if ``token`` still owns it (it may have expired and been retaken)."""
+        await self._run(self.backend.delete_if_equal, f"lock:{key}", token)
+
+    async def is_locked(self, key: str) -> bool:
+        return await self._run(self.backend.get, f"lock:{key}") is not None
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+_cache: Optional[AIResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_ai_cache() -> AIResponseCache:
+    """Return the process-wide AI response cache selected by AI_CACHE_BACKEND."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if settings.AI_CACHE_BACKEND == "redis":
+                    backend: CacheBackend = RedisCacheBackend(settings.REDIS_URL)
+                else:
+                    backend = MemoryCacheBackend(max_entries=settings.AI_CACHE_MAX_ENTRIES)
+                _cache = AIResponseCache(backend, settings.AI_CACHE_TTL_SECONDS)
+    return _cache
+
+
+_inflight = SingleFlight()
+
+LOCK_POLL_SECONDS = 0.1
+
+
+async def _wait_for_other_worker(
+    cache: AIResponseCache, key: str, response_model: type[BaseModel]
+) -> Optional[BaseModel]:
+    """Poll for a result another worker is producing; None if it gives up."""
+    deadline = time.monotonic() + settings.AI_SINGLEFLIGHT_LOCK_SECONDS
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_SECONDS)
+        cached = await cache.get(key, response_model)
+        if cached is not None:
+            return cached
+        if not await cache.is_locked(key):
+            return None
+    return None
+
+
+async def _produce(
+    kind: str, key: str, request: BaseModel, client: AIClient, use_cache: bool
+) -> BaseModel:
+    method, response_model = GENERATIONS[kind]
+    cache = get_ai_cache()
+    token = None
+    if use_cache and settings.AI_SINGLEFLIGHT_DISTRIBUTED:
+        token = await cache.acquire_lock(key, settings.AI_SINGLEFLIGHT_LOCK_SECONDS)
+        if token is None:
+            shared = await _wait_for_other_worker(cache, key, response_model)
+            if shared is not None:
+                metrics.inc("ai_singleflight_shared_total", kind=kind, scope="distributed")
+                return shared
+    try:
+        started = time.perf_counter()
+        response = await getattr(client, method)(request)
+        metrics.observe("ai_generation_seconds", time.perf_counter() - started, kind=kind, provider=client.provider)
+        if use_cache:
+            await cache.set(key, response)
+        return response
+    finally:
+        if token is not None:
+            await cache.release_lock(key, token)
+
+
+async def generate(kind: str, request: BaseModel, client: AIClient, refresh: bool = False) -> BaseModel:
+    """Run a generation through the response cache and single-flight."""
+    _, response_model = GENERATIONS[kind]
+    key = f"ai:{kind}:{request_fingerprint(kind, request, client)}"
+    use_cache = settings.AI_CACHE_ENABLED
+
+    if use_cache:
+        if refresh:
+            metrics.inc("ai_cache_requests_total", kind=kind, result="bypass")
+        else:
+            cached = await get_ai_cache().get(key, response_model)
+            if cached is not None:
+                metrics.inc("ai_cache_requests_total", kind=kind, result="hit")
+                return cached
+            metrics.inc("ai_cache_requests_total", kind=kind, result="miss")
+
+    response, shared = await _inflight.do(key, lambda: _produce(kind, key, request, client, use_cache))
+    if shared:
+        metrics.inc("ai_singleflight_shared_total", kind=kind, scope="process")
+    return response
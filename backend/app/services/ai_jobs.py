@@ -0,0 +1,185 @@
+"""Background AI jobs: long or batched generations outside the request.
+
+``POST /ai/jobs`` stores a job record and puts it on a bounded asyncio queue
+drained by AI_JOB_WORKERS tasks on the app's event loop, then returns at
+once. Each item goes through the same cache and single-flight path as the
+synchronous routes. Job records (status, progress, results) live in the
+cache backend for AI_JOB_RESULT_TTL_SECONDS, so with CACHE_BACKEND=redis any
+worker can answer ``GET /ai/jobs/{id}``.
+
+Per-user caps count queued plus running jobs with an atomic counter in the
+same backend. Every change and every finished item refreshes the counter's
+AI_JOB_ACTIVE_TTL_SECONDS expiry, so jobs lost with a crashed worker stop
+counting once that user's jobs go quiet. Quota is charged by the route
+before submitting; tokens are charged here as each item finishes, and the
+requests of items that never produced a result (the provider failed, or the
+job was cut short) are refunded when the job fails.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Optional, Union
+
+from anyio import to_thread
+
+from app.core.cache import MemoryCacheBackend, get_cache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.schemas.ai import AIJob, CharacterBioJobCreate, SceneJobCreate
+from app.services.ai_cache import generate
+from app.services.ai_quota import charge_tokens, estimate_tokens, refund_requests
+from app.services.ai_service import AIClient, AIProviderError
+
+logger = logging.getLogger(__name__)
+
+JobSpec = Union[CharacterBioJobCreate, SceneJobCreate]
+
+
+class StoredJob(AIJob):
+    """Job record as stored, including its owner."""
+    user_id: int
+
+
+class JobQueueFull(Exception):
+    """The queue is at AI_JOB_QUEUE_SIZE."""
+
+
+class TooManyActiveJobs(Exception):
+    """The user already has AI_JOB_MAX_ACTIVE_PER_USER jobs queued or running."""
+
+
+def _job_key(job_id: str) -> str:
+    return f"ai_jobs:{job_id}"
+
+
+def _active_key(user_id: int) -> str:
+    return f"ai_jobs:active:{user_id}"
+
+
+async def _adjust_active(user_id: int, delta: int) -> int:
+    """Change a user's active-job count and push back its expiry."""
+    return await _cache_call(get_cache().incr, _active_key(user_id), delta, settings.AI_JOB_ACTIVE_TTL_SECONDS)
+
+
+async def _cache_call(fn, *args):
+    # The in-process backend never blocks; Redis round-trips go to a thread
+    if isinstance(get_cache(), MemoryCacheBackend):
+        return fn(*args)
+    return await to_thread.run_sync(fn, *args)
+
+
+async def save_job(job: StoredJob) -> None:
+    await _cache_call(get_cache().set, _job_key(job.id), job.model_dump_json(), settings.AI_JOB_RESULT_TTL_SECONDS)
+
+
+async def load_job(job_id: str) -> Optional[StoredJob]:
+    raw = await _cache_call(get_cache().get, _job_key(job_id))
+    return StoredJob.model_validate_json(raw) if raw is not None else None
+
+
+class AIJobRunner:
+    """Bounded pool of asyncio workers processing queued jobs."""
+
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    async def start(self) -> None:
+        """Start the workers on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"ai-job-worker-{i}") for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs still queued are marked failed."""
+        if not self.running:
+            return
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        queue, self._queue, self._tasks = self._queue, None, []
+        while not queue.empty():
+            job, _, _ = queue.get_nowait()
+            await self._finish(job, error="Server shut down before the job ran")
+
+    async def submit(self, user_id: int, spec: JobSpec, client: AIClient) -> StoredJob:
+        """Record and enqueue a job.
+
+        Raises TooManyActiveJobs or JobQueueFull without enqueueing.
+        """
+        if not self.running:
+            raise JobQueueFull()
+        active = await _adjust_active(user_id, 1)
+        if active > settings.AI_JOB_MAX_ACTIVE_PER_USER:
+            await _adjust_active(user_id, -1)
+            raise TooManyActiveJobs()
+
+        job = StoredJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            kind=spec.kind,
+            status="queued",
+            total=len(spec.requests),
+            created_at=datetime.utcnow(),
+        )
+        await save_job(job)
+        try:
+            self._queue.put_nowait((job, spec, client))
+        except asyncio.QueueFull:
+            await _adjust_active(user_id, -1)
+            await _cache_call(get_cache().delete, _job_key(job.id))
+            raise JobQueueFull()
+        metrics.inc("ai_jobs_submitted_total", kind=spec.kind)
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job, spec, client = await self._queue.get()
+            try:
+                await self._run(job, spec, client)
+            except asyncio.CancelledError:
+                await asyncio.shield(self._finish(job, error="Server shut down before the job finished"))
+                raise
+            except Exception:
+                logger.exception("AI job %s crashed", job.id)
+                await self._finish(job, error="Internal error")
+
+    async def _run(self, job: StoredJob, spec: JobSpec, client: AIClient) -> None:
+        job.status = "running"
+        await save_job(job)
+        for request in spec.requests:
+            try:
+                response = await generate(spec.kind, request, client)
+            except AIProviderError:
+                await self._finish(job, error="AI provider unavailable")
+                return
+            await charge_tokens(job.user_id, estimate_tokens(request.model_dump_json(), response.model_dump_json()))
+            job.results.append(response.model_dump())
+            job.completed += 1
+            if job.completed < job.total:
+                await save_job(job)
+                await _adjust_active(job.user_id, 0)  # still alive: keep the count
+        await self._finish(job)
+
+    async def _finish(self, job: StoredJob, error: Optional[str] = None) -> None:
+        job.status = "failed" if error else "succeeded"
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        if error and job.completed < job.total:
+            await refund_requests(job.user_id, job.total - job.completed)
+        await save_job(job)
+        await _adjust_active(job.user_id, -1)
+        metrics.inc("ai_jobs_finished_total", kind=job.kind, status=job.status)
+
+
+ai_jobs = AIJobRunner(settings.AI_JOB_WORKERS, settings.AI_JOB_QUEUE_SIZE)
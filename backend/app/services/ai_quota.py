@@ -0,0 +1,312 @@
+"""Per-user daily quotas on AI requests and tokens.
+
+Every generation first takes its requests (one per bio or scene, so a job
+costs its batch size) from the caller's allowance for the UTC day. A call
+that would pass AI_DAILY_REQUEST_LIMIT, or that comes after
+AI_DAILY_TOKEN_LIMIT tokens are spent, is refused before the provider is
+called. Tokens are charged once the output is known, estimated from the
+request and response text so every provider (and cached results) count
+the same way. A limit of 0 disables it. Requests whose generation fails at
+the provider are refunded.
+
+AI_QUOTA_BACKEND=redis checks and increments counters in REDIS_URL with one
+Lua script per call, so concurrent calls near the limit cannot reject each
+other; keys expire after the day. memory keeps the counters
+in process and flushes accumulated deltas to ``ai_usage`` every
+AI_USAGE_FLUSH_SECONDS, reading a user's stored usage once per day, so no
+request writes to the database. With several workers the memory backend
+enforces the limit per process on top of what has been flushed.
+"""
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
+
+from anyio import to_thread
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, dialect_insert
+from app.core.metrics import metrics
+from app.models.ai_usage import AIUsage as AIUsageModel
+from app.schemas.ai import AIUsage
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+REDIS_KEY_TTL_SECONDS = 2 * 24 * 60 * 60
+
+# Mirrors _allowed: take ARGV[1] requests unless over a (non-zero) limit
+_CONSUME = """
+local used_requests = tonumber(redis.call('hget', KEYS[1], 'requests') or '0')
+local used_tokens = tonumber(redis.call('hget', KEYS[1], 'tokens') or '0')
+local requests = tonumber(ARGV[1])
+local request_limit = tonumber(ARGV[2])
+local token_limit = tonumber(ARGV[3])
+if request_limit > 0 and used_requests + requests > request_limit then
+    return 0
+end
+if token_limit > 0 and used_tokens >= token_limit then
+    return 0
+end
+redis.call('hincrby', KEYS[1], 'requests', requests)
+redis.call('expire', KEYS[1], ARGV[4])
+return 1
+"""
+
+
+class QuotaExceeded(Exception):
+    """The user has used up today's AI allowance."""
+
+
+def today() -> date:
+    return datetime.utcnow().date()
+
+
+def seconds_until_reset() -> int:
+    """Seconds until the next UTC midnight, when allowances reset."""
+    now = datetime.utcnow()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max(1, int((midnight - now).total_seconds()))
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Rough token count of some text (about four characters per token)."""
+    return sum(-(-len(text) // CHARS_PER_TOKEN) for text in texts)
+
+
+def _allowed(used_requests: int, used_tokens: int, requests: int) -> bool:
+    request_limit = settings.AI_DAILY_REQUEST_LIMIT
+    token_limit = settings.AI_DAILY_TOKEN_LIMIT
+    if request_limit and used_requests + requests > request_limit:
+        return False
+    if token_limit and used_tokens >= token_limit:
+        return False
+    return True
+
+
+class UsageStore:
+    """Daily request/token counters per user."""
+
+    def consume(self, user_id: int, day: date, requests: int) -> bool:
+        """Atomically take ``requests`` if within the limits; return whether taken."""
+        raise NotImplementedError
+
+    def add(self, user_id: int, day: date, requests: int = 0, tokens: int = 0) -> None:
+        """Add to the counters unconditionally (negative to refund)."""
+        raise NotImplementedError
+
+    def usage(self, user_id: int, day: date) -> tuple[int, int]:
+        """Requests and tokens used so far."""
+        raise NotImplementedError
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+def upsert_usage(db: Session, deltas: dict[tuple[int, date], list[int]]) -> None:
+    """Add per-(user, day) request/token deltas to ``ai_usage``. Does not commit."""
+    now = datetime.utcnow()
+    stmt = dialect_insert(db, AIUsageModel).values([
+        {"user_id": user_id, "day": day, "requests": requests, "tokens": tokens, "updated_at": now}
+        for (user_id, day), (requests, tokens) in deltas.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[AIUsageModel.user_id, AIUsageModel.day],
+        set_={
+            "requests": AIUsageModel.requests + stmt.excluded.requests,
+            "tokens": AIUsageModel.tokens + stmt.excluded.tokens,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ))
+
+
+class MemoryUsageStore(UsageStore):
+    """In-process counters flushed to the database in the background."""
+
+    def __init__(self, interval_seconds: float, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self.interval_seconds = interval_seconds
+        self.session_factory = session_factory
+        self._usage: dict[tuple[int, date], list[int]] = {}
+        self._pending: dict[tuple[int, date], list[int]] = defaultdict(lambda: [0, 0])
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _counters(self, key: tuple[int, date]) -> list[int]:
+        counters = self._usage.get(key)
+        if counters is not None:
+            return counters
+        # First use of this user-day in this process: start from what is stored
+        db = self.session_factory()
+        try:
+            row = db.get(AIUsageModel, key)
+            loaded = [row.requests, row.tokens] if row is not None else [0, 0]
+        finally:
+            db.close()
+        with self._lock:
+            return self._usage.setdefault(key, loaded)
+
+    def consume(self, user_id: int, day: date, requests: int) -> bool:
+        key = (user_id, day)
+        counters = self._counters(key)
+        with self._lock:
+            if not _allowed(counters[0], counters[1], requests):
+                return False
+            counters[0] += requests
+            self._pending[key][0] += requests
+        return True
+
+    def add(self, user_id: int, day: date, requests: int = 0, tokens: int = 0) -> None:
+        key = (user_id, day)
+        counters = self._counters(key)
+        with self._lock:
+            counters[0] += requests
+            counters[1] += tokens
+            pending = self._pending[key]
+            pending[0] += requests
+            pending[1] += tokens
+
+    def usage(self, user_id: int, day: date) -> tuple[int, int]:
+        counters = self._counters((user_id, day))
+        with self._lock:
+            return counters[0], counters[1]
+
+    def flush(self) -> int:
+        """Write pending deltas in one statement; return user-days touched.
+
+        On failure the deltas are merged back so the next flush retries them.
+        """
+        current = today()
+        with self._lock:
+            batch = {key: list(d) for key, d in self._pending.items() if any(d)}
+            self._pending.clear()
+            for key in [k for k in self._usage if k[1] < current]:
+                del self._usage[key]
+        if not batch:
+            return 0
+
+        db = self.session_factory()
+        try:
+            upsert_usage(db, batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                for key, (requests, tokens) in batch.items():
+                    self._pending[key][0] += requests
+                    self._pending[key][1] += tokens
+            logger.exception("AI usage flush failed; will retry")
+            return 0
+        finally:
+            db.close()
+        return len(batch)
+
+    def reset(self) -> None:
+        """Forget all counters without flushing (tests)."""
+        with self._lock:
+            self._usage.clear()
+            self._pending.clear()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.flush()
+        self.flush()
+
+    def start(self) -> None:
+        """Start the background flusher (no-op when running)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ai-usage-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher after a final flush."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+class RedisUsageStore(UsageStore):
+    """Counters in a Redis hash per user-day, shared by all workers."""
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._consume = self._client.register_script(_CONSUME)
+
+    @staticmethod
+    def _key(user_id: int, day: date) -> str:
+        return f"ai_usage:{day.isoformat()}:{user_id}"
+
+    def consume(self, user_id: int, day: date, requests: int) -> bool:
+        return bool(self._consume(
+            keys=[self._key(user_id, day)],
+            args=[
+                requests,
+                settings.AI_DAILY_REQUEST_LIMIT,
+                settings.AI_DAILY_TOKEN_LIMIT,
+                REDIS_KEY_TTL_SECONDS,
+            ],
+        ))
+
+    def add(self, user_id: int, day: date, requests: int = 0, tokens: int = 0) -> None:
+        key = self._key(user_id, day)
+        pipe = self._client.pipeline()
+        if requests:
+            pipe.hincrby(key, "requests", requests)
+        if tokens:
+            pipe.hincrby(key, "tokens", tokens)
+        pipe.expire(key, REDIS_KEY_TTL_SECONDS)
+        pipe.execute()
+
+    def usage(self, user_id: int, day: date) -> tuple[int, int]:
+        values = self._client.hmget(self._key(user_id, day), "requests", "tokens")
+        return int(values[0] or 0), int(values[1] or 0)
+
+
+def create_usage_store() -> UsageStore:
+    if settings.AI_QUOTA_BACKEND == "redis":
+        return RedisUsageStore(settings.REDIS_URL)
+    return MemoryUsageStore(settings.AI_USAGE_FLUSH_SECONDS)
+
+
+usage_store = create_usage_store()
+
+
+async def charge_requests(user_id: int, requests: int = 1) -> None:
+    """Take requests from today's allowance; raise QuotaExceeded if over."""
+    allowed = await to_thread.run_sync(usage_store.consume, user_id, today(), requests)
+    if not allowed:
+        metrics.inc("ai_quota_rejected_total")
+        raise QuotaExceeded()
+
+
+async def refund_requests(user_id: int, requests: int = 1) -> None:
+    """Give back requests charged for work that was never started or that failed upstream."""
+    await to_thread.run_sync(usage_store.add, user_id, today(), -requests, 0)
+
+
+async def charge_tokens(user_id: int, tokens: int) -> None:
+    """Record tokens spent by a finished generation."""
+    await to_thread.run_sync(usage_store.add, user_id, today(), 0, tokens)
+
+
+async def get_usage(user_id: int) -> AIUsage:
+    day = today()
+    requests, tokens = await to_thread.run_sync(usage_store.usage, user_id, day)
+    return AIUsage(
+        day=day,
+        requests=requests,
+        tokens=tokens,
+        request_limit=settings.AI_DAILY_REQUEST_LIMIT,
+        token_limit=settings.AI_DAILY_TOKEN_LIMIT,
+    )
@@ -1,4 +1,24 @@
-"""AI service for generating content (MVP stub with fake data)."""
+"""AI service for generating content.
+
+``AI_PROVIDER`` selects the client: ``fake`` (offline stub data), ``openai``
+or ``anthropic``. Real providers share one pooled ``httpx.AsyncClient`` per
+process (keep-alive, HTTP/2 when ``h2`` is installed), cap concurrent
+upstream calls with a semaphore, and retry transient failures with jittered
+exponential backoff. Everything is async so a slow generation never holds a
+threadpool worker.
+
+``stream_scene`` yields text chunks as the provider produces them; closing
+the iterator early (e.g. the browser went away) closes the upstream request.
+"""
+import asyncio
+import json
+import logging
+import random
+from typing import TYPE_CHECKING, AsyncIterator, Optional, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
 from app.schemas.ai import (
     CharacterBioRequest,
     CharacterBioResponse,
@@ -6,11 +26,56 @@ from app.schemas.ai import (
     SceneResponse
 )
 
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Longest Retry-After we will honour; a provider asking for more gets this
+MAX_RETRY_AFTER_SECONDS = 30.0
+
+# Bump when the prompts change so cached generations are not reused
+PROMPT_VERSION = 1
+
+
+class AIProviderError(Exception):
+    """The upstream provider failed or returned something unusable."""
+
+
+class AIClient:
+    """Interface shared by all AI providers."""
+
+    provider = "base"
+    model = ""
+
+    async def generate_character_bio(self, request: CharacterBioRequest) -> CharacterBioResponse:
+        raise NotImplementedError
+
+    async def generate_scene(self, request: SceneRequest) -> SceneResponse:
+        raise NotImplementedError
+
+    async def stream_scene(self, request: SceneRequest) -> AsyncIterator[str]:
+        """Yield a scene as text chunks. Defaults to one chunk per part."""
+        response = await self.generate_scene(request)
+        yield response.scene
+        yield "\n\n"
+        yield response.dialogue
+
+    async def aclose(self) -> None:
+        """Release pooled connections."""
 
-class FakeAIClient:
-    """Fake AI client for MVP. Replace with real AI integration later."""
 
-    def generate_character_bio(self, request: CharacterBioRequest) -> CharacterBioResponse:
+class FakeAIClient(AIClient):
+    """Fake AI client for offline development and tests."""
+
+    provider = "fake"
+    model = "fake-1"
+
+    async def generate_character_bio(self, request: CharacterBioRequest) -> CharacterBioResponse:
         """Generate fake character bio with enhanced RP details."""
         name = request.name
         species = request.species or "mysterious being"
@@ -41,7 +106,7 @@ class FakeAIClient:
 
         return CharacterBioResponse(short_bio=short_bio, long_bio=long_bio)
 
-    def generate_scene(self, request: SceneRequest) -> SceneResponse:
+    async def generate_scene(self, request: SceneRequest) -> SceneResponse:
         """Generate fake scene."""
         characters_str = " and ".join(request.characters)
         mood = request.mood or "tense"
@@ -61,6 +126,334 @@ class FakeAIClient:
 
         return SceneResponse(scene=scene, dialogue=dialogue)
 
+    async def stream_scene(self, request: SceneRequest) -> AsyncIterator[str]:
+        """Yield the fake scene word by word, like a streaming provider."""
+        response = await self.generate_scene(request)
+        text = f"{response.scene}\n\n{response.dialogue}"
+        for word in text.split(" "):
+            await asyncio.sleep(0)
+            yield word + " "
+
+
+def _bio_prompt(request: CharacterBioRequest) -> str:
+    return (
+        "Write a roleplay character bio.\n"
+        f"Name: {request.name}\n"
+        f"Species: {request.species or 'unspecified'}\n"
+        f"Role: {request.role or 'unspecified'}\n"
+        f"Era: {request.era or 'unspecified'}\n"
+        f"Tags: {', '.join(request.tags) or 'none'}\n"
+        'Reply with only a JSON object: {"short_bio": "<2 sentences>", '
+        '"long_bio": "<3 paragraphs>"}'
+    )
+
+
+def _scene_prompt(request: SceneRequest) -> str:
+    return (
+        "Write a short roleplay scene.\n"
+        f"Characters: {', '.join(request.characters)}\n"
+        f"Setting: {request.setting}\n"
+        f"Mood: {request.mood or 'any'}\n"
+        f"Prompt: {request.prompt}\n"
+        'Reply with only a JSON object: {"scene": "<narration>", "dialogue": "<dialogue>"}'
+    )
+
+
+def _scene_stream_prompt(request: SceneRequest) -> str:
+    return (
+        "Write a short roleplay scene: a paragraph of narration, a blank line, then dialogue.\n"
+        f"Characters: {', '.join(request.characters)}\n"
+        f"Setting: {request.setting}\n"
+        f"Mood: {request.mood or 'any'}\n"
+        f"Prompt: {request.prompt}"
+    )
+
+
+SYSTEM_PROMPT = "You are a creative writing assistant for a roleplay community."
+
+
+class HTTPAIClient(AIClient):
+    """Base for providers reached over HTTP; subclasses define the wire format."""
+
+    default_base_url = ""
+    default_model = ""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        http2: bool = True,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ) -> None:
+        self.api_key = api_key
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.model = model or self.default_model
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.http2 = http2
+        self.transport = transport
+        self._http: Optional["httpx.AsyncClient"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _client(self) -> "httpx.AsyncClient":
+        # Created lazily inside the running event loop and reused until aclose();
+        # httpx itself is only imported once a real provider is used
+        if self._http is None:
+            import httpx
+
+            http2 = self.http2 and self.transport is None
+            if http2:
+                try:
+                    import h2  # noqa: F401
+                except ImportError:
+                    logger.warning("AI_HTTP2 is on but h2 is not installed; %s calls use HTTP/1.1", self.provider)
+                    http2 = False
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=30.0,
+                ),
+                http2=http2,
+                transport=self.transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._semaphore = None
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), MAX_RETRY_AFTER_SECONDS)
+            except ValueError:
+                pass
+        # Full jitter: uniform over [0, base * 2^attempt]
+        return random.uniform(0, self.backoff_seconds * (2 ** attempt))
+
+    async def _post(self, path: str, payload: dict) -> dict:
+        """POST with the concurrency cap and retries on transient failures."""
+        import httpx
+
+        client = self._client()
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    response = await client.post(path, json=payload, headers=self.headers())
+                if response.status_code < 400:
+                    try:
+                        return response.json()
+                    except ValueError as exc:
+                        raise AIProviderError(f"{self.provider} returned a non-JSON body") from exc
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise AIProviderError(f"{self.provider} returned HTTP {response.status_code}")
+                retry_after = response.headers.get("retry-after")
+                last_error = AIProviderError(f"{self.provider} returned HTTP {response.status_code}")
+            except httpx.TransportError as exc:
+                last_error = exc
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt, retry_after)
+                logger.warning("%s call failed (%s); retry %d in %.2fs", self.provider, last_error, attempt + 1, delay)
+                await asyncio.sleep(delay)
+        raise AIProviderError(f"{self.provider} request failed after retries: {last_error}")
+
+    async def _complete_json(self, prompt: str, response_model: type[ResponseT]) -> ResponseT:
+        body = await self._post(self.path, self.build_payload(prompt))
+        try:
+            return response_model.model_validate_json(self.extract_text(body))
+        except (ValidationError, KeyError, IndexError, TypeError) as exc:
+            raise AIProviderError(f"{self.provider} returned an unusable completion") from exc
+
+    async def generate_character_bio(self, request: CharacterBioRequest) -> CharacterBioResponse:
+        return await self._complete_json(_bio_prompt(request), CharacterBioResponse)
+
+    async def generate_scene(self, request: SceneRequest) -> SceneResponse:
+        return await self._complete_json(_scene_prompt(request), SceneResponse)
+
+    async def stream_scene(self, request: SceneRequest) -> AsyncIterator[str]:
+        """Stream a scene from the provider's SSE API.
+
+        Failures before the first chunk are retried like ``_post``; once text
+        has been yielded an error is raised to the caller instead.
+        """
+        import httpx
+
+        client = self._client()
+        payload = self.build_payload(_scene_stream_prompt(request), stream=True)
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            yielded = False
+            try:
+                async with self._semaphore:
+                    async with client.stream("POST", self.path, json=payload, headers=self.headers()) as response:
+                        if response.status_code >= 400:
+                            if response.status_code not in RETRY_STATUS_CODES:
+                                raise AIProviderError(f"{self.provider} returned HTTP {response.status_code}")
+                            retry_after = response.headers.get("retry-after")
+                            raise httpx.HTTPStatusError(
+                                f"HTTP {response.status_code}", request=response.request, response=response
+                            )
+                        event_type = None
+                        async for line in response.aiter_lines():
+                            if line.startswith("event:"):
+                                event_type = line[len("event:"):].strip()
+                                continue
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[len("data:"):].strip()
+                            if data == "[DONE]":
+                                return
+                            try:
+                                event = json.loads(data)
+                            except ValueError as exc:
+                                raise AIProviderError(f"{self.provider} sent a malformed stream event") from exc
+                            if event_type == "error" or (isinstance(event, dict) and "error" in event):
+                                raise AIProviderError(f"{self.provider} stream error: {event.get('error', event)}")
+                            event_type = None
+                            text = self.extract_stream_text(event)
+                            if text:
+                                yielded = True
+                                yield text
+                return
+            except (httpx.TransportError, httpx.HTTPStatusError) as exc:
+                if yielded:
+                    raise AIProviderError(f"{self.provider} stream broke off: {exc}") from exc
+                last_error = exc
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+        raise AIProviderError(f"{self.provider} stream failed after retries: {last_error}")
+
+    # Wire format, per provider
+
+    path = ""
+
+    def headers(self) -> dict[str, str]:
+        raise NotImplementedError
+
+    def build_payload(self, prompt: str, stream: bool = False) -> dict:
+        raise NotImplementedError
+
+    def extract_text(self, body: dict) -> str:
+        raise NotImplementedError
+
+    def extract_stream_text(self, event: dict) -> str:
+        raise NotImplementedError
+
+
+class OpenAIClient(HTTPAIClient):
+    """OpenAI chat completions."""
+
+    provider = "openai"
+    default_base_url = "https://api.openai.com/v1"
+    default_model = "gpt-4o-mini"
+    path = "/chat/completions"
+
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def build_payload(self, prompt: str, stream: bool = False) -> dict:
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+        }
+        if stream:
+            payload["stream"] = True
+        else:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+
+    def extract_text(self, body: dict) -> str:
+        return body["choices"][0]["message"]["content"]
+
+    def extract_stream_text(self, event: dict) -> str:
+        choices = event.get("choices") or [{}]
+        return choices[0].get("delta", {}).get("content") or ""
+
+
+class AnthropicClient(HTTPAIClient):
+    """Anthropic messages API."""
+
+    provider = "anthropic"
+    default_base_url = "https://api.anthropic.com/v1"
+    default_model = "claude-3-5-haiku-latest"
+    path = "/messages"
+
+    def headers(self) -> dict[str, str]:
+        return {"x-api-key": self.api_key, "anthropic-version": "2023-06-01"}
+
+    def build_payload(self, prompt: str, stream: bool = False) -> dict:
+        payload = {
+            "model": self.model,
+            "max_tokens": 2048,
+            "system": SYSTEM_PROMPT,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def extract_text(self, body: dict) -> str:
+        return "".join(block["text"] for block in body["content"] if block.get("type") == "text")
+
+    def extract_stream_text(self, event: dict) -> str:
+        if event.get("type") == "content_block_delta":
+            return event.get("delta", {}).get("text") or ""
+        return ""
+
+
+def create_ai_client() -> AIClient:
+    """Build the client selected by AI_PROVIDER."""
+    if settings.AI_PROVIDER == "fake":
+        return FakeAIClient()
+    cls = OpenAIClient if settings.AI_PROVIDER == "openai" else AnthropicClient
+    return cls(
+        api_key=settings.AI_API_KEY,
+        base_url=settings.AI_BASE_URL or None,
+        model=settings.AI_MODEL or None,
+        max_concurrency=settings.AI_MAX_CONCURRENCY,
+        max_retries=settings.AI_MAX_RETRIES,
+        backoff_seconds=settings.AI_RETRY_BACKOFF_SECONDS,
+        connect_timeout=settings.AI_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=settings.AI_READ_TIMEOUT_SECONDS,
+        http2=settings.AI_HTTP2,
+    )
+
+
+_ai_client: Optional[AIClient] = None
+
+
+def get_ai_client() -> AIClient:
+    """Dependency returning the process-wide AI client, built on first use."""
+    global _ai_client
+    if _ai_client is None:
+        _ai_client = create_ai_client()
+    return _ai_client
+
 
-# Singleton instance
-ai_client = FakeAIClient()
+async def close_ai_client() -> None:
+    """Close the process-wide client's connections, if it was ever built."""
+    global _ai_client
+    if _ai_client is not None:
+        await _ai_client.aclose()
+        _ai_client = None
@@ -0,0 +1,208 @@
+"""In-process prefix indexes for username and character-name type-ahead.
+
+Each index is a sorted array of lowercased keys searched with ``bisect``, so a
+prefix query costs one binary search plus a short forward scan. Indexes load
+lazily on first use, are updated in place by the write routes of this process,
+and periodically pick up rows inserted by other workers (``id > last_id``).
+
+Rows that can change or disappear (characters are renamed, made private or
+deleted) bump a shared version in the cache backend when that happens (not
+on plain inserts, which the ``id > last_id`` top-up already finds); a worker
+that sees a new version at its next refresh reloads the index from scratch,
+so names hidden elsewhere stop being served. The version is only shared
+with CACHE_BACKEND=redis; with the in-process cache each worker instead
+reloads such indexes every AUTOCOMPLETE_FULL_RELOAD_SECONDS.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import bump_namespace, namespace_version
+from app.core.config import settings
+from app.models.character import Character as CharacterModel, VisibilityEnum
+from app.models.user import User as UserModel
+
+_SEP = "\x00"
+
+
+class PrefixIndex:
+    """Sorted-array prefix index of (id, name) pairs."""
+
+    def __init__(self) -> None:
+        self._keys: list[str] = []  # "<lowercased name>\0<id>", sorted
+        self._names: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(entry_id: int, name: str) -> str:
+        return f"{name.lower()}{_SEP}{entry_id:012d}"
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def bulk_load(self, entries: Iterable[tuple[int, str]]) -> None:
+        """Replace the index contents with ``entries``."""
+        names = {entry_id: name for entry_id, name in entries}
+        keys = sorted(self._key(i, n) for i, n in names.items())
+        with self._lock:
+            self._names = names
+            self._keys = keys
+
+    def add(self, entry_id: int, name: str) -> None:
+        """Insert or rename an entry."""
+        with self._lock:
+            self._discard(entry_id)
+            bisect.insort(self._keys, self._key(entry_id, name))
+            self._names[entry_id] = name
+
+    def discard(self, entry_id: int) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._discard(entry_id)
+
+    def _discard(self, entry_id: int) -> None:
+        name = self._names.pop(entry_id, None)
+        if name is None:
+            return
+        key = self._key(entry_id, name)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+
+    def search(self, prefix: str, limit: int) -> list[tuple[int, str]]:
+        """Return up to ``limit`` (id, name) pairs whose name starts with ``prefix``."""
+        prefix = prefix.lower()
+        results = []
+        with self._lock:
+            i = bisect.bisect_left(self._keys, prefix)
+            keys = self._keys
+            while i < len(keys) and len(results) < limit:
+                key = keys[i]
+                if not key.startswith(prefix):
+                    break
+                entry_id = int(key.rsplit(_SEP, 1)[1])
+                results.append((entry_id, self._names[entry_id]))
+                i += 1
+        return results
+
+
+class AutocompleteSource:
+    """A PrefixIndex bound to the table it mirrors.
+
+    ``namespace`` names the shared version bumped by ``invalidate``; sources
+    without one only ever gain rows.
+    """
+
+    def __init__(
+        self, load_rows: Callable[[Session, int], list[tuple[int, str]]], namespace: Optional[str] = None
+    ) -> None:
+        self.index = PrefixIndex()
+        self._load_rows = load_rows
+        self.namespace = namespace
+        self._loaded = False
+        self._version = 0
+        self._last_id = 0
+        self._refreshed_at = 0.0
+        self._loaded_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def _stale(self, version: int, now: float) -> bool:
+        if not self._loaded or version != self._version:
+            return True
+        # The in-process cache never sees other workers' version bumps
+        return (
+            self.namespace is not None
+            and settings.CACHE_BACKEND != "redis"
+            and now - self._loaded_at >= settings.AUTOCOMPLETE_FULL_RELOAD_SECONDS
+        )
+
+    def _sync(self, db: Session) -> None:
+        with self._refresh_lock:
+            now = time.monotonic()
+            if self._loaded and now - self._refreshed_at < settings.AUTOCOMPLETE_REFRESH_SECONDS:
+                return
+            # Read the version before the rows so a write during the load forces another reload
+            version = namespace_version(self.namespace) if self.namespace else 0
+            if not self._stale(version, now):
+                rows = self._load_rows(db, self._last_id)
+                for entry_id, name in rows:
+                    self.index.add(entry_id, name)
+            else:
+                rows = self._load_rows(db, 0)
+                self.index.bulk_load(rows)
+                self._loaded = True
+                self._version = version
+                self._loaded_at = now
+            if rows:
+                self._last_id = max(self._last_id, max(r[0] for r in rows))
+            self._refreshed_at = now
+
+    def search(self, db: Session, prefix: str, limit: Optional[int] = None) -> list[tuple[int, str]]:
+        """Prefix search, loading or topping up the index first if due."""
+        self._sync(db)
+        limit = min(limit or settings.AUTOCOMPLETE_MAX_RESULTS, settings.AUTOCOMPLETE_MAX_RESULTS)
+        return self.index.search(prefix, limit)
+
+    def add(self, entry_id: int, name: str) -> None:
+        if self._loaded:
+            self.index.add(entry_id, name)
+
+    def discard(self, entry_id: int) -> None:
+        if self._loaded:
+            self.index.discard(entry_id)
+
+    def invalidate(self) -> None:
+        """Make every worker reload at its next refresh (after renames or removals)."""
+        if self.namespace:
+            bump_namespace(self.namespace)
+
+    def reset(self) -> None:
+        """Forget everything; the next search reloads from the database."""
+        with self._refresh_lock:
+            self.index.bulk_load([])
+            self._loaded = False
+            self._version = 0
+            self._last_id = 0
+            self._refreshed_at = 0.0
+            self._loaded_at = 0.0
+
+
+def _load_usernames(db: Session, after_id: int) -> list[tuple[int, str]]:
+    return db.query(UserModel.id, UserModel.username).filter(UserModel.id > after_id).all()
+
+
+def _load_character_names(db: Session, after_id: int) -> list[tuple[int, str]]:
+    return db.query(CharacterModel.id, CharacterModel.name).filter(
+        CharacterModel.id > after_id,
+        CharacterModel.visibility == VisibilityEnum.PUBLIC,
+    ).all()
+
+
+username_index = AutocompleteSource(_load_usernames)
+character_name_index = AutocompleteSource(_load_character_names, namespace="autocomplete:characters")
+
+
+def index_character(
+    character: CharacterModel, old_name: Optional[str] = None, was_public: Optional[bool] = None
+) -> None:
+    """Reflect a created or updated character in the name index (public only).
+
+    Pass the name and visibility from before an update; other workers are
+    only told to reload when either changed.
+    """
+    is_public = character.visibility == VisibilityEnum.PUBLIC
+    if is_public:
+        character_name_index.add(character.id, character.name)
+    else:
+        character_name_index.discard(character.id)
+    if (old_name is not None and old_name != character.name) or (was_public is not None and was_public != is_public):
+        character_name_index.invalidate()
+
+
+def unindex_character(character_id: int) -> None:
+    """Drop a deleted character from the name index, here and in other workers."""
+    character_name_index.discard(character_id)
+    character_name_index.invalidate()
@@ -0,0 +1,80 @@
+"""Keep the character_tags inverted index and tag_counts in step with characters."""
+from typing import Iterable, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.core.database import dialect_insert
+from app.models.character import Character as CharacterModel, VisibilityEnum
+from app.models.character_tag import CharacterTag, TagCount
+
+MAX_TAG_LENGTH = 50
+
+
+def parse_tags(raw: Optional[str]) -> list[str]:
+    """Normalize a comma-separated tag string: trimmed, lowercased, de-duplicated."""
+    if not raw:
+        return []
+    seen: dict[str, None] = {}
+    for part in raw.split(","):
+        tag = part.strip().lower()[:MAX_TAG_LENGTH]
+        if tag:
+            seen.setdefault(tag, None)
+    return list(seen)
+
+
+def _bump_counts(db: Session, tags: Iterable[str], delta: int) -> None:
+    tags = list(tags)
+    if not tags:
+        return
+    stmt = dialect_insert(db, TagCount).values([{"tag": t, "count": delta} for t in tags])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[TagCount.tag],
+        set_={"count": TagCount.count + delta},
+    ))
+    if delta < 0:
+        db.execute(delete(TagCount).where(TagCount.tag.in_(tags), TagCount.count <= 0))
+
+
+def sync_character_tags(
+    db: Session,
+    character: CharacterModel,
+    old_tags: Iterable[str] = (),
+    was_public: bool = False,
+) -> None:
+    """Rewrite a character's tag rows and adjust public tag counts.
+
+    ``old_tags``/``was_public`` describe the character before the change;
+    leave them at their defaults for a newly created character. Does not commit.
+    """
+    old = set(old_tags)
+    new = set(parse_tags(character.tags))
+
+    removed = old - new
+    if removed:
+        db.execute(delete(CharacterTag).where(
+            CharacterTag.character_id == character.id,
+            CharacterTag.tag.in_(removed),
+        ))
+    added = new - old
+    if added:
+        db.execute(
+            dialect_insert(db, CharacterTag)
+            .values([{"character_id": character.id, "tag": t} for t in added])
+            .on_conflict_do_nothing()
+        )
+
+    is_public = character.visibility == VisibilityEnum.PUBLIC
+    counted_before = old if was_public else set()
+    counted_after = new if is_public else set()
+    _bump_counts(db, counted_after - counted_before, 1)
+    _bump_counts(db, counted_before - counted_after, -1)
+
+
+def release_character_tags(db: Session, character: CharacterModel) -> None:
+    """Drop a character's contribution to tag_counts before it is deleted.
+
+    The character_tags rows themselves go with the character via cascade.
+    """
+    if character.visibility == VisibilityEnum.PUBLIC:
+        _bump_counts(db, parse_tags(character.tags), -1)
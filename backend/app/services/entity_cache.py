@@ -0,0 +1,109 @@
+"""Cache-aside for single-entity reads.
+
+``EntityCache.get`` serves a schema by id from the cache, or loads the row,
+serializes it and stores it for ENTITY_CACHE_TTL_SECONDS. Keys are
+``entity:<name>:<schema hash>:<id>``, so code with a different schema
+never reads entries written by another release.
+
+Write paths call ``invalidate``. It overwrites the entry with a tombstone
+for TOMBSTONE_SECONDS rather than deleting it, and entries are only ever
+filled with set-if-absent. A reader that loaded the row before the write
+committed therefore cannot put the old version back, whether invalidation
+runs before or after the commit.
+
+With CACHE_BACKEND=redis entries are shared through Redis behind a
+per-process LRU tier (disabled with ENTITY_CACHE_LOCAL_TTL_SECONDS=0);
+otherwise the bounded LRU is the only tier.
+"""
+import hashlib
+import json
+import threading
+from functools import cached_property
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from app.core.cache import CacheBackend, MemoryCacheBackend, TieredCacheBackend, get_cache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.schemas.character import Character
+from app.schemas.post import Post
+from app.schemas.scene import SceneOut
+
+T = TypeVar("T", bound=BaseModel)
+
+TOMBSTONE = "-"
+TOMBSTONE_SECONDS = 10
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_entity_backend() -> CacheBackend:
+    """Return the process-wide entity cache tiers."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if settings.CACHE_BACKEND == "redis" and settings.ENTITY_CACHE_LOCAL_TTL_SECONDS <= 0:
+                    _backend = get_cache()
+                elif settings.CACHE_BACKEND == "redis":
+                    _backend = TieredCacheBackend(
+                        get_cache(),
+                        local_ttl=settings.ENTITY_CACHE_LOCAL_TTL_SECONDS,
+                        max_entries=settings.ENTITY_CACHE_LOCAL_MAX_ENTRIES,
+                    )
+                else:
+                    _backend = MemoryCacheBackend(max_entries=settings.ENTITY_CACHE_LOCAL_MAX_ENTRIES)
+    return _backend
+
+
+class EntityCache(Generic[T]):
+    """Cached reads of one schema by primary key."""
+
+    def __init__(self, name: str, schema: type[T]) -> None:
+        self.name = name
+        self.schema = schema
+
+    @cached_property
+    def prefix(self) -> str:
+        shape = json.dumps(self.schema.model_json_schema(), sort_keys=True)
+        return f"entity:{self.name}:{hashlib.sha1(shape.encode()).hexdigest()[:8]}"
+
+    def key(self, entity_id: int) -> str:
+        return f"{self.prefix}:{entity_id}"
+
+    def get(self, entity_id: int, load: Callable[[], Optional[Any]]) -> Optional[T]:
+        """Return the cached entity, or ``load()`` it (a row or schema instance) and cache it."""
+        if not settings.ENTITY_CACHE_ENABLED:
+            row = load()
+            return self.schema.model_validate(row) if row is not None else None
+
+        backend = get_entity_backend()
+        key = self.key(entity_id)
+        cached = backend.get(key)
+        if cached is not None and cached != TOMBSTONE:
+            metrics.inc("entity_cache_requests_total", entity=self.name, result="hit")
+            return self.schema.model_validate_json(cached)
+
+        metrics.inc("entity_cache_requests_total", entity=self.name, result="miss")
+        row = load()
+        if row is None:
+            return None
+        result = self.schema.model_validate(row)
+        if cached is None:
+            backend.add(key, result.model_dump_json(), settings.ENTITY_CACHE_TTL_SECONDS)
+        return result
+
+    def invalidate(self, *entity_ids: int) -> None:
+        """Drop entries after their rows change; safe to call before commit."""
+        if not settings.ENTITY_CACHE_ENABLED:
+            return
+        backend = get_entity_backend()
+        for entity_id in entity_ids:
+            backend.set(self.key(entity_id), TOMBSTONE, TOMBSTONE_SECONDS)
+
+
+post_cache = EntityCache("post", Post)
+character_cache = EntityCache("character", Character)
+scene_cache = EntityCache("scene", SceneOut)
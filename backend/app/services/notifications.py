@@ -0,0 +1,494 @@
+"""Notification fan-out pipeline.
+
+Write routes publish small events (who did what to which post or scene) after
+their transaction commits. A background worker drains the queue in batches,
+resolves every recipient of the batch with one query per event kind, and
+inserts all notification rows with a single executemany, so a request never
+waits on fan-out.
+
+The queue is in-process by default; NOTIFICATION_QUEUE=redis uses a Redis
+stream with a consumer group so any worker can publish and drain. Each process
+reads as its own consumer and claims entries a dead consumer left unacked.
+A batch that fails is not acknowledged but delivered again, up to
+NOTIFICATION_MAX_DELIVERIES times per event.
+
+Similar events are coalesced at write time: rows carry a ``group_key`` (e.g.
+reactions on one post) and an upsert bumps ``count`` on the recipient's unread
+row for that group instead of adding another. Each user's unread count is
+cached and adjusted in place (atomically, and only if present) after inserts
+and reads commit. When there is nothing to adjust, a short "recount" marker
+is stored instead, so a count read before the change committed cannot be
+cached over it; the next read repairs the cache from the database.
+"""
+import itertools
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import false, func, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.database import SessionLocal, dialect_insert
+from app.models.notification import Notification as NotificationModel
+from app.models.post import Post as PostModel
+from app.models.scene_post import ScenePost as ScenePostModel
+
+logger = logging.getLogger(__name__)
+
+NEW_COMMENT = "new_comment"
+NEW_REACTION = "new_reaction"
+NEW_SCENE_POST = "new_scene_post"
+
+UPSERT_CHUNK_SIZE = 500
+
+# After a change to an uncached badge it is recounted (not cached) for this
+# long, so a count read before the change committed cannot be cached over it
+UNREAD_RECOUNT_SECONDS = 10
+_RECOUNT = "-"
+
+
+class EventQueue:
+    """Minimal work-queue interface used by the dispatcher."""
+
+    def put(self, event: dict) -> None:
+        raise NotImplementedError
+
+    def get_batch(self, max_items: int, timeout: float) -> list[tuple[str, dict]]:
+        """Wait up to ``timeout`` seconds for events; return (token, event) pairs."""
+        raise NotImplementedError
+
+    def ack(self, tokens: list[str]) -> None:
+        """Mark events from ``get_batch`` as handled."""
+        raise NotImplementedError
+
+    def retry(self, tokens: list[str]) -> None:
+        """Leave events from ``get_batch`` unhandled so they are delivered again.
+
+        An event already delivered ``max_deliveries`` times is dropped instead.
+        """
+        raise NotImplementedError
+
+    def join(self) -> None:
+        """Block until every event put so far has been acknowledged."""
+        raise NotImplementedError
+
+
+class MemoryEventQueue(EventQueue):
+    """Thread-safe in-process queue (one per worker process)."""
+
+    def __init__(self, max_deliveries: int = 5) -> None:
+        self._queue: queue.Queue = queue.Queue()
+        self.max_deliveries = max_deliveries
+        # token -> (event, deliveries so far) for events handed out by get_batch
+        self._in_flight: dict[str, tuple[dict, int]] = {}
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+
+    def put(self, event: dict) -> None:
+        self._queue.put((event, 0))
+
+    def get_batch(self, max_items: int, timeout: float) -> list[tuple[str, dict]]:
+        try:
+            entries = [self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()]
+        except queue.Empty:
+            return []
+        while len(entries) < max_items:
+            try:
+                entries.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        batch = []
+        with self._lock:
+            for event, deliveries in entries:
+                token = str(next(self._tokens))
+                self._in_flight[token] = (event, deliveries + 1)
+                batch.append((token, event))
+        return batch
+
+    def ack(self, tokens: list[str]) -> None:
+        with self._lock:
+            for token in tokens:
+                del self._in_flight[token]
+        for _ in tokens:
+            self._queue.task_done()
+
+    def retry(self, tokens: list[str]) -> None:
+        with self._lock:
+            entries = [self._in_flight.pop(token) for token in tokens]
+        for event, deliveries in entries:
+            if deliveries >= self.max_deliveries:
+                logger.error("Dropping notification event after %d deliveries: %s", deliveries, event)
+            else:
+                self._queue.put((event, deliveries))
+            self._queue.task_done()
+
+    def join(self) -> None:
+        self._queue.join()
+
+
+class RedisStreamQueue(EventQueue):
+    """Redis stream consumed through a consumer group.
+
+    Every process is a separate consumer (hostname and pid by default,
+    read at use so workers forked from a preloading master differ).
+    Entries pending on any consumer for longer than ``claim_idle`` seconds
+    (its batch failed, or it died) are claimed and redelivered before new
+    ones are read; those delivered ``max_deliveries`` times are dropped.
+    """
+
+    GROUP = "notifiers"
+
+    def __init__(
+        self,
+        url: Optional[str],
+        stream: str,
+        consumer: Optional[str] = None,
+        claim_idle: int = 60,
+        max_deliveries: int = 5,
+        client=None,
+    ) -> None:
+        import redis
+
+        if client is None:
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self._client = client
+        self._response_error = redis.ResponseError
+        self.stream = stream
+        self._consumer = consumer
+        self.claim_idle = claim_idle
+        self.max_deliveries = max_deliveries
+        self._group_ready = False
+        self._next_claim = 0.0
+
+    @property
+    def consumer(self) -> str:
+        return self._consumer or f"{socket.gethostname()}-{os.getpid()}"
+
+    def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            self._client.xgroup_create(self.stream, self.GROUP, id="0", mkstream=True)
+        except self._response_error as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    def put(self, event: dict) -> None:
+        self._client.xadd(self.stream, {"event": json.dumps(event)})
+
+    def _claim_stale(self, max_items: int) -> list[tuple[str, dict]]:
+        # Checked at most every claim_idle / 2 seconds once nothing is stale
+        if time.monotonic() < self._next_claim:
+            return []
+        min_idle = self.claim_idle * 1000
+        exhausted = [
+            entry["message_id"]
+            for entry in self._client.xpending_range(
+                self.stream, self.GROUP, min="-", max="+", count=max_items, idle=min_idle
+            )
+            if entry["times_delivered"] >= self.max_deliveries
+        ]
+        if exhausted:
+            logger.error("Dropping %d notification events after %d deliveries", len(exhausted), self.max_deliveries)
+            self.ack(exhausted)
+        _, entries, *_ = self._client.xautoclaim(
+            self.stream, self.GROUP, self.consumer,
+            min_idle_time=min_idle, start_id="0-0", count=max_items,
+        )
+        # Entries deleted from the stream come back without fields
+        gone = [entry_id for entry_id, fields in entries if not fields]
+        if gone:
+            self._client.xack(self.stream, self.GROUP, *gone)
+        claimed = [(entry_id, json.loads(fields["event"])) for entry_id, fields in entries if fields]
+        if claimed:
+            logger.warning("Claimed %d notification events left pending by another consumer", len(claimed))
+        else:
+            self._next_claim = time.monotonic() + self.claim_idle / 2
+        return claimed
+
+    def get_batch(self, max_items: int, timeout: float) -> list[tuple[str, dict]]:
+        self._ensure_group()
+        claimed = self._claim_stale(max_items)
+        if claimed:
+            return claimed
+        response = self._client.xreadgroup(
+            self.GROUP, self.consumer, {self.stream: ">"},
+            count=max_items, block=int(timeout * 1000) or None,
+        )
+        return [
+            (entry_id, json.loads(fields["event"]))
+            for _, entries in response or []
+            for entry_id, fields in entries
+        ]
+
+    def ack(self, tokens: list[str]) -> None:
+        if tokens:
+            self._client.xack(self.stream, self.GROUP, *tokens)
+            self._client.xdel(self.stream, *tokens)
+
+    def retry(self, tokens: list[str]) -> None:
+        # Left pending: claimed again once idle for claim_idle seconds
+        pass
+
+    def join(self) -> None:
+        while self._client.xlen(self.stream):
+            time.sleep(0.05)
+
+
+def resolve_notifications(db: Session, events: list[dict]) -> list[dict]:
+    """Turn a batch of events into notification rows.
+
+    Recipients are looked up with one query per event kind, whatever the
+    batch size. Actors are never notified about their own activity.
+    """
+    post_ids = {e["post_id"] for e in events if e["type"] in (NEW_COMMENT, NEW_REACTION)}
+    scene_ids = {e["scene_id"] for e in events if e["type"] == NEW_SCENE_POST}
+
+    post_authors: dict[int, int] = {}
+    if post_ids:
+        post_authors = dict(db.execute(
+            select(PostModel.id, PostModel.author_user_id).where(PostModel.id.in_(post_ids))
+        ).all())
+
+    # scene_id -> {user_id: id of their first turn}; a turn notifies only
+    # those who had joined the scene before it, however late the worker runs
+    scene_participants: dict[int, dict[int, int]] = {}
+    if scene_ids:
+        for scene_id, user_id, first_turn_id in db.execute(
+            select(ScenePostModel.scene_id, ScenePostModel.author_user_id, func.min(ScenePostModel.id))
+            .where(ScenePostModel.scene_id.in_(scene_ids))
+            .group_by(ScenePostModel.scene_id, ScenePostModel.author_user_id)
+        ):
+            scene_participants.setdefault(scene_id, {})[user_id] = first_turn_id
+
+    rows = []
+    for event in events:
+        kind = event["type"]
+        if kind == NEW_SCENE_POST:
+            recipients = {
+                user_id
+                for user_id, first_turn_id in scene_participants.get(event["scene_id"], {}).items()
+                if first_turn_id < event["scene_post_id"]
+            }
+            group_key = f"{kind}:scene:{event['scene_id']}"
+        else:
+            author_id = post_authors.get(event["post_id"])
+            recipients = {author_id} if author_id is not None else set()
+            group_key = f"{kind}:post:{event['post_id']}"
+        payload = json.dumps({k: v for k, v in event.items() if k != "type"})
+        rows.extend(
+            {"user_id": user_id, "type": kind, "payload": payload, "group_key": group_key, "count": 1}
+            for user_id in sorted(recipients)
+            if user_id != event["actor_id"]
+        )
+    return rows
+
+
+def coalesce_rows(rows: list[dict]) -> list[dict]:
+    """Merge rows for the same (user, group): counts add up, the last payload wins."""
+    merged: dict[tuple[int, str], dict] = {}
+    for row in rows:
+        key = (row["user_id"], row["group_key"])
+        if key in merged:
+            merged[key] = {**row, "count": merged[key]["count"] + row["count"]}
+        else:
+            merged[key] = row
+    return list(merged.values())
+
+
+def upsert_notifications(db: Session, rows: list[dict]) -> dict[int, int]:
+    """Insert coalesced rows, folding them into existing unread rows of the same group.
+
+    Returns, per user, how many new unread rows were created. Does not commit.
+    """
+    now = datetime.utcnow()
+    created: dict[int, int] = {}
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        chunk = rows[start:start + UPSERT_CHUNK_SIZE]
+        stmt = dialect_insert(db, NotificationModel).values([
+            {**row, "is_read": False, "created_at": now, "updated_at": now} for row in chunk
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[NotificationModel.user_id, NotificationModel.group_key],
+            index_where=NotificationModel.is_read == false(),
+            set_={
+                "count": NotificationModel.count + stmt.excluded.count,
+                "payload": stmt.excluded.payload,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(NotificationModel.user_id, NotificationModel.group_key, NotificationModel.count)
+
+        batch_counts = {(row["user_id"], row["group_key"]): row["count"] for row in chunk}
+        for user_id, group_key, count in db.execute(stmt):
+            # A row whose count equals what this batch contributed was freshly inserted
+            if count == batch_counts[(user_id, group_key)]:
+                created[user_id] = created.get(user_id, 0) + 1
+    return created
+
+
+def _unread_key(user_id: int) -> str:
+    return f"notifications:unread:{user_id}"
+
+
+def get_unread_count(db: Session, user_id: int) -> int:
+    """Unread notification count for the header badge, served from cache when warm."""
+    cache = get_cache()
+    cached = cache.get(_unread_key(user_id))
+    if cached is not None and cached != _RECOUNT:
+        return int(cached)
+    count = db.query(func.count(NotificationModel.id)).filter(
+        NotificationModel.user_id == user_id,
+        NotificationModel.is_read.is_(False),
+    ).scalar()
+    if cached is None:
+        cache.add(_unread_key(user_id), str(count), ttl=settings.NOTIFICATION_UNREAD_TTL_SECONDS)
+    return count
+
+
+def _adjust_unread(user_id: int, delta: int) -> None:
+    """Apply a committed change to the cached badge, or mark it for recount."""
+    cache = get_cache()
+    value = cache.incr_if_present(_unread_key(user_id), delta)
+    if value is None or value < 0:
+        cache.set(_unread_key(user_id), _RECOUNT, ttl=UNREAD_RECOUNT_SECONDS)
+
+
+def inbox_position():
+    """The inbox sort key: latest activity, then id."""
+    return tuple_(NotificationModel.updated_at, NotificationModel.id)
+
+
+def mark_read_up_to(
+    db: Session, user_id: int, up_to_id: int, updated_at: Optional[datetime] = None
+) -> int:
+    """Mark the user's notifications at or before ``up_to_id`` in inbox order read.
+
+    ``updated_at`` is that notification's activity time as the client saw it
+    (default: its current value). Groups coalesced after it sort later and
+    stay unread. Returns the number of rows changed. Commits.
+    """
+    if updated_at is None:
+        updated_at = db.execute(
+            select(NotificationModel.updated_at).where(
+                NotificationModel.id == up_to_id, NotificationModel.user_id == user_id
+            )
+        ).scalar()
+        if updated_at is None:
+            return 0
+    result = db.execute(
+        update(NotificationModel)
+        .where(
+            NotificationModel.user_id == user_id,
+            inbox_position() <= tuple_(updated_at, up_to_id),
+            NotificationModel.is_read.is_(False),
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if result.rowcount:
+        _adjust_unread(user_id, -result.rowcount)
+    return result.rowcount
+
+
+class NotificationDispatcher:
+    """Publishes events and runs the worker that turns them into notifications."""
+
+    POLL_SECONDS = 0.1
+
+    def __init__(
+        self,
+        event_queue: EventQueue,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 500,
+    ) -> None:
+        self.queue = event_queue
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, type: str, actor_id: int, **fields) -> None:
+        """Queue an event. Call after the triggering row is committed."""
+        self.queue.put({"type": type, "actor_id": actor_id, **fields})
+
+    def process(self, events: list[dict]) -> int:
+        """Resolve and upsert notifications for ``events``; return rows written."""
+        db = self.session_factory()
+        try:
+            rows = coalesce_rows(resolve_notifications(db, events))
+            created = upsert_notifications(db, rows) if rows else {}
+            db.commit()
+        finally:
+            db.close()
+        for user_id, new_rows in created.items():
+            _adjust_unread(user_id, new_rows)
+        return len(rows)
+
+    def _handle(self, batch: list[tuple[str, dict]]) -> None:
+        tokens = [token for token, _ in batch]
+        try:
+            self.process([event for _, event in batch])
+        except Exception:
+            logger.exception("Notification batch of %d events failed; will retry", len(batch))
+            self.queue.retry(tokens)
+        else:
+            self.queue.ack(tokens)
+
+    def drain(self) -> None:
+        """Wait until everything published so far is processed.
+
+        Processes inline when the worker is not running (scripts, tests).
+        """
+        if self._thread is not None:
+            self.queue.join()
+            return
+        while batch := self.queue.get_batch(self.batch_size, timeout=0):
+            self._handle(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self.queue.get_batch(self.batch_size, timeout=self.POLL_SECONDS)
+            if batch:
+                self._handle(batch)
+        while batch := self.queue.get_batch(self.batch_size, timeout=0):
+            self._handle(batch)
+
+    def start(self) -> None:
+        """Start the background worker (no-op if already running)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="notification-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker after it processes what is already queued."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+def _make_queue() -> EventQueue:
+    if settings.NOTIFICATION_QUEUE == "redis":
+        return RedisStreamQueue(
+            settings.REDIS_URL,
+            settings.NOTIFICATION_STREAM,
+            claim_idle=settings.NOTIFICATION_CLAIM_IDLE_SECONDS,
+            max_deliveries=settings.NOTIFICATION_MAX_DELIVERIES,
+        )
+    return MemoryEventQueue(max_deliveries=settings.NOTIFICATION_MAX_DELIVERIES)
+
+
+notifier = NotificationDispatcher(_make_queue(), batch_size=settings.NOTIFICATION_BATCH_SIZE)
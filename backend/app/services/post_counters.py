@@ -0,0 +1,148 @@
+"""Denormalized comment and reaction counters on posts.
+
+Counter writes carry ``updated_at`` through unchanged: it records content
+edits, not activity. Each write invalidates the cached posts it touches.
+"""
+import logging
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.comment import Comment as CommentModel
+from app.models.post import Post as PostModel
+from app.models.reaction import Reaction as ReactionModel
+from app.services.entity_cache import post_cache
+
+logger = logging.getLogger(__name__)
+
+
+def increment_comment_count(db: Session, post_id: int, delta: int = 1) -> None:
+    """Atomically adjust a post's comment_count. Does not commit."""
+    db.execute(
+        update(PostModel)
+        .where(PostModel.id == post_id)
+        .values(comment_count=PostModel.comment_count + delta, updated_at=PostModel.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    post_cache.invalidate(post_id)
+
+
+def merge_reaction_counts(current: Optional[dict], deltas: dict[str, int]) -> dict[str, int]:
+    """Apply per-type deltas to a reaction_counts mapping, dropping empty types."""
+    merged = dict(current or {})
+    for type_, delta in deltas.items():
+        value = merged.get(type_, 0) + delta
+        if value > 0:
+            merged[type_] = value
+        else:
+            merged.pop(type_, None)
+    return merged
+
+
+def apply_reaction_deltas(db: Session, deltas: dict[int, dict[str, int]]) -> None:
+    """Apply {post_id: {type: delta}} to posts.reaction_counts. Does not commit.
+
+    Locks the affected rows (FOR UPDATE where supported) with one SELECT,
+    then writes them back with one executemany UPDATE.
+    """
+    if not deltas:
+        return
+    rows = db.execute(
+        select(PostModel.id, PostModel.reaction_counts, PostModel.updated_at)
+        .where(PostModel.id.in_(deltas))
+        .with_for_update()
+    ).all()
+    params = [
+        {
+            "id": post_id,
+            "reaction_counts": merge_reaction_counts(counts, deltas[post_id]),
+            "updated_at": updated_at,
+        }
+        for post_id, counts, updated_at in rows
+    ]
+    if params:
+        db.execute(update(PostModel), params)
+        post_cache.invalidate(*(p["id"] for p in params))
+
+
+def recompute_reaction_counts(db: Session, post_ids: list[int]) -> None:
+    """Rebuild reaction_counts for ``post_ids`` from the reactions table. Does not commit.
+
+    The post rows are locked before counting, so concurrent recomputes of
+    the same post serialize and the last writer sees every committed reaction.
+    """
+    if not post_ids:
+        return
+    rows = db.execute(
+        select(PostModel.id, PostModel.updated_at).where(PostModel.id.in_(post_ids)).with_for_update()
+    ).all()
+    counts: dict[int, dict[str, int]] = {post_id: {} for post_id in post_ids}
+    for post_id, type_, count in db.execute(
+        select(ReactionModel.post_id, ReactionModel.type, func.count(ReactionModel.id))
+        .where(ReactionModel.post_id.in_(post_ids))
+        .group_by(ReactionModel.post_id, ReactionModel.type)
+    ).all():
+        counts[post_id][type_] = count
+    if rows:
+        db.execute(update(PostModel), [
+            {"id": post_id, "reaction_counts": counts[post_id], "updated_at": updated_at}
+            for post_id, updated_at in rows
+        ])
+        post_cache.invalidate(*(post_id for post_id, _ in rows))
+
+
+def repair_post_counters(db: Session, batch_size: int = 500) -> int:
+    """Recompute every post's counters from comments/reactions, fixing drift.
+
+    Walks posts in id order, one batch per transaction. Returns the number
+    of posts whose stored counters were wrong.
+    """
+    repaired = 0
+    last_id = 0
+    while True:
+        posts = db.execute(
+            select(PostModel.id, PostModel.comment_count, PostModel.reaction_counts, PostModel.updated_at)
+            .where(PostModel.id > last_id)
+            .order_by(PostModel.id)
+            .limit(batch_size)
+        ).all()
+        if not posts:
+            break
+        ids = [p.id for p in posts]
+        last_id = ids[-1]
+
+        comments = dict(
+            db.execute(
+                select(CommentModel.post_id, func.count(CommentModel.id))
+                .where(CommentModel.post_id.in_(ids))
+                .group_by(CommentModel.post_id)
+            ).all()
+        )
+        reactions: dict[int, dict[str, int]] = {}
+        for post_id, type_, count in db.execute(
+            select(ReactionModel.post_id, ReactionModel.type, func.count(ReactionModel.id))
+            .where(ReactionModel.post_id.in_(ids))
+            .group_by(ReactionModel.post_id, ReactionModel.type)
+        ).all():
+            reactions.setdefault(post_id, {})[type_] = count
+
+        fixes = []
+        for post in posts:
+            comment_count = comments.get(post.id, 0)
+            reaction_counts = reactions.get(post.id, {})
+            if post.comment_count != comment_count or (post.reaction_counts or {}) != reaction_counts:
+                fixes.append({
+                    "id": post.id,
+                    "comment_count": comment_count,
+                    "reaction_counts": reaction_counts,
+                    "updated_at": post.updated_at,
+                })
+        if fixes:
+            db.execute(update(PostModel), fixes)
+            post_cache.invalidate(*(f["id"] for f in fixes))
+        db.commit()
+        repaired += len(fixes)
+
+    logger.info("Post counter repair: %d posts fixed", repaired)
+    return repaired
@@ -0,0 +1,133 @@
+"""Write-behind buffer for posts.reaction_counts.
+
+Hot posts (e.g. in The Commons) get bursts of reactions; updating the
+counter row on every tap makes every request queue on the same row lock.
+When REACTION_BUFFER_FLUSH_MS > 0 the reaction routes only note, once their
+transaction commits, which posts changed, and a background thread rewrites
+the counters of the posts touched since the last flush every interval: one
+aggregate over the reactions table, one locking SELECT and one executemany
+UPDATE.
+
+Flushes write absolute counts recomputed from the reactions table (the
+source of truth) rather than adding deltas, so they are idempotent: a
+startup ``replay_recent_reactions`` in one worker cannot double-count with
+deltas a sibling has not flushed yet, and removals lost with a dead worker
+are recovered too. ``python -m app.cli repair-counters`` fixes anything older.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.reaction import Reaction as ReactionModel
+from app.services.post_counters import apply_reaction_deltas, recompute_reaction_counts
+
+logger = logging.getLogger(__name__)
+
+
+class ReactionCounterBuffer:
+    """Tracks posts with reaction changes and recomputes their counters in batches."""
+
+    def __init__(self, interval_ms: int, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self.interval_ms = interval_ms
+        self.session_factory = session_factory
+        self._pending: set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_ms > 0
+
+    def add(self, post_id: int) -> None:
+        """Mark a post whose reactions changed (and committed) for the next flush."""
+        with self._lock:
+            self._pending.add(post_id)
+
+    def pending(self) -> set[int]:
+        """Posts waiting for the next flush."""
+        with self._lock:
+            return set(self._pending)
+
+    def flush(self) -> int:
+        """Recompute counters for posts with pending changes; return posts touched.
+
+        On failure the posts are put back so the next flush retries them.
+        """
+        with self._lock:
+            batch = sorted(self._pending)
+            self._pending.clear()
+        if not batch:
+            return 0
+
+        db = self.session_factory()
+        try:
+            recompute_reaction_counts(db, batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._pending.update(batch)
+            logger.exception("Reaction counter flush failed; will retry")
+            return 0
+        finally:
+            db.close()
+        return len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_ms / 1000):
+            self.flush()
+        self.flush()
+
+    def start(self) -> None:
+        """Start the background flusher (no-op when disabled or running)."""
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reaction-counter-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher after a final flush."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+reaction_buffer = ReactionCounterBuffer(settings.REACTION_BUFFER_FLUSH_MS)
+
+
+def record_reaction_delta(db: Session, post_id: int, type: str, delta: int) -> None:
+    """Count a reaction change in ``db``'s transaction, or (buffered) once it commits.
+
+    A flush recomputes from the reactions table, so the post is only marked
+    after the change is visible there; one marked earlier could be flushed
+    from the old rows and dropped.
+    """
+    if reaction_buffer.enabled:
+        event.listen(db, "after_commit", lambda session: reaction_buffer.add(post_id), once=True)
+    else:
+        apply_reaction_deltas(db, {post_id: {type: delta}})
+
+
+def replay_recent_reactions(db: Session, window_seconds: int) -> int:
+    """Rebuild reaction_counts for posts reacted to in the last ``window_seconds``.
+
+    Recovers deltas a crashed worker buffered but never flushed. Returns the
+    number of posts recomputed. Commits.
+    """
+    since = datetime.utcnow() - timedelta(seconds=window_seconds)
+    post_ids = list(db.execute(
+        select(ReactionModel.post_id).where(ReactionModel.created_at >= since).distinct()
+    ).scalars())
+    recompute_reaction_counts(db, post_ids)
+    db.commit()
+    return len(post_ids)
@@ -0,0 +1,96 @@
+"""Reaction helpers shared by the reaction and post routes."""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, case, delete, exists, func, literal, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.database import dialect_insert
+from app.models.post import Post as PostModel
+from app.models.reaction import Reaction as ReactionModel
+from app.schemas.reaction import ReactionSummary
+
+_RETURNED = (
+    ReactionModel.id,
+    ReactionModel.post_id,
+    ReactionModel.user_id,
+    ReactionModel.type,
+    ReactionModel.created_at,
+)
+
+
+def insert_reaction(db: Session, post_id: int, user_id: int, type: str) -> Optional[Row]:
+    """Insert a reaction in one statement; return the new row, or None.
+
+    ``INSERT ... SELECT ... WHERE EXISTS(post) ON CONFLICT DO NOTHING RETURNING``:
+    None means the post does not exist or the user already reacted with
+    this type (the unique constraint makes concurrent taps safe). Does not commit.
+    """
+    source = select(
+        literal(post_id, Integer),
+        literal(user_id, Integer),
+        literal(type, String),
+        literal(datetime.utcnow(), DateTime),
+    ).where(exists().where(PostModel.id == post_id))
+    stmt = (
+        dialect_insert(db, ReactionModel)
+        .from_select(["post_id", "user_id", "type", "created_at"], source)
+        .on_conflict_do_nothing(index_elements=["post_id", "user_id", "type"])
+        .returning(*_RETURNED)
+    )
+    return db.execute(stmt).first()
+
+
+def find_reaction(db: Session, post_id: int, user_id: int, type: str) -> Optional[Row]:
+    """Return a user's existing reaction of ``type`` on a post, if any."""
+    return db.execute(
+        select(*_RETURNED).where(
+            ReactionModel.post_id == post_id,
+            ReactionModel.user_id == user_id,
+            ReactionModel.type == type,
+        )
+    ).first()
+
+
+def remove_reaction(db: Session, post_id: int, user_id: int, type: str) -> bool:
+    """Delete a user's reaction of ``type`` on a post; return whether one existed."""
+    deleted = db.execute(
+        delete(ReactionModel)
+        .where(
+            ReactionModel.post_id == post_id,
+            ReactionModel.user_id == user_id,
+            ReactionModel.type == type,
+        )
+        .returning(ReactionModel.id)
+    ).first()
+    return deleted is not None
+
+
+def summarize_reactions(
+    db: Session,
+    post_ids: list[int],
+    user_id: Optional[int] = None,
+) -> dict[int, ReactionSummary]:
+    """Return a ReactionSummary for every requested post in one GROUP BY query."""
+    summaries = {post_id: ReactionSummary(post_id=post_id) for post_id in post_ids}
+    if not post_ids:
+        return summaries
+
+    mine = func.max(case((ReactionModel.user_id == user_id, 1), else_=0)) if user_id else None
+    columns = [ReactionModel.post_id, ReactionModel.type, func.count(ReactionModel.id)]
+    if mine is not None:
+        columns.append(mine)
+
+    rows = (
+        db.query(*columns)
+        .filter(ReactionModel.post_id.in_(post_ids))
+        .group_by(ReactionModel.post_id, ReactionModel.type)
+        .all()
+    )
+    for row in rows:
+        summary = summaries[row[0]]
+        summary.counts[row[1]] = row[2]
+        if mine is not None and row[3]:
+            summary.my_reactions.append(row[1])
+    return summaries
@@ -0,0 +1,70 @@
+"""Versioned read-through cache for the realm directory.
+
+The public realm listing and single-realm lookups are read by nearly every
+visitor and change rarely. Entries live under the ``realms`` namespace; any
+realm write bumps the namespace version so stale entries are never served.
+"""
+from typing import Callable, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.core.cache import bump_namespace, get_cache, versioned_key
+from app.core.config import settings
+from app.models.realm import Realm as RealmModel
+from app.schemas.realm import Realm
+
+NAMESPACE = "realms"
+
+_realm_list = TypeAdapter(list[Realm])
+
+
+def _cached_realm(key: str, load: Callable[[], Optional[RealmModel]]) -> Optional[Realm]:
+    cache = get_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return Realm.model_validate_json(cached)
+
+    realm = load()
+    if realm is None:
+        return None
+    result = Realm.model_validate(realm)
+    cache.set(key, result.model_dump_json(), ttl=settings.REALM_CACHE_TTL_SECONDS)
+    return result
+
+
+def get_public_realms(db: Session) -> list[Realm]:
+    """Return all public realms, served from cache when possible."""
+    cache = get_cache()
+    key = versioned_key(NAMESPACE, "public")
+    cached = cache.get(key)
+    if cached is not None:
+        return _realm_list.validate_json(cached)
+
+    realms = _realm_list.validate_python(
+        db.query(RealmModel).filter(RealmModel.is_public == True).all(),
+        from_attributes=True,
+    )
+    cache.set(key, _realm_list.dump_json(realms).decode(), ttl=settings.REALM_CACHE_TTL_SECONDS)
+    return realms
+
+
+def get_realm_by_id(db: Session, realm_id: int) -> Optional[Realm]:
+    """Return a realm by ID, served from cache when possible."""
+    return _cached_realm(
+        versioned_key(NAMESPACE, "id", realm_id),
+        lambda: db.query(RealmModel).filter(RealmModel.id == realm_id).first(),
+    )
+
+
+def get_realm_by_slug(db: Session, slug: str) -> Optional[Realm]:
+    """Return a realm by slug, served from cache when possible."""
+    return _cached_realm(
+        versioned_key(NAMESPACE, "slug", slug),
+        lambda: db.query(RealmModel).filter(RealmModel.slug == slug).first(),
+    )
+
+
+def invalidate_realms() -> None:
+    """Drop every cached realm entry. Call after any realm insert/update/delete."""
+    bump_namespace(NAMESPACE)
@@ -0,0 +1,203 @@
+"""Full-text search over posts, scene turns and characters.
+
+Backed by the indexes declared in ``app.models.search_index``: FTS5 ``MATCH``
+with ``bm25``/``snippet`` on SQLite, ``@@`` with ``ts_rank``/``ts_headline`` on
+Postgres. Every query applies the same visibility rules as the read routes.
+
+Raw scores are only comparable within one index (bm25 depends on each FTS
+table's own statistics), so each kind's scores are divided by that kind's
+best score before the kinds are merged: ``rank`` is relevance relative to
+the top hit of the same kind, in (0, 1].
+"""
+import re
+from typing import Iterable, Optional
+
+from sqlalchemy import column, func, literal_column, or_, select, table, text
+from sqlalchemy.orm import Session
+
+from app.models.character import Character as CharacterModel, VisibilityEnum
+from app.models.post import ContentTypeEnum, Post as PostModel
+from app.models.realm import Realm as RealmModel, RealmMembership as RealmMembershipModel
+from app.models.scene import Scene as SceneModel, SceneVisibilityEnum
+from app.models.scene_post import ScenePost as ScenePostModel
+from app.models.search_index import SQLITE_FTS_TABLES
+from app.schemas.search import SearchHit, SearchKind
+
+ALL_KINDS: tuple[SearchKind, ...] = ("post", "scene_post", "character")
+
+_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=1, MaxWords=24, MinWords=8"
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class _Matcher:
+    """Dialect-specific pieces of a full-text query against one table."""
+
+    def __init__(self, db: Session, query: str) -> None:
+        self.dialect = db.get_bind().dialect.name
+        if self.dialect == "postgresql":
+            self.tsquery = func.plainto_tsquery("english", query)
+        else:
+            # Quote every token so user input can never form FTS5 syntax.
+            self.fts_query = " ".join(f'"{t}"' for t in _TOKEN_RE.findall(query.lower()))
+
+    def apply(self, stmt, model, table_name: str):
+        """Restrict ``stmt`` to matching rows; return (stmt, score, order_by).
+
+        Scores are normalised so that higher always means more relevant.
+        """
+        if self.dialect == "postgresql":
+            vector = literal_column(f"{table_name}.search_vector")
+            stmt = stmt.where(vector.op("@@")(self.tsquery))
+            rank = func.ts_rank(vector, self.tsquery)
+            return stmt, rank, rank.desc()
+
+        fts_name, _ = SQLITE_FTS_TABLES[table_name]
+        fts = table(fts_name, column("rowid"))
+        stmt = stmt.join(fts, fts.c.rowid == model.id).where(
+            text(f"{fts_name} MATCH :fts_query").bindparams(fts_query=self.fts_query)
+        )
+        bm25 = literal_column(f"bm25({fts_name})")
+        return stmt, -bm25, bm25.asc()
+
+    def snippet(self, table_name: str, headline_source):
+        """Return a highlighted excerpt expression with matches in <mark> tags."""
+        if self.dialect == "postgresql":
+            return func.ts_headline("english", headline_source, self.tsquery, _HEADLINE_OPTIONS)
+        fts_name, _ = SQLITE_FTS_TABLES[table_name]
+        return literal_column(f"snippet({fts_name}, -1, '<mark>', '</mark>', '…', 16)")
+
+    @property
+    def empty(self) -> bool:
+        return self.dialect != "postgresql" and not self.fts_query
+
+
+def _member_realm_ids(user_id: Optional[int]):
+    return select(RealmMembershipModel.realm_id).where(RealmMembershipModel.user_id == user_id)
+
+
+def _search_posts(db, matcher, user_id, limit, realm_id, content_type, post_kind) -> list[SearchHit]:
+    stmt = select(
+        PostModel.id, PostModel.title, PostModel.realm_id, PostModel.created_at
+    ).outerjoin(RealmModel, RealmModel.id == PostModel.realm_id)
+    stmt, rank, order = matcher.apply(stmt, PostModel, "posts")
+    snippet = matcher.snippet("posts", func.coalesce(PostModel.title, "") + " " + PostModel.content)
+
+    visible = [PostModel.realm_id.is_(None), RealmModel.is_public == True]
+    if user_id is not None:
+        visible.append(PostModel.realm_id.in_(_member_realm_ids(user_id)))
+    stmt = stmt.where(or_(*visible))
+    if realm_id is not None:
+        stmt = stmt.where(PostModel.realm_id == realm_id)
+    if content_type is not None:
+        stmt = stmt.where(PostModel.content_type == content_type)
+    if post_kind is not None:
+        stmt = stmt.where(PostModel.post_kind == post_kind)
+
+    rows = db.execute(stmt.add_columns(rank, snippet).order_by(order).limit(limit)).all()
+    return [
+        SearchHit(
+            kind="post", id=r[0], title=r[1], realm_id=r[2], created_at=r[3],
+            rank=float(r[4]), snippet=r[5],
+        )
+        for r in rows
+    ]
+
+
+def _search_scene_posts(db, matcher, user_id, limit, realm_id) -> list[SearchHit]:
+    # Scenes are members-only; anonymous searchers never see scene turns.
+    if user_id is None:
+        return []
+    stmt = select(
+        ScenePostModel.id, SceneModel.title, SceneModel.realm_id, ScenePostModel.scene_id,
+        ScenePostModel.created_at,
+    ).join(SceneModel, SceneModel.id == ScenePostModel.scene_id)
+    stmt, rank, order = matcher.apply(stmt, ScenePostModel, "scene_posts")
+    snippet = matcher.snippet("scene_posts", ScenePostModel.content)
+
+    stmt = stmt.where(
+        or_(SceneModel.realm_id.is_(None), SceneModel.realm_id.in_(_member_realm_ids(user_id))),
+        or_(
+            SceneModel.visibility == SceneVisibilityEnum.PUBLIC,
+            SceneModel.created_by_user_id == user_id,
+        ),
+    )
+    if realm_id is not None:
+        stmt = stmt.where(SceneModel.realm_id == realm_id)
+
+    rows = db.execute(stmt.add_columns(rank, snippet).order_by(order).limit(limit)).all()
+    return [
+        SearchHit(
+            kind="scene_post", id=r[0], title=r[1], realm_id=r[2], scene_id=r[3],
+            created_at=r[4], rank=float(r[5]), snippet=r[6],
+        )
+        for r in rows
+    ]
+
+
+def _search_characters(db, matcher, user_id, limit) -> list[SearchHit]:
+    stmt = select(CharacterModel.id, CharacterModel.name, CharacterModel.created_at)
+    stmt, rank, order = matcher.apply(stmt, CharacterModel, "characters")
+    snippet = matcher.snippet(
+        "characters",
+        func.coalesce(CharacterModel.short_bio, "") + " " + func.coalesce(CharacterModel.long_bio, ""),
+    )
+
+    visible = [CharacterModel.visibility == VisibilityEnum.PUBLIC]
+    if user_id is not None:
+        visible.append(CharacterModel.owner_id == user_id)
+    stmt = stmt.where(or_(*visible))
+
+    rows = db.execute(stmt.add_columns(rank, snippet).order_by(order).limit(limit)).all()
+    return [
+        SearchHit(
+            kind="character", id=r[0], title=r[1], created_at=r[2], rank=float(r[3]), snippet=r[4],
+        )
+        for r in rows
+    ]
+
+
+def _normalized(hits: list[SearchHit]) -> list[SearchHit]:
+    """Scale one kind's scores (best first) so its top hit ranks 1.0."""
+    if not hits or hits[0].rank <= 0:
+        return hits
+    best = hits[0].rank
+    return [hit.model_copy(update={"rank": hit.rank / best}) for hit in hits]
+
+
+def search(
+    db: Session,
+    query: str,
+    user_id: Optional[int] = None,
+    kinds: Iterable[SearchKind] = ALL_KINDS,
+    realm_id: Optional[int] = None,
+    content_type: Optional[ContentTypeEnum] = None,
+    post_kind: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> list[SearchHit]:
+    """Run a ranked full-text search visible to ``user_id`` (None = anonymous).
+
+    ``content_type`` and ``post_kind`` only exist on posts, so setting either
+    restricts results to posts; ``realm_id`` excludes characters.
+    """
+    matcher = _Matcher(db, query)
+    if matcher.empty:
+        return []
+
+    kinds = set(kinds)
+    if content_type is not None or post_kind is not None:
+        kinds &= {"post"}
+    if realm_id is not None:
+        kinds.discard("character")
+
+    window = offset + limit
+    hits: list[SearchHit] = []
+    if "post" in kinds:
+        hits += _normalized(_search_posts(db, matcher, user_id, window, realm_id, content_type, post_kind))
+    if "scene_post" in kinds:
+        hits += _normalized(_search_scene_posts(db, matcher, user_id, window, realm_id))
+    if "character" in kinds:
+        hits += _normalized(_search_characters(db, matcher, user_id, window))
+
+    hits.sort(key=lambda h: h.rank, reverse=True)
+    return hits[offset:window]
@@ -0,0 +1,41 @@
+"""Coalesce concurrent identical async calls into one.
+
+The first caller for a key starts the work as its own task; callers that
+arrive while it is running await the same task instead of repeating it.
+The task is shielded, so one caller disconnecting does not cancel the
+work for everyone else.
+"""
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Per-process registry of in-flight calls by key."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run ``fn`` once per key at a time; return ``(result, shared)``.
+
+        ``shared`` is True when the caller joined a call already in flight.
+        """
+        task = self._inflight.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        return await asyncio.shield(task), shared
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,52 @@
+"""Benchmark the in-process autocomplete prefix index.
+
+Loads N synthetic names into a PrefixIndex and times prefix queries and
+incremental inserts.
+
+Usage (from backend/):
+    python -m benchmarks.bench_autocomplete --names 1000000
+"""
+import argparse
+import random
+import string
+import time
+
+from app.services.autocomplete import PrefixIndex
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    letters = string.ascii_lowercase
+    names = [
+        (i, "".join(rng.choices(letters, k=rng.randint(4, 14))))
+        for i in range(1, args.names + 1)
+    ]
+
+    index = PrefixIndex()
+    t0 = time.perf_counter()
+    index.bulk_load(names)
+    print(f"loaded {len(index):,} names in {time.perf_counter() - t0:.2f}s")
+
+    prefixes = ["".join(rng.choices(letters, k=rng.randint(1, 4))) for _ in range(args.queries)]
+    t0 = time.perf_counter()
+    for prefix in prefixes:
+        index.search(prefix, args.limit)
+    elapsed = time.perf_counter() - t0
+    print(f"{args.queries:,} prefix queries: {elapsed / args.queries * 1e6:.1f} µs/query")
+
+    inserts = 1_000
+    t0 = time.perf_counter()
+    for i in range(inserts):
+        index.add(args.names + i + 1, "".join(rng.choices(letters, k=8)))
+    elapsed = time.perf_counter() - t0
+    print(f"{inserts:,} incremental inserts: {elapsed / inserts * 1e6:.1f} µs/insert")
+
+
+if __name__ == "__main__":
+    main()
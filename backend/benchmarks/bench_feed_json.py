@@ -0,0 +1,83 @@
+"""Benchmark encoding a feed page of posts.
+
+Builds ``--items`` Post ORM objects (with authors) and times turning them
+into a response body three ways:
+
+- default: FastAPI's path (validate against ``response_model``, then
+  ``jsonable_encoder``, then stdlib ``json`` in JSONResponse)
+- orjson: the same validation and jsonable_encoder, rendered by ORJSONResponse
+- direct: ``model_list_response`` (validate once, pydantic serializer)
+
+Usage (from backend/):
+    python -m benchmarks.bench_feed_json --items 500 --rounds 200
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import model_list_response
+from app.models import ContentTypeEnum, Post as PostModel, PostKindEnum, User as UserModel
+from app.schemas.post import Post
+
+
+def make_posts(count: int) -> list[PostModel]:
+    now = datetime.utcnow()
+    authors = [UserModel(id=i, username=f"writer{i}", email=f"w{i}@example.com") for i in range(1, 21)]
+    return [
+        PostModel(
+            id=i,
+            realm_id=1 + i % 5,
+            author_user_id=authors[i % 20].id,
+            author_user=authors[i % 20],
+            title=f"Thread {i}",
+            content="Rain needles the neon as the courier ducks under the awning. " * 6,
+            content_type=ContentTypeEnum.IC,
+            post_kind=PostKindEnum.GENERAL,
+            comment_count=i % 7,
+            reaction_counts={"like": i % 11, "fire": i % 3},
+            created_at=now - timedelta(minutes=i),
+            updated_at=now - timedelta(minutes=i),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    posts = make_posts(args.items)
+    field = create_response_field(name="Response_get_feed", type_=List[Post])
+
+    def via_fastapi(response_class):
+        def render() -> bytes:
+            content = asyncio.run(serialize_response(field=field, response_content=posts, is_coroutine=False))
+            return response_class(content).body
+        return render
+
+    def direct() -> bytes:
+        return model_list_response(Post, posts).body
+
+    for label, render in (
+        ("default", via_fastapi(JSONResponse)),
+        ("orjson", via_fastapi(ORJSONResponse)),
+        ("direct", direct),
+    ):
+        size = len(render())
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            render()
+        per_page = (time.perf_counter() - started) / args.rounds
+        print(f"{label:>8}: {per_page * 1000:7.2f} ms/page  ({size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark direct vs. write-behind reaction counting on one hot post.
+
+Drives ``--rate`` reaction deltas per second at a single post from
+``--threads`` threads for ``--seconds``, first updating posts.reaction_counts
+in each request's own transaction, then through ReactionCounterBuffer. The
+time each tap spends in the counter write (waiting on the row/database lock
+plus the UPDATE itself) is reported as lock wait. Buffered flushes recompute
+counts from the (here empty) reactions table, so only timings are compared.
+
+Usage (from backend/):
+    python -m benchmarks.bench_reaction_buffer --rate 1000 --seconds 5
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Post, User
+from app.services.post_counters import apply_reaction_deltas
+from app.services.reaction_buffer import ReactionCounterBuffer
+
+
+def setup(url: str):
+    engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "email": "bench@example.com", "username": "bench", "hashed_password": "x",
+            "created_at": now, "updated_at": now,
+        }])
+        conn.execute(insert(Post), [{
+            "author_user_id": 1, "content": "hot post", "content_type": "IC", "post_kind": "general",
+            "comment_count": 0, "reaction_counts": {}, "created_at": now, "updated_at": now,
+        }])
+    return engine, sessionmaker(bind=engine)
+
+
+def drive(tap, rate: int, seconds: float, threads: int) -> tuple[list[float], float]:
+    """Call ``tap`` at roughly ``rate``/s across ``threads``.
+
+    Returns per-call waits (ms) and the wall-clock time taken.
+    """
+    waits: list[float] = []
+    lock = threading.Lock()
+    per_thread = rate / threads
+    deadline = time.perf_counter() + seconds
+
+    def worker() -> None:
+        interval = 1 / per_thread
+        next_at = time.perf_counter()
+        local = []
+        while next_at < deadline:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            t0 = time.perf_counter()
+            tap()
+            local.append((time.perf_counter() - t0) * 1000)
+            next_at += interval
+        with lock:
+            waits.extend(local)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return waits, time.perf_counter() - started
+
+
+def report(label: str, waits: list[float], elapsed: float, updates: int) -> None:
+    waits.sort()
+    print(f"{label}")
+    print(f"  taps/s achieved   {len(waits) / elapsed:10.0f}")
+    print(f"  lock wait p50     {waits[len(waits) // 2]:10.3f} ms")
+    print(f"  lock wait p99     {waits[int(len(waits) * 0.99)]:10.3f} ms")
+    print(f"  lock wait total   {sum(waits) / 1000:10.2f} s")
+    print(f"  UPDATE batches    {updates:10d}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--flush-ms", type=int, default=250)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_reactions.db')}"
+    engine, Session = setup(url)
+
+    def direct_tap() -> None:
+        db = Session()
+        try:
+            apply_reaction_deltas(db, {1: {"heart": 1}})
+            db.commit()
+        finally:
+            db.close()
+
+    waits, elapsed = drive(direct_tap, args.rate, args.seconds, args.threads)
+    report("direct (one UPDATE per tap)", waits, elapsed, len(waits))
+
+    buffer = ReactionCounterBuffer(args.flush_ms, session_factory=Session)
+    flushes = 0
+    original_flush = buffer.flush
+
+    def counting_flush() -> int:
+        nonlocal flushes
+        touched = original_flush()
+        flushes += 1 if touched else 0
+        return touched
+
+    buffer.flush = counting_flush
+    buffer.start()
+    waits, elapsed = drive(lambda: buffer.add(1), args.rate, args.seconds, args.threads)
+    buffer.stop()
+    report(f"write-behind (flush every {args.flush_ms} ms)", waits, elapsed, flushes)
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
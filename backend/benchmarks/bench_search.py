@@ -0,0 +1,98 @@
+"""Benchmark full-text search over a synthetic post corpus.
+
+Builds a throwaway SQLite database (or uses DATABASE_URL with --database-url),
+loads N synthetic posts through the normal insert path so the FTS triggers do
+the indexing, then times a mix of search queries.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search --posts 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Post, Realm, User
+from app.services.search import search
+
+WORDS = (
+    "dragon tower moon shadow blade whisper ember storm raven forest crown river "
+    "oath ghost neon chrome signal tavern hearth map silver letter wolf ridge frost "
+    "ash spire lantern veil thorn harbor relic cipher pilgrim comet orchard"
+).split()
+
+
+def build_corpus(engine, posts: int, batch: int = 10_000) -> None:
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "email": "bench@example.com", "username": "bench", "hashed_password": "x",
+            "created_at": now, "updated_at": now,
+        }])
+        conn.execute(insert(Realm), [{
+            "owner_id": 1, "name": f"Realm {i}", "slug": f"realm-{i}", "is_public": i % 4 != 0,
+            "is_commons": False, "created_at": now, "updated_at": now,
+        } for i in range(1, 51)])
+
+    for start in range(0, posts, batch):
+        rows = [{
+            "realm_id": rng.randint(1, 50),
+            "author_user_id": 1,
+            "title": " ".join(rng.choices(WORDS, k=3)),
+            "content": " ".join(rng.choices(WORDS, k=rng.randint(40, 120))),
+            "content_type": rng.choice(["IC", "OOC", "NARRATION"]),
+            "post_kind": "general",
+            "created_at": now,
+            "updated_at": now,
+        } for _ in range(min(batch, posts - start))]
+        with engine.begin() as conn:
+            conn.execute(insert(Post), rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.database_url
+    if url is None:
+        tmpdir = tempfile.mkdtemp()
+        url = f"sqlite:///{os.path.join(tmpdir, 'bench_search.db')}"
+    engine = create_engine(url)
+
+    started = time.perf_counter()
+    build_corpus(engine, args.posts)
+    print(f"indexed {args.posts:,} posts in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(7)
+    db = sessionmaker(bind=engine)()
+    timings = []
+    for _ in range(args.queries):
+        q = " ".join(rng.sample(WORDS, k=rng.randint(1, 3)))
+        t0 = time.perf_counter()
+        search(db, q, user_id=1, kinds=("post",), limit=20)
+        timings.append((time.perf_counter() - t0) * 1000)
+    db.close()
+
+    timings.sort()
+    print(f"queries: {args.queries}")
+    print(f"  mean  {statistics.mean(timings):8.2f} ms")
+    print(f"  p50   {timings[len(timings) // 2]:8.2f} ms")
+    print(f"  p95   {timings[int(len(timings) * 0.95)]:8.2f} ms")
+    print(f"  max   {timings[-1]:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
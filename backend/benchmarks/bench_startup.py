@@ -0,0 +1,98 @@
+"""Benchmark the seeding work a worker does at boot.
+
+Fills a SQLite database with ``--posts`` posts spread over the starter
+realms, then times one boot's seeding three ways:
+
+- legacy: the per-boot checks seeding used to do (a realm lookup, a
+  membership lookup and a ``content LIKE %marker%`` scan per starter post)
+- batched: the starter seed forced to run, one query per lookup kind
+- ledger: run_seeds with everything current (one ``seed_versions`` read)
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --posts 200000 --boots 20
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.seeding import run_seeds
+from app.core.starter_seed import STARTER_REALMS, _seed_marker
+from app.models import Post, Realm, RealmMembership, User
+
+
+def setup(url: str, posts: int):
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "email": "bench@example.com", "username": "bench", "hashed_password": "x",
+            "created_at": now, "updated_at": now,
+        }])
+    factory = sessionmaker(bind=engine)
+    run_seeds(factory)
+
+    realm_ids = [realm_id for (realm_id,) in factory().query(Realm.id).filter(Realm.is_commons == False)]
+    filler = "The lanterns gutter as the caravan rolls into town. " * 8
+    batch = 10_000
+    with engine.begin() as conn:
+        for start in range(0, posts, batch):
+            conn.execute(insert(Post), [{
+                "realm_id": realm_ids[i % len(realm_ids)], "author_user_id": 1, "content": filler,
+                "content_type": "IC", "post_kind": "general", "comment_count": 0,
+                "reaction_counts": {}, "created_at": now, "updated_at": now,
+            } for i in range(start, min(start + batch, posts))])
+    return factory
+
+
+def legacy_boot(factory) -> None:
+    db = factory()
+    try:
+        for realm_def in STARTER_REALMS:
+            realm = db.query(Realm).filter(Realm.slug == realm_def["slug"]).first()
+            db.query(RealmMembership).filter(
+                RealmMembership.realm_id == realm.id, RealmMembership.user_id == 1
+            ).first()
+            for post_def in realm_def["posts"]:
+                db.query(Post.id).filter(
+                    Post.realm_id == realm.id,
+                    Post.content.contains(_seed_marker(realm_def["slug"], post_def["key"])),
+                ).first()
+    finally:
+        db.close()
+
+
+def timed(label: str, boot, boots: int) -> None:
+    samples = []
+    for _ in range(boots):
+        t0 = time.perf_counter()
+        boot()
+        samples.append((time.perf_counter() - t0) * 1000)
+    print(f"{label:>8}: median {statistics.median(samples):8.2f} ms  max {max(samples):8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=200_000)
+    parser.add_argument("--boots", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.pop("ADMIN_EMAIL", None)
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        factory = setup(f"sqlite:///{tmp}/bench.db", args.posts)
+        print(f"loaded {args.posts:,} posts in {time.perf_counter() - t0:.1f}s")
+        timed("legacy", lambda: legacy_boot(factory), args.boots)
+        timed("batched", lambda: run_seeds(factory, force=True), args.boots)
+        timed("ledger", lambda: run_seeds(factory), args.boots)
+
+
+if __name__ == "__main__":
+    main()
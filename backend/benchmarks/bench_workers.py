@@ -0,0 +1,93 @@
+"""Benchmark requests/sec of ``python -m app.serve`` across worker counts.
+
+For each ``--workers`` value, starts the production server on a scratch
+SQLite database, waits for ``/health``, then drives ``--path`` with
+``--concurrency`` keep-alive connections for ``--seconds`` and reports
+throughput and latency. The server is stopped with SIGTERM (graceful drain)
+between runs.
+
+Usage (from backend/):
+    python -m benchmarks.bench_workers --workers 1 2 4 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine
+
+from app import models  # noqa: F401 - registers the tables
+from app.core.database import Base
+
+
+async def drive(url: str, concurrency: int, seconds: float) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits) as client:
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(url)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def wait_ready(base: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base}/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/realms/")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    base = f"http://127.0.0.1:{args.port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{tmp}/bench.db"
+        Base.metadata.create_all(create_engine(url))
+        env = {**os.environ, "DATABASE_URL": url}
+        for workers in args.workers:
+            server = subprocess.Popen(
+                [sys.executable, "-m", "app.serve", "--workers", str(workers), "--bind", f"127.0.0.1:{args.port}"],
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_ready(base)
+                latencies = asyncio.run(drive(base + args.path, args.concurrency, args.seconds))
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=60)
+            latencies.sort()
+            print(
+                f"{workers:>2} workers: {len(latencies) / args.seconds:8.0f} req/s"
+                f"  p50 {statistics.median(latencies) * 1000:6.1f} ms"
+                f"  p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
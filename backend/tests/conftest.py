@@ -8,8 +8,6 @@ os.environ.setdefault("DEBUG", "true")
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 # Fix bcrypt/passlib compatibility issue (bcrypt 4.0+ requires explicit truncation)
 # Must be done before passlib is imported
@@ -22,14 +20,23 @@ def _patched_hashpw(password, salt):
     return _original_hashpw(password, salt)
 bcrypt.hashpw = _patched_hashpw
 
+from app.core.cache import get_cache
 from app.core.database import Base, get_db
+from app.core.metrics import metrics
 from app.main import app
 from app.api.routes.auth import limiter
+from app.services.ai_cache import get_ai_cache
+from app.services.ai_quota import usage_store
+from app.services.autocomplete import character_name_index, username_index
+from app.services.entity_cache import get_entity_backend
+from app.services.notifications import notifier
 
-# Create test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from tests.helpers import TestingSessionLocal, engine
+
+# The notification worker and AI usage flusher open their own sessions; point
+# them at the test database
+notifier.session_factory = TestingSessionLocal
+usage_store.session_factory = TestingSessionLocal
 
 
 def override_get_db():
@@ -45,6 +52,13 @@ def override_get_db():
 def db_session():
     """Create a fresh database for each test."""
     Base.metadata.create_all(bind=engine)
+    get_cache().clear()
+    get_ai_cache().clear()
+    get_entity_backend().clear()
+    metrics.reset()
+    usage_store.reset()
+    username_index.reset()
+    character_name_index.reset()
     yield TestingSessionLocal()
     Base.metadata.drop_all(bind=engine)
 
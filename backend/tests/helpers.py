@@ -0,0 +1,89 @@
+"""Test database and helpers shared by the test modules.
+
+Imported by conftest after it has set the test environment, so test modules
+can import from here freely.
+"""
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.services.ai_service import FakeAIClient
+
+# Create test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@event.listens_for(engine, "connect")
+def _enforce_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores foreign keys unless asked, which would let tests use rows
+    # that reference nothing
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+
+def get_auth_token(client: TestClient, username: str = "testuser") -> str:
+    """Helper to register a user and get an auth token."""
+    client.post(
+        "/auth/register",
+        json={
+            "email": f"{username}@example.com",
+            "username": username,
+            "password": "testpassword123"
+        }
+    )
+    response = client.post(
+        "/auth/login",
+        json={
+            "email": f"{username}@example.com",
+            "password": "testpassword123"
+        }
+    )
+    return response.json()["access_token"]
+
+
+def register(client: TestClient, username: str) -> dict:
+    """Helper to register a user and return auth headers."""
+    return {"Authorization": f"Bearer {get_auth_token(client, username)}"}
+
+
+def create_posts(client: TestClient, headers: dict, count: int) -> tuple[int, list[int]]:
+    """Helper to create a realm with ``count`` posts."""
+    realm = client.post("/realms/", json={"name": "Glade", "slug": "glade"}, headers=headers).json()
+    ids = [
+        client.post(
+            f"/posts/realms/{realm['id']}/posts",
+            json={"content": f"Post {i}"},
+            headers=headers
+        ).json()["id"]
+        for i in range(count)
+    ]
+    return realm["id"], ids
+
+
+@contextmanager
+def count_queries():
+    """Count SQL statements executed against the test engine."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+class CountingClient(FakeAIClient):
+    """Fake provider that records every call."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate_character_bio(self, request):
+        self.calls += 1
+        return await super().generate_character_bio(request)
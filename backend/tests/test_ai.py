@@ -0,0 +1,359 @@
+"""Tests for AI providers and routes."""
+import asyncio
+import json
+import sys
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.cache import MemoryCacheBackend
+from app.core.metrics import metrics
+from app.main import app
+from app.schemas.ai import CharacterBioRequest, SceneRequest, SceneResponse
+from app.core.config import settings
+from app.services import ai_cache
+from app.services.ai_cache import generate, get_ai_cache, request_fingerprint
+from app.services.ai_service import (
+    AIProviderError,
+    AnthropicClient,
+    FakeAIClient,
+    MAX_RETRY_AFTER_SECONDS,
+    OpenAIClient,
+    get_ai_client,
+)
+from tests.helpers import CountingClient, register
+
+BIO = {"short_bio": "Short.", "long_bio": "Long."}
+
+
+def openai_reply(content: dict) -> httpx.Response:
+    """A minimal chat-completions response body."""
+    return httpx.Response(200, json={"choices": [{"message": {"content": json.dumps(content)}}]})
+
+
+def test_character_bio_route_uses_fake_provider(client: TestClient):
+    """The default provider answers without any network access."""
+    headers = register(client, "alice")
+    response = client.post("/ai/character-bio", json={"name": "Wren", "species": "owl"}, headers=headers)
+    assert response.status_code == 200
+    assert "Wren is a owl" in response.json()["short_bio"]
+
+
+def test_provider_failure_maps_to_bad_gateway(client: TestClient):
+    """Provider errors surface as 502 rather than 500."""
+    class BrokenClient(FakeAIClient):
+        async def generate_scene(self, request):
+            raise AIProviderError("down")
+
+    headers = register(client, "alice")
+    app.dependency_overrides[get_ai_client] = BrokenClient
+    response = client.post(
+        "/ai/scene",
+        json={"characters": ["Wren"], "setting": "a tavern", "prompt": "Who goes there?"},
+        headers=headers
+    )
+    assert response.status_code == 502
+
+
+@pytest.mark.asyncio
+async def test_http_client_retries_transient_failures():
+    """5xx and connection errors are retried; the eventual success is parsed."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content))
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        if len(calls) == 2:
+            return httpx.Response(503)
+        return openai_reply(BIO)
+
+    ai = OpenAIClient(api_key="k", backoff_seconds=0, transport=httpx.MockTransport(handler))
+    try:
+        bio = await ai.generate_character_bio(CharacterBioRequest(name="Wren"))
+    finally:
+        await ai.aclose()
+    assert bio.short_bio == "Short."
+    assert len(calls) == 3
+    assert calls[0]["model"] == "gpt-4o-mini"
+
+
+@pytest.mark.asyncio
+async def test_http_client_does_not_retry_client_errors():
+    """A 4xx other than 408/409/429 fails immediately."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(401)
+
+    ai = AnthropicClient(api_key="k", backoff_seconds=0, transport=httpx.MockTransport(handler))
+    try:
+        with pytest.raises(AIProviderError):
+            await ai.generate_scene(SceneRequest(characters=["Wren"], setting="moor", prompt="Run"))
+    finally:
+        await ai.aclose()
+    assert len(calls) == 1
+    assert calls[0].headers["x-api-key"] == "k"
+
+
+@pytest.mark.asyncio
+async def test_http_client_caps_concurrent_upstream_calls():
+    """No more than max_concurrency requests are in flight at once."""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return openai_reply(BIO)
+
+    ai = OpenAIClient(api_key="k", max_concurrency=2, transport=httpx.MockTransport(handler))
+    try:
+        await asyncio.gather(*(
+            ai.generate_character_bio(CharacterBioRequest(name=f"NPC {i}")) for i in range(8)
+        ))
+    finally:
+        await ai.aclose()
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_non_json_success_body_is_a_provider_error():
+    """A 2xx body that is not JSON surfaces as AIProviderError, not a 500."""
+    ai = OpenAIClient(api_key="k", transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, text="<html>gateway</html>")
+    ))
+    try:
+        with pytest.raises(AIProviderError):
+            await ai.generate_character_bio(CharacterBioRequest(name="Wren"))
+    finally:
+        await ai.aclose()
+
+
+def test_retry_after_is_capped():
+    """A huge Retry-After does not stall the request for hours."""
+    ai = OpenAIClient(api_key="k")
+    assert ai._backoff(0, "86400") == MAX_RETRY_AFTER_SECONDS
+    assert ai._backoff(0, "2") == 2.0
+
+
+def test_repeated_generation_is_served_from_cache(client: TestClient):
+    """Identical requests hit the provider once; fresh=true regenerates."""
+    headers = register(client, "alice")
+    provider = CountingClient()
+    app.dependency_overrides[get_ai_client] = lambda: provider
+    body = {"name": "Wren", "species": "owl", "tags": ["wise", "wry"]}
+
+    first = client.post("/ai/character-bio", json=body, headers=headers).json()
+    second = client.post("/ai/character-bio", json=body, headers=headers).json()
+    assert first == second
+    assert provider.calls == 1
+
+    client.post("/ai/character-bio", json={**body, "role": "scout"}, headers=headers)
+    client.post("/ai/character-bio", params={"fresh": True}, json=body, headers=headers)
+    assert provider.calls == 3
+
+    assert metrics.value("ai_cache_requests_total", kind="character_bio", result="hit") == 1
+    assert metrics.value("ai_cache_requests_total", kind="character_bio", result="miss") == 2
+    assert 'ai_cache_requests_total{kind="character_bio",result="bypass"} 1' in client.get("/metrics").text
+
+
+def test_fingerprint_covers_provider_and_model():
+    """The cache key changes with the model, not with field order."""
+    request = CharacterBioRequest(name="Wren", tags=["a"])
+    same = CharacterBioRequest.model_validate({"tags": ["a"], "name": "Wren"})
+    other_model = OpenAIClient(api_key="k", model="gpt-4o")
+    assert request_fingerprint("character_bio", request, FakeAIClient()) == \
+        request_fingerprint("character_bio", same, FakeAIClient())
+    assert request_fingerprint("character_bio", request, other_model) != \
+        request_fingerprint("character_bio", request, OpenAIClient(api_key="k"))
+
+
+def test_memory_cache_evicts_least_recently_used():
+    """A bounded memory cache drops the entry read longest ago."""
+    cache = MemoryCacheBackend(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    """Split an SSE body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_scene_stream_emits_tokens_then_done(client: TestClient):
+    """The fake provider streams word chunks that add up to the full scene."""
+    headers = register(client, "alice")
+    body = {"characters": ["Wren", "Ash"], "setting": "a ruined chapel", "prompt": "Listen"}
+    response = client.post("/ai/scene/stream", json=body, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_sse(response.text)
+    assert events[-1] == ("done", {})
+    tokens = [data["text"] for event, data in events if event == "token"]
+    assert len(tokens) > 10
+    full = client.post("/ai/scene", json=body, headers=headers).json()
+    assert "".join(tokens).strip() == f"{full['scene']}\n\n{full['dialogue']}"
+    assert metrics.summary("ai_time_to_first_token_seconds", provider="fake")["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_closes_upstream_request():
+    """Abandoning a provider stream mid-way closes the upstream response."""
+    closed = asyncio.Event()
+
+    class UpstreamBody(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for word in ("Rain ", "fell ", "softly"):
+                chunk = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": word}}
+                yield f"data: {json.dumps(chunk)}\n\n".encode()
+
+        async def aclose(self):
+            closed.set()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, stream=UpstreamBody())
+
+    ai = AnthropicClient(api_key="k", transport=httpx.MockTransport(handler))
+    chunks = ai.stream_scene(SceneRequest(characters=["Wren"], setting="moor", prompt="Run"))
+    try:
+        assert await chunks.__anext__() == "Rain "
+        await chunks.aclose()
+        assert closed.is_set()
+    finally:
+        await ai.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_retries_before_first_token():
+    """A retryable status before any text is retried transparently."""
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(429, headers={"retry-after": "0"})
+        lines = [
+            'data: {"choices": [{"delta": {"content": "Hello"}}]}',
+            'data: {"choices": [{"delta": {"content": " there"}}]}',
+            "data: [DONE]",
+        ]
+        return httpx.Response(200, text="\n\n".join(lines))
+
+    ai = OpenAIClient(api_key="k", transport=httpx.MockTransport(handler))
+    try:
+        text = [c async for c in ai.stream_scene(SceneRequest(characters=["Wren"], setting="moor", prompt="Hi"))]
+    finally:
+        await ai.aclose()
+    assert text == ["Hello", " there"]
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [
+    'event: error\ndata: {"type": "error", "error": {"type": "overloaded_error"}}',
+    "data: {not json",
+])
+async def test_stream_error_events_are_provider_errors(body):
+    """Error events and malformed lines raise AIProviderError."""
+    ai = AnthropicClient(api_key="k", transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, text=body + "\n\n")
+    ))
+    try:
+        with pytest.raises(AIProviderError):
+            [c async for c in ai.stream_scene(SceneRequest(characters=["Wren"], setting="moor", prompt="Hi"))]
+    finally:
+        await ai.aclose()
+
+
+@pytest.mark.asyncio
+async def test_http2_without_h2_falls_back_with_a_warning(monkeypatch, caplog):
+    """A missing h2 package is logged rather than silently downgrading."""
+    monkeypatch.setitem(sys.modules, "h2", None)
+    ai = OpenAIClient(api_key="k")
+    try:
+        ai._client()
+    finally:
+        await ai.aclose()
+    assert "h2 is not installed" in caplog.text
+
+
+class SlowSceneClient(FakeAIClient):
+    """Fake provider whose scene generation takes a while."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate_scene(self, request):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return await super().generate_scene(request)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cache_enabled", [True, False])
+async def test_concurrent_identical_requests_share_one_provider_call(monkeypatch, cache_enabled):
+    """N concurrent identical generations make exactly one upstream call."""
+    monkeypatch.setattr(settings, "AI_CACHE_ENABLED", cache_enabled)
+    get_ai_cache().clear()
+    metrics.reset()
+    provider = SlowSceneClient()
+    request = SceneRequest(characters=["Wren"], setting="the festival", prompt=f"Begin {cache_enabled}")
+
+    results = await asyncio.gather(*(generate("scene", request, provider) for _ in range(20)))
+
+    assert provider.calls == 1
+    assert all(r == results[0] for r in results)
+    assert metrics.value("ai_singleflight_shared_total", kind="scene", scope="process") == 19
+
+
+@pytest.mark.asyncio
+async def test_distributed_lock_waits_for_other_workers_result(monkeypatch):
+    """While another worker holds the lock, its cached result is reused."""
+    monkeypatch.setattr(settings, "AI_SINGLEFLIGHT_DISTRIBUTED", True)
+    monkeypatch.setattr(ai_cache, "LOCK_POLL_SECONDS", 0.01)
+    get_ai_cache().clear()
+    provider = SlowSceneClient()
+    request = SceneRequest(characters=["Wren"], setting="the festival", prompt="Elsewhere")
+    key = f"ai:scene:{request_fingerprint('scene', request, provider)}"
+    cache = get_ai_cache()
+    token = await cache.acquire_lock(key, 60)  # "another worker" starts generating
+
+    waiter = asyncio.ensure_future(generate("scene", request, provider))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+    await cache.set(key, SceneResponse(scene="From worker two", dialogue="..."))
+    await cache.release_lock(key, token)
+
+    assert (await waiter).scene == "From worker two"
+    assert provider.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_release_lock_leaves_a_lock_retaken_by_another_worker():
+    """A stale owner releasing after expiry does not drop the new owner's lock."""
+    cache = get_ai_cache()
+    cache.clear()
+    stale = await cache.acquire_lock("ai:scene:retaken", 60)
+    cache.backend.delete("lock:ai:scene:retaken")  # expired
+    fresh = await cache.acquire_lock("ai:scene:retaken", 60)
+
+    await cache.release_lock("ai:scene:retaken", stale)
+    assert await cache.is_locked("ai:scene:retaken")
+    await cache.release_lock("ai:scene:retaken", fresh)
+    assert not await cache.is_locked("ai:scene:retaken")
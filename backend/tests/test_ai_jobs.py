@@ -0,0 +1,132 @@
+"""Tests for background AI jobs."""
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services.ai_jobs import ai_jobs
+from app.services.ai_service import AIProviderError, FakeAIClient, get_ai_client
+from tests.helpers import register
+
+
+def wait_for_job(client: TestClient, job_id: str, headers: dict, timeout: float = 5.0) -> dict:
+    """Helper to poll a job until it finishes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/ai/jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class SlowBioClient(FakeAIClient):
+    """Fake provider that takes a while per bio."""
+
+    async def generate_character_bio(self, request):
+        await asyncio.sleep(0.2)
+        return await super().generate_character_bio(request)
+
+
+class FlakyBioClient(FakeAIClient):
+    """Fake provider that goes down after the first bio."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate_character_bio(self, request):
+        self.calls += 1
+        if self.calls > 1:
+            raise AIProviderError("down")
+        return await super().generate_character_bio(request)
+
+
+def test_batch_job_generates_several_bios(client: TestClient):
+    """One job produces a bio per request and reports progress."""
+    headers = register(client, "alice")
+    names = ["Wren", "Ash", "Moss"]
+    response = client.post(
+        "/ai/jobs",
+        json={"kind": "character_bio", "requests": [{"name": n} for n in names]},
+        headers=headers
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued" and job["total"] == 3
+
+    done = wait_for_job(client, job["id"], headers)
+    assert done["status"] == "succeeded"
+    assert done["completed"] == 3
+    assert [r["short_bio"].split(" ")[0] for r in done["results"]] == names
+
+
+def test_jobs_are_private_to_their_owner(client: TestClient):
+    """Other users cannot see someone else's job."""
+    alice = register(client, "alice")
+    bob = register(client, "bob")
+    job = client.post(
+        "/ai/jobs",
+        json={"kind": "scene", "requests": [{"characters": ["Wren"], "setting": "moor", "prompt": "Go"}]},
+        headers=alice
+    ).json()
+    assert client.get(f"/ai/jobs/{job['id']}", headers=bob).status_code == 404
+    assert wait_for_job(client, job["id"], alice)["status"] == "succeeded"
+
+
+def test_per_user_active_job_cap(client: TestClient, monkeypatch):
+    """A user over the cap is refused until a job finishes."""
+    monkeypatch.setattr(settings, "AI_JOB_MAX_ACTIVE_PER_USER", 1)
+    app.dependency_overrides[get_ai_client] = SlowBioClient
+    alice = register(client, "alice")
+    bob = register(client, "bob")
+    body = {"kind": "character_bio", "requests": [{"name": "Wren"}]}
+
+    first = client.post("/ai/jobs", json=body, headers=alice).json()
+    assert client.post("/ai/jobs", json=body, headers=alice).status_code == 429
+    assert client.post("/ai/jobs", json=body, headers=bob).status_code == 202
+
+    wait_for_job(client, first["id"], alice)
+    assert client.post("/ai/jobs", json=body, headers=alice).status_code == 202
+
+
+def test_active_count_of_a_crashed_worker_expires(client: TestClient, monkeypatch):
+    """Jobs that never finish stop counting against the cap after the TTL."""
+    monkeypatch.setattr(settings, "AI_JOB_MAX_ACTIVE_PER_USER", 1)
+    monkeypatch.setattr(settings, "AI_JOB_ACTIVE_TTL_SECONDS", 1)
+
+    async def die(job, error=None):  # the worker is killed before _finish runs
+        return None
+
+    monkeypatch.setattr(ai_jobs, "_finish", die)
+    alice = register(client, "alice")
+    body = {"kind": "character_bio", "requests": [{"name": "Wren"}]}
+
+    assert client.post("/ai/jobs", json=body, headers=alice).status_code == 202
+    assert client.post("/ai/jobs", json=body, headers=alice).status_code == 429
+    time.sleep(1.1)
+    assert client.post("/ai/jobs", json=body, headers=alice).status_code == 202
+
+
+def test_batch_size_is_bounded(client: TestClient):
+    """Batches above the limit are rejected by validation."""
+    headers = register(client, "alice")
+    body = {"kind": "character_bio", "requests": [{"name": f"NPC {i}"} for i in range(21)]}
+    assert client.post("/ai/jobs", json=body, headers=headers).status_code == 422
+
+
+def test_failed_batch_refunds_items_that_never_ran(client: TestClient):
+    """Only the items that produced a result stay charged."""
+    provider = FlakyBioClient()
+    app.dependency_overrides[get_ai_client] = lambda: provider
+    headers = register(client, "alice")
+    job = client.post(
+        "/ai/jobs",
+        json={"kind": "character_bio", "requests": [{"name": n} for n in ("Wren", "Ash", "Moss")]},
+        headers=headers
+    ).json()
+
+    done = wait_for_job(client, job["id"], headers)
+    assert done["status"] == "failed" and done["completed"] == 1
+    assert client.get("/ai/usage", headers=headers).json()["requests"] == 1
@@ -0,0 +1,89 @@
+"""Tests for per-user daily AI quotas."""
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.models.ai_usage import AIUsage
+from app.services.ai_quota import MemoryUsageStore, today, usage_store
+from app.services.ai_service import AIProviderError, FakeAIClient, get_ai_client
+from tests.helpers import CountingClient, TestingSessionLocal, register
+
+SCENE = {"characters": ["Wren"], "setting": "moor", "prompt": "Go"}
+
+
+def test_over_quota_requests_never_reach_the_provider(client: TestClient, monkeypatch):
+    """Once the request limit is used up every AI route answers 429."""
+    monkeypatch.setattr(settings, "AI_DAILY_REQUEST_LIMIT", 3)
+    provider = CountingClient()
+    app.dependency_overrides[get_ai_client] = lambda: provider
+    alice = register(client, "alice")
+    bob = register(client, "bob")
+
+    for name in ("Wren", "Ash"):
+        assert client.post("/ai/character-bio", json={"name": name}, headers=alice).status_code == 200
+    # A two-item job does not fit in the one request left
+    job = {"kind": "character_bio", "requests": [{"name": "Moss"}, {"name": "Fern"}]}
+    assert client.post("/ai/jobs", json=job, headers=alice).status_code == 429
+    assert client.post("/ai/character-bio", json={"name": "Moss"}, headers=alice).status_code == 200
+
+    refused = client.post("/ai/character-bio", json={"name": "Fern"}, headers=alice)
+    assert refused.status_code == 429
+    assert int(refused.headers["Retry-After"]) > 0
+    assert client.post("/ai/scene/stream", json=SCENE, headers=alice).status_code == 429
+    assert provider.calls == 3
+
+    usage = client.get("/ai/usage", headers=alice).json()
+    assert usage["requests"] == 3 and usage["request_limit"] == 3
+    assert usage["tokens"] > 0
+    assert client.post("/ai/character-bio", json={"name": "Fern"}, headers=bob).status_code == 200
+
+
+def test_token_limit_refuses_once_spent(client: TestClient, monkeypatch):
+    """A call that takes the user past the token limit is the last one allowed."""
+    monkeypatch.setattr(settings, "AI_DAILY_TOKEN_LIMIT", 10)
+    headers = register(client, "alice")
+
+    assert client.post("/ai/scene", json=SCENE, headers=headers).status_code == 200
+    assert client.get("/ai/usage", headers=headers).json()["tokens"] >= 10
+    assert client.post("/ai/scene", json=SCENE, headers=headers).status_code == 429
+
+
+class FailingClient(FakeAIClient):
+    """Fake provider that is always down."""
+
+    async def generate_character_bio(self, request):
+        raise AIProviderError("down")
+
+    async def stream_scene(self, request):
+        raise AIProviderError("down")
+        yield ""
+
+
+def test_provider_failures_are_refunded(client: TestClient):
+    """A 502 or a stream that fails before any text costs no requests."""
+    app.dependency_overrides[get_ai_client] = lambda: FailingClient()
+    headers = register(client, "alice")
+
+    assert client.post("/ai/character-bio", json={"name": "Wren"}, headers=headers).status_code == 502
+    assert "AI provider unavailable" in client.post("/ai/scene/stream", json=SCENE, headers=headers).text
+    assert client.get("/ai/usage", headers=headers).json()["requests"] == 0
+
+
+def test_usage_is_flushed_and_survives_a_restart(client: TestClient, db_session, monkeypatch):
+    """Counters reach the ai_usage table on flush and seed a new process."""
+    headers = register(client, "alice")
+    for name in ("Wren", "Ash"):
+        client.post("/ai/character-bio", json={"name": name}, headers=headers)
+    user_id = client.get("/auth/me", headers=headers).json()["id"]
+
+    usage_store.flush()
+    row = db_session.get(AIUsage, (user_id, today()))
+    assert row.requests == 2 and row.tokens > 0
+    # Nothing pending: a second flush writes nothing
+    assert usage_store.flush() == 0
+
+    restarted = MemoryUsageStore(60, session_factory=TestingSessionLocal)
+    assert restarted.usage(user_id, today()) == (2, row.tokens)
+    monkeypatch.setattr(settings, "AI_DAILY_REQUEST_LIMIT", 3)
+    assert restarted.consume(user_id, today(), 1)
+    assert not restarted.consume(user_id, today(), 1)
@@ -0,0 +1,88 @@
+"""Tests for username and character-name autocomplete."""
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.models.character import Character, VisibilityEnum
+from app.core.cache import namespace_version
+from app.services.autocomplete import PrefixIndex, character_name_index
+from tests.helpers import register
+
+
+def test_prefix_index_search_rename_and_discard():
+    """Prefix matches are case-insensitive, bounded, and follow updates."""
+    index = PrefixIndex()
+    index.bulk_load([(1, "Raven"), (2, "rowan"), (3, "Ravenna"), (4, "Ash")])
+
+    assert index.search("rav", 10) == [(1, "Raven"), (3, "Ravenna")]
+    assert index.search("r", 2) == [(1, "Raven"), (3, "Ravenna")]
+
+    index.add(1, "Corvin")
+    index.discard(3)
+    assert index.search("rav", 10) == []
+    assert index.search("co", 10) == [(1, "Corvin")]
+
+
+def test_autocomplete_endpoints_pick_up_writes(client: TestClient):
+    """New users and public characters appear without a reload."""
+    headers = register(client, "marlowe")
+    assert [s["name"] for s in client.get("/users/autocomplete", params={"q": "MAR"}).json()] == ["marlowe"]
+
+    register(client, "marigold")
+    names = [s["name"] for s in client.get("/users/autocomplete", params={"q": "mar"}).json()]
+    assert names == ["marigold", "marlowe"]
+
+    assert client.get("/characters/autocomplete", params={"q": "sel"}).json() == []
+    client.post("/characters/", json={"name": "Selene"}, headers=headers)
+    client.post("/characters/", json={"name": "Selkie", "visibility": "private"}, headers=headers)
+    names = [s["name"] for s in client.get("/characters/autocomplete", params={"q": "sel"}).json()]
+    assert names == ["Selene"]
+
+
+def test_other_workers_hiding_a_character_reaches_the_index(client: TestClient, db_session, monkeypatch):
+    """A character made private or deleted elsewhere drops out at the next refresh."""
+    monkeypatch.setattr(settings, "AUTOCOMPLETE_REFRESH_SECONDS", 0)
+    headers = register(client, "marlowe")
+    selene = client.post("/characters/", json={"name": "Selene"}, headers=headers).json()
+    client.post("/characters/", json={"name": "Selkie"}, headers=headers)
+    assert len(client.get("/characters/autocomplete", params={"q": "sel"}).json()) == 2
+
+    # Another worker's write: the row changes and the shared version moves,
+    # but this process's index is never told directly
+    db_session.query(Character).filter(Character.id == selene["id"]).update(
+        {"visibility": VisibilityEnum.PRIVATE}
+    )
+    db_session.commit()
+    character_name_index.invalidate()
+
+    names = [s["name"] for s in client.get("/characters/autocomplete", params={"q": "sel"}).json()]
+    assert names == ["Selkie"]
+
+
+def test_only_renames_and_visibility_changes_invalidate(client: TestClient):
+    """Creating or editing other fields leaves other workers' indexes alone."""
+    headers = register(client, "marlowe")
+    before = namespace_version(character_name_index.namespace)
+    selene = client.post("/characters/", json={"name": "Selene"}, headers=headers).json()
+    client.patch(f"/characters/{selene['id']}", json={"short_bio": "Moonlit"}, headers=headers)
+    assert namespace_version(character_name_index.namespace) == before
+
+    client.patch(f"/characters/{selene['id']}", json={"name": "Selena"}, headers=headers)
+    client.patch(f"/characters/{selene['id']}", json={"visibility": "private"}, headers=headers)
+    assert namespace_version(character_name_index.namespace) == before + 2
+
+
+def test_memory_cache_workers_reload_periodically(client: TestClient, db_session, monkeypatch):
+    """Without a shared cache, hidden rows drop out at the next full reload."""
+    monkeypatch.setattr(settings, "AUTOCOMPLETE_REFRESH_SECONDS", 0)
+    monkeypatch.setattr(settings, "AUTOCOMPLETE_FULL_RELOAD_SECONDS", 0)
+    headers = register(client, "marlowe")
+    selene = client.post("/characters/", json={"name": "Selene"}, headers=headers).json()
+    assert len(client.get("/characters/autocomplete", params={"q": "sel"}).json()) == 1
+
+    # Another worker's write, whose version bump this process cannot see
+    db_session.query(Character).filter(Character.id == selene["id"]).update(
+        {"visibility": VisibilityEnum.PRIVATE}
+    )
+    db_session.commit()
+
+    assert client.get("/characters/autocomplete", params={"q": "sel"}).json() == []
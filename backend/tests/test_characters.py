@@ -1,25 +1,7 @@
 """Tests for character endpoints."""
 from fastapi.testclient import TestClient
 
-
-def get_auth_token(client: TestClient) -> str:
-    """Helper to get auth token."""
-    client.post(
-        "/auth/register",
-        json={
-            "email": "test@example.com",
-            "username": "testuser",
-            "password": "testpassword123"
-        }
-    )
-    response = client.post(
-        "/auth/login",
-        json={
-            "email": "test@example.com",
-            "password": "testpassword123"
-        }
-    )
-    return response.json()["access_token"]
+from tests.helpers import get_auth_token
 
 
 def test_create_character(client: TestClient):
@@ -66,3 +48,57 @@ def test_list_characters(client: TestClient):
     data = response.json()
     assert len(data) == 1
     assert data[0]["name"] == "Luna Nightshade"
+
+
+def test_search_characters_by_tags(client: TestClient):
+    """Tag search supports AND/OR matching and a species filter."""
+    token = get_auth_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    for name, species, tags in [
+        ("Luna", "vampire", "Gothic, mysterious"),
+        ("Ash", "human", "gothic, brooding"),
+        ("Kit", "fox", "playful"),
+    ]:
+        client.post(
+            "/characters/",
+            json={"name": name, "species": species, "tags": tags},
+            headers=headers
+        )
+
+    def names(**params):
+        response = client.get("/characters/search", params=params)
+        assert response.status_code == 200
+        return sorted(c["name"] for c in response.json())
+
+    assert names(tags="gothic") == ["Ash", "Luna"]
+    assert names(tags="gothic,mysterious") == ["Luna"]
+    assert names(tags="mysterious,playful", match="any") == ["Kit", "Luna"]
+    assert names(tags="gothic", species="Human") == ["Ash"]
+
+
+def test_tag_counts_follow_updates(client: TestClient):
+    """Tag counts track public characters across updates and deletes."""
+    token = get_auth_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    luna = client.post(
+        "/characters/",
+        json={"name": "Luna", "tags": "gothic, mysterious"},
+        headers=headers
+    ).json()
+    ash = client.post(
+        "/characters/",
+        json={"name": "Ash", "tags": "gothic"},
+        headers=headers
+    ).json()
+
+    def counts():
+        return {t["tag"]: t["count"] for t in client.get("/characters/tags").json()}
+
+    assert counts() == {"gothic": 2, "mysterious": 1}
+
+    client.patch(f"/characters/{luna['id']}", json={"tags": "gothic, cursed"}, headers=headers)
+    client.patch(f"/characters/{ash['id']}", json={"visibility": "private"}, headers=headers)
+    assert counts() == {"gothic": 1, "cursed": 1}
+
+    client.delete(f"/characters/{luna['id']}", headers=headers)
+    assert counts() == {}
@@ -0,0 +1,74 @@
+"""Tests for comment pagination, threading and batch previews."""
+from fastapi.testclient import TestClient
+
+from tests.helpers import count_queries, create_posts, register
+
+
+def add_comments(client: TestClient, headers: dict, post_id: int, count: int, **extra) -> list[int]:
+    """Helper to add ``count`` comments to a post."""
+    return [
+        client.post(
+            f"/comments/posts/{post_id}/comments",
+            json={"content": f"Comment {i}", **extra},
+            headers=headers
+        ).json()["id"]
+        for i in range(count)
+    ]
+
+
+def test_list_comments_paginates_with_cursor(client: TestClient):
+    """Pages follow X-Next-Cursor until it is absent and carry author names."""
+    headers = register(client, "alice")
+    _, (post_id,) = create_posts(client, headers, 1)
+    comment_ids = add_comments(client, headers, post_id, 5)
+
+    first = client.get(f"/comments/posts/{post_id}/comments", params={"limit": 2})
+    assert [c["id"] for c in first.json()] == comment_ids[:2]
+    assert first.json()[0]["author_username"] == "alice"
+    cursor = first.headers["x-next-cursor"]
+
+    second = client.get(f"/comments/posts/{post_id}/comments", params={"limit": 3, "after_id": cursor})
+    assert [c["id"] for c in second.json()] == comment_ids[2:]
+    assert "x-next-cursor" not in second.headers
+
+
+def test_threaded_replies(client: TestClient):
+    """Replies can be listed per parent; parents must belong to the same post."""
+    headers = register(client, "alice")
+    _, (post_id, other_post_id) = create_posts(client, headers, 2)
+    (root_id,) = add_comments(client, headers, post_id, 1)
+    reply_ids = add_comments(client, headers, post_id, 2, parent_comment_id=root_id)
+
+    replies = client.get(f"/comments/posts/{post_id}/comments", params={"parent_comment_id": root_id}).json()
+    assert [c["id"] for c in replies] == reply_ids
+    top = client.get(f"/comments/posts/{post_id}/comments", params={"top_level": True}).json()
+    assert [c["id"] for c in top] == [root_id]
+
+    response = client.post(
+        f"/comments/posts/{other_post_id}/comments",
+        json={"content": "Wrong thread", "parent_comment_id": root_id},
+        headers=headers
+    )
+    assert response.status_code == 400
+
+
+def test_batch_preview_returns_latest_per_post_in_one_query(client: TestClient):
+    """The preview endpoint returns the newest N comments per post with a single SELECT."""
+    headers = register(client, "alice")
+    _, post_ids = create_posts(client, headers, 3)
+    first = add_comments(client, headers, post_ids[0], 5)
+    second = add_comments(client, headers, post_ids[1], 1)
+
+    with count_queries() as statements:
+        response = client.get(
+            "/comments/", params={"post_ids": ",".join(map(str, post_ids)), "per_post": 3}
+        )
+    assert response.status_code == 200
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+    previews = response.json()
+    assert [p["post_id"] for p in previews] == post_ids
+    assert [c["id"] for c in previews[0]["comments"]] == first[-3:]
+    assert [c["id"] for c in previews[1]["comments"]] == second
+    assert previews[2]["comments"] == []
+    assert previews[0]["comments"][0]["author_username"] == "alice"
@@ -0,0 +1,67 @@
+"""Tests for response compression."""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.metrics import metrics
+from app.core.middleware import negotiate_encoding
+from tests.helpers import create_posts, register
+
+
+def test_large_feed_is_gzipped_and_metered(client: TestClient):
+    """A long JSON page is compressed and wire bytes are counted per route."""
+    headers = register(client, "alice")
+    realm_id, _ = create_posts(client, headers, 30)
+    path = f"/posts/realms/{realm_id}/posts"
+
+    response = client.get(path, headers={**headers, "Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()) == 30
+
+    route = "/posts/realms/{realm_id}/posts"
+    wire = metrics.value("http_response_bytes_total", route=route, encoding="gzip")
+    body = metrics.value("http_response_body_bytes_total", route=route)
+    assert 0 < wire < body
+    assert int(response.headers["content-length"]) == wire
+
+
+def test_brotli_is_preferred_when_accepted(client: TestClient):
+    """Clients accepting br get a brotli body that decodes to the same JSON."""
+    brotli = pytest.importorskip("brotli")
+    headers = register(client, "alice")
+    realm_id, _ = create_posts(client, headers, 30)
+    path = f"/posts/realms/{realm_id}/posts"
+
+    with client.stream("GET", path, headers={**headers, "Accept-Encoding": "br, gzip"}) as response:
+        assert response.headers["content-encoding"] == "br"
+        raw = b"".join(response.iter_raw())
+    assert len(raw) == int(response.headers["content-length"])
+    assert len(json.loads(brotli.decompress(raw))) == 30
+
+
+def test_small_or_unaccepted_responses_are_not_compressed(client: TestClient):
+    """Bodies under the threshold and identity-only clients get plain bytes."""
+    assert "content-encoding" not in client.get("/health", headers={"Accept-Encoding": "gzip"}).headers
+
+    headers = register(client, "alice")
+    realm_id, _ = create_posts(client, headers, 30)
+    labels = {"route": "/posts/realms/{realm_id}/posts", "encoding": "identity"}
+    before = metrics.value("http_response_bytes_total", **labels)
+    response = client.get(
+        f"/api/posts/realms/{realm_id}/posts", headers={**headers, "Accept-Encoding": "identity"}
+    )
+    assert "content-encoding" not in response.headers
+    assert len(response.json()) == 30
+    assert metrics.value("http_response_bytes_total", **labels) - before == len(response.content)
+
+
+def test_negotiate_encoding_honours_q_values():
+    """The highest q wins, ties prefer the server's order, q=0 refuses."""
+    both = ("br", "gzip")
+    assert negotiate_encoding("gzip, deflate, br", both) == "br"
+    assert negotiate_encoding("br;q=0.5, gzip", both) == "gzip"
+    assert negotiate_encoding("*;q=0.1", ("gzip",)) == "gzip"
+    assert negotiate_encoding("gzip;q=0", ("gzip",)) is None
+    assert negotiate_encoding("", both) is None
@@ -0,0 +1,69 @@
+"""Tests for ETag/Last-Modified validators and 304 responses."""
+from fastapi.testclient import TestClient
+
+from tests.helpers import count_queries, register
+
+
+def test_character_revalidates_until_changed(client: TestClient):
+    """A matching If-None-Match or If-Modified-Since gets an empty 304."""
+    headers = register(client, "alice")
+    character = client.post("/characters/", json={"name": "Wren"}, headers=headers).json()
+    path = f"/characters/{character['id']}"
+
+    first = client.get(path)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"].startswith("public")
+
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert client.get(path, headers={"If-Modified-Since": first.headers["last-modified"]}).status_code == 304
+
+    client.patch(path, json={"name": "Ash"}, headers=headers)
+    changed = client.get(path, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()["name"] == "Ash"
+    assert changed.headers["etag"] != etag
+
+
+def test_post_in_private_realm_is_not_publicly_cacheable(client: TestClient):
+    """Cache-Control on a post follows its realm's visibility."""
+    headers = register(client, "alice")
+    for slug, is_public in (("glade", True), ("hollow", False)):
+        realm = client.post(
+            "/realms/", json={"name": slug.title(), "slug": slug, "is_public": is_public}, headers=headers
+        ).json()
+        post = client.post(f"/posts/realms/{realm['id']}/posts", json={"content": "Hoot"}, headers=headers).json()
+        cache_control = client.get(f"/posts/{post['id']}").headers["cache-control"]
+        assert cache_control.startswith("public" if is_public else "private")
+
+
+def test_scene_transcript_304_skips_loading_turns(client: TestClient):
+    """The transcript ETag comes from a summary query; new turns change it."""
+    headers = register(client, "alice")
+    realm = client.post("/realms/", json={"name": "Glade", "slug": "glade"}, headers=headers).json()
+    scene = client.post("/scenes/", json={"realm_id": realm["id"], "title": "Night"}, headers=headers).json()
+    path = f"/scenes/{scene['id']}/posts"
+    client.post(path, json={"content": "Dusk falls"}, headers=headers)
+
+    first = client.get(path, headers=headers)
+    assert first.headers["cache-control"] == "private, no-cache"
+    with count_queries() as statements:
+        cached = client.get(path, headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+    assert not any("scene_posts.content" in s for s in statements)
+
+    client.post(path, json={"content": "An owl calls"}, headers=headers)
+    changed = client.get(path, headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200 and len(changed.json()) == 2
+
+
+def test_public_realm_list_etag_tracks_new_realms(client: TestClient):
+    """The browse listing revalidates against count and newest id."""
+    headers = register(client, "alice")
+    client.post("/realms/", json={"name": "Glade", "slug": "glade"}, headers=headers)
+    etag = client.get("/realms/").headers["etag"]
+    assert client.get("/realms/", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+
+    client.post("/realms/", json={"name": "Fen", "slug": "fen"}, headers=headers)
+    assert client.get("/realms/", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,89 @@
+"""Tests for the entity cache-aside layer."""
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend, TieredCacheBackend
+from app.core.metrics import metrics
+from app.services import entity_cache
+from app.services.entity_cache import EntityCache
+from tests.helpers import count_queries, create_posts, register
+
+
+@pytest.fixture(params=["memory", "redis"])
+def entity_backend(request, monkeypatch):
+    """The in-process tier alone, or an LRU in front of (fake) Redis."""
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        shared = RedisCacheBackend(client=fakeredis.FakeRedis(decode_responses=True))
+        backend = TieredCacheBackend(shared, local_ttl=5, max_entries=100)
+    else:
+        backend = MemoryCacheBackend(max_entries=100)
+    monkeypatch.setattr(entity_cache, "_backend", backend)
+    return backend
+
+
+def test_reads_are_cached_until_writes_invalidate(client: TestClient, entity_backend):
+    """Repeated gets skip the database; every write path evicts what it changed."""
+    headers = register(client, "alice")
+    character = client.post("/characters/", json={"name": "Wren"}, headers=headers).json()
+    path = f"/characters/{character['id']}"
+
+    client.get(path)
+    with count_queries() as statements:
+        assert client.get(path).json()["name"] == "Wren"
+    assert statements == []
+    assert metrics.value("entity_cache_requests_total", entity="character", result="hit") == 1
+
+    client.patch(path, json={"name": "Ash"}, headers=headers)
+    assert client.get(path).json()["name"] == "Ash"
+
+    _, (post_id,) = create_posts(client, headers, 1)
+    assert client.get(f"/posts/{post_id}").json()["comment_count"] == 0
+    client.post(f"/comments/posts/{post_id}/comments", json={"content": "Hoot"}, headers=headers)
+    client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "heart"}, headers=headers)
+    post = client.get(f"/posts/{post_id}").json()
+    assert post["comment_count"] == 1 and post["reaction_counts"] == {"heart": 1}
+
+    realm_id = client.get("/realms/by-slug/glade").json()["id"]
+    scene = client.post("/scenes/", json={"realm_id": realm_id, "title": "Night"}, headers=headers).json()
+    assert client.get(f"/scenes/{scene['id']}", headers=headers).json()["post_count"] == 0
+    client.post(f"/scenes/{scene['id']}/posts", json={"content": "Dusk falls"}, headers=headers)
+    assert client.get(f"/scenes/{scene['id']}", headers=headers).json()["post_count"] == 1
+
+    client.delete(f"/posts/{post_id}", headers=headers)
+    assert client.get(f"/posts/{post_id}").status_code == 404
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+def test_stale_fill_cannot_overwrite_invalidation(entity_backend):
+    """A read that raced a write does not cache the old row."""
+    cache = EntityCache("item", Item)
+    rows = {1: Item(id=1, name="old")}
+
+    def racing_load():
+        loaded = rows[1]
+        rows[1] = Item(id=1, name="new")  # a writer commits meanwhile...
+        cache.invalidate(1)  # ...and invalidates
+        return loaded
+
+    assert cache.get(1, racing_load).name == "old"
+    assert cache.get(1, lambda: rows[1]).name == "new"
+
+    # Once the tombstone expires the entry fills again
+    entity_backend.delete(cache.key(1))
+    cache.get(1, lambda: rows[1])
+    assert cache.get(1, lambda: pytest.fail("should be cached")).name == "new"
+
+
+def test_keys_change_with_the_schema():
+    """Entries written for one schema shape are never read as another."""
+    class ItemV2(Item):
+        tags: list[str] = []
+
+    assert EntityCache("item", Item).key(1) != EntityCache("item", ItemV2).key(1)
+    assert EntityCache("item", Item).key(1) == EntityCache("item", Item).key(1)
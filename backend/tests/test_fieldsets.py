@@ -0,0 +1,42 @@
+"""Tests for sparse fieldsets on list endpoints."""
+from fastapi.testclient import TestClient
+
+from tests.helpers import count_queries, register
+
+LONG_BIO = "Once upon a time " * 200
+
+
+def test_fields_skip_unrequested_columns(client: TestClient):
+    """Only the named fields come back and long_bio is never selected."""
+    headers = register(client, "alice")
+    client.post("/characters/", json={"name": "Wren", "species": "owl", "long_bio": LONG_BIO}, headers=headers)
+
+    with count_queries() as statements:
+        response = client.get("/characters/", params={"fields": "name,species"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == [{"id": response.json()[0]["id"], "name": "Wren", "species": "owl"}]
+    character_select = next(s for s in statements if "FROM characters" in s)
+    assert "long_bio" not in character_select
+
+    excluded = client.get("/characters/search", params={"exclude": "long_bio,short_bio"}).json()
+    assert "long_bio" not in excluded[0] and excluded[0]["name"] == "Wren"
+
+    assert client.get("/characters/", params={"fields": "nope"}, headers=headers).status_code == 400
+
+
+def test_preview_chars_truncates_in_sql(client: TestClient):
+    """preview_chars cuts post content in the query; other fields are intact."""
+    headers = register(client, "alice")
+    realm = client.post("/realms/", json={"name": "Glade", "slug": "glade"}, headers=headers).json()
+    path = f"/posts/realms/{realm['id']}/posts"
+    client.post(path, json={"title": "Epic", "content": "x" * 5000}, headers=headers)
+
+    with count_queries() as statements:
+        posts = client.get(path, params={"preview_chars": 40, "include_reactions": True}, headers=headers).json()
+    assert posts[0]["content"] == "x" * 40
+    assert posts[0]["title"] == "Epic" and posts[0]["author_username"] == "alice"
+    assert posts[0]["reaction_summary"]["post_id"] == posts[0]["id"]
+    assert any("substr(posts.content" in s for s in statements)
+
+    feed = client.get("/posts/feed", params={"fields": "title", "preview_chars": 10}, headers=headers).json()
+    assert feed == [{"id": posts[0]["id"], "title": "Epic"}]
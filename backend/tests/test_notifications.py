@@ -0,0 +1,254 @@
+"""Tests for the notification fan-out pipeline."""
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.notification import Notification as NotificationModel
+from app.services import notifications
+from app.services.notifications import NEW_COMMENT, NEW_REACTION, MemoryEventQueue, RedisStreamQueue, notifier
+from tests.helpers import TestingSessionLocal, count_queries, create_posts, register
+
+
+def notifications_for(username: str) -> list[tuple[str, dict]]:
+    """Helper to read a user's notifications straight from the database."""
+    db = TestingSessionLocal()
+    try:
+        rows = db.query(NotificationModel).join(NotificationModel.user).filter_by(
+            username=username
+        ).order_by(NotificationModel.id).all()
+        return [(n.type, json.loads(n.payload)) for n in rows]
+    finally:
+        db.close()
+
+
+def test_comments_and_reactions_notify_post_author(client: TestClient):
+    """The post author hears about others' comments and reactions, not their own."""
+    alice = register(client, "alice")
+    bob = register(client, "bob")
+    _, (post_id,) = create_posts(client, alice, 1)
+
+    client.post(f"/comments/posts/{post_id}/comments", json={"content": "Mine"}, headers=alice)
+    comment = client.post(f"/comments/posts/{post_id}/comments", json={"content": "Lovely"}, headers=bob).json()
+    client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "heart"}, headers=bob)
+    client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "heart"}, headers=bob)  # no-op
+    notifier.drain()
+
+    notes = notifications_for("alice")
+    assert [kind for kind, _ in notes] == [NEW_COMMENT, NEW_REACTION]
+    assert notes[0][1]["comment_id"] == comment["id"]
+    assert notes[1][1]["reaction_type"] == "heart"
+    assert notifications_for("bob") == []
+
+
+def test_scene_turn_notifies_every_other_participant(client: TestClient):
+    """A new turn fans out to everyone who has posted in the scene."""
+    alice = register(client, "alice")
+    bob = register(client, "bob")
+    carol = register(client, "carol")
+    realm_id, _ = create_posts(client, alice, 0)
+    for headers in (bob, carol):
+        client.post(f"/realms/{realm_id}/join", headers=headers)
+    scene = client.post("/scenes/", json={"realm_id": realm_id, "title": "Ambush"}, headers=alice).json()
+
+    for headers in (alice, bob, carol):
+        client.post(f"/scenes/{scene['id']}/posts", json={"content": "A turn"}, headers=headers)
+    notifier.drain()
+
+    def counts(headers: dict) -> list[int]:
+        return [n["count"] for n in client.get("/notifications/", headers=headers).json()]
+
+    assert counts(alice) == [2]  # bob's and carol's turns, coalesced
+    assert counts(bob) == [1]  # carol's turn
+    assert counts(carol) == []
+
+
+def test_batch_resolves_recipients_in_bulk(client: TestClient):
+    """A batch of events costs one recipient query and one insert, whatever its size."""
+    alice = register(client, "alice")
+    bob = register(client, "bob")
+    _, post_ids = create_posts(client, alice, 20)
+    bob_id = client.get("/auth/me", headers=bob).json()["id"]
+    events = [
+        {"type": NEW_REACTION, "actor_id": bob_id, "post_id": post_id, "reaction_type": "like"}
+        for post_id in post_ids
+    ]
+
+    with count_queries() as statements:
+        assert notifier.process(events) == 20
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+    assert len([s for s in statements if s.lstrip().upper().startswith("INSERT")]) == 1
+
+
+def test_similar_events_coalesce_into_one_unread_row(client: TestClient):
+    """Reactions on one post become a single unread row with a count."""
+    alice = register(client, "alice")
+    _, (post_id,) = create_posts(client, alice, 1)
+    for name in ("bob", "carol", "dave"):
+        headers = register(client, name)
+        client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "heart"}, headers=headers)
+        notifier.drain()
+
+    inbox = client.get("/notifications/", headers=alice).json()
+    assert [(n["type"], n["count"]) for n in inbox] == [(NEW_REACTION, 3)]
+
+    # Once read, the next reaction starts a fresh row
+    client.post("/notifications/read", json={"up_to_id": inbox[0]["id"]}, headers=alice)
+    client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "star"}, headers=register(client, "erin"))
+    notifier.drain()
+    inbox = client.get("/notifications/", headers=alice).json()
+    assert [(n["count"], n["is_read"]) for n in inbox] == [(1, False), (3, True)]
+
+
+def test_inbox_cursor_paging_and_cached_unread_count(client: TestClient):
+    """The badge count is cached and adjusted in place by inserts and reads."""
+    alice = register(client, "alice")
+    bob = register(client, "bob")
+    _, post_ids = create_posts(client, alice, 3)
+    assert client.get("/notifications/unread-count", headers=alice).json() == {"unread_count": 0}
+
+    for post_id in post_ids:
+        client.post(f"/comments/posts/{post_id}/comments", json={"content": "Hi"}, headers=bob)
+    notifier.drain()
+    with count_queries() as statements:
+        response = client.get("/notifications/unread-count", headers=alice)
+    assert response.json() == {"unread_count": 3}
+    assert not any("notifications" in s for s in statements)
+
+    first = client.get("/notifications/", params={"limit": 2}, headers=alice)
+    second = client.get(
+        "/notifications/", params={"limit": 2, "before": first.headers["x-next-cursor"]}, headers=alice
+    )
+    ids = [n["id"] for n in first.json() + second.json()]
+    assert ids == sorted(ids, reverse=True) and len(ids) == 3
+    assert first.json()[0]["payload"]["post_id"] == post_ids[-1]
+
+    response = client.post("/notifications/read", json={"up_to_id": ids[1]}, headers=alice)
+    assert response.json() == {"unread_count": 1}
+    with count_queries() as statements:
+        assert client.get("/notifications/unread-count", headers=alice).json() == {"unread_count": 1}
+    assert not any("notifications" in s for s in statements)
+    assert client.get("/notifications/unread-count", headers=bob).json() == {"unread_count": 0}
+
+
+def test_uncached_unread_count_is_recounted_after_a_change(client: TestClient, monkeypatch):
+    """With no cached count to adjust, the next reads go to the database."""
+    monkeypatch.setattr(notifications, "UNREAD_RECOUNT_SECONDS", 0.05)
+    alice = register(client, "alice")
+    bob = register(client, "bob")
+    _, (post_id,) = create_posts(client, alice, 1)
+    client.post(f"/comments/posts/{post_id}/comments", json={"content": "Hi"}, headers=bob)
+    notifier.drain()
+
+    with count_queries() as statements:
+        assert client.get("/notifications/unread-count", headers=alice).json() == {"unread_count": 1}
+    assert any("count(notifications.id)" in s for s in statements)
+
+    time.sleep(0.06)  # past the recount window the count is cached again
+    client.get("/notifications/unread-count", headers=alice)
+    with count_queries() as statements:
+        assert client.get("/notifications/unread-count", headers=alice).json() == {"unread_count": 1}
+    assert not any("notifications" in s for s in statements)
+
+
+def test_new_activity_moves_group_up_and_stays_unread(client: TestClient):
+    """A coalesced group that gains activity sorts first and is not marked read unseen."""
+    alice = register(client, "alice")
+    bob = register(client, "bob")
+    _, (old, new) = create_posts(client, alice, 2)
+    client.post(f"/comments/posts/{old}/comments", json={"content": "First"}, headers=bob)
+    notifier.drain()
+    client.post(f"/comments/posts/{new}/comments", json={"content": "Second"}, headers=bob)
+    notifier.drain()
+    seen = client.get("/notifications/", headers=alice).json()
+    assert [n["payload"]["post_id"] for n in seen] == [new, old]
+
+    client.post(f"/comments/posts/{old}/comments", json={"content": "Again"}, headers=bob)
+    notifier.drain()
+    inbox = client.get("/notifications/", headers=alice).json()
+    assert [(n["payload"]["post_id"], n["count"]) for n in inbox] == [(old, 2), (new, 1)]
+
+    # Marking read what was on screen leaves the bumped group unread
+    response = client.post(
+        "/notifications/read", json={"up_to_id": seen[0]["id"], "updated_at": seen[0]["updated_at"]}, headers=alice
+    )
+    assert response.json() == {"unread_count": 1}
+
+
+def test_stream_entries_of_a_dead_consumer_are_claimed():
+    """Events a consumer read but never acked are redelivered to another."""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis(decode_responses=True)
+    dead = RedisStreamQueue(None, "events", claim_idle=0, client=client)
+    assert dead.consumer.endswith(f"-{os.getpid()}")
+    dead.put({"type": NEW_COMMENT, "post_id": 1, "actor_id": 2})
+    assert len(dead.get_batch(10, timeout=0)) == 1  # then the process dies
+
+    survivor = RedisStreamQueue(None, "events", consumer="survivor", claim_idle=0, client=client)
+    batch = survivor.get_batch(10, timeout=0)
+    assert [event["post_id"] for _, event in batch] == [1]
+    survivor.ack([token for token, _ in batch])
+    survivor.join()
+    assert survivor.get_batch(10, timeout=0) == []
+
+
+def test_forked_workers_read_as_distinct_consumers():
+    """A queue built in a preloading master gets a new consumer per worker."""
+    fakeredis = pytest.importorskip("fakeredis")
+    queue = RedisStreamQueue(None, "events", client=fakeredis.FakeRedis(decode_responses=True))
+    names = set()
+    for _ in range(2):
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write, queue.consumer.encode())
+            os._exit(0)
+        os.close(write)
+        names.add(os.read(read, 256).decode())
+        os.close(read)
+        os.waitpid(pid, 0)
+    assert len(names) == 2 and queue.consumer not in names
+
+
+def test_failed_batches_are_retried_then_dropped(client: TestClient, monkeypatch):
+    """A transient failure redelivers the batch; a poison event is given up on."""
+    alice = register(client, "alice")
+    bob = register(client, "bob")
+    _, (post_id,) = create_posts(client, alice, 1)
+    monkeypatch.setattr(notifier, "queue", MemoryEventQueue(max_deliveries=3))
+    real_process = notifier.process
+    failures = []
+
+    def flaky_process(events):
+        if len(failures) < 2:
+            failures.append(1)
+            raise RuntimeError("database went away")
+        return real_process(events)
+
+    monkeypatch.setattr(notifier, "process", flaky_process)
+    client.post(f"/comments/posts/{post_id}/comments", json={"content": "Hi"}, headers=bob)
+    notifier.drain()
+    assert [kind for kind, _ in notifications_for("alice")] == [NEW_COMMENT]
+
+    monkeypatch.setattr(notifier, "process", lambda events: 1 / 0)
+    client.post(f"/comments/posts/{post_id}/comments", json={"content": "Again"}, headers=bob)
+    notifier.drain()
+    notifier.queue.join()
+
+
+def test_stream_redelivers_failed_entries_up_to_the_limit():
+    """Unacked stream entries are claimed again until delivered max_deliveries times."""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis(decode_responses=True)
+    queue = RedisStreamQueue(None, "events", claim_idle=0, max_deliveries=2, client=client)
+    queue.put({"type": NEW_COMMENT, "post_id": 1, "actor_id": 2})
+
+    for _ in range(2):
+        batch = queue.get_batch(10, timeout=0)
+        assert len(batch) == 1
+        queue.retry([token for token, _ in batch])
+        time.sleep(0.01)
+    assert queue.get_batch(10, timeout=0) == []
+    assert client.xlen("events") == 0
@@ -0,0 +1,45 @@
+"""Tests for denormalized post counters."""
+from fastapi.testclient import TestClient
+
+from app.models.post import Post as PostModel
+from app.services.post_counters import repair_post_counters
+from tests.helpers import create_posts, register
+
+
+def test_counters_follow_comments_and_reactions(client: TestClient):
+    """Comment and reaction writes keep the Post counters current."""
+    alice = register(client, "alice")
+    _, (post_id,) = create_posts(client, alice, 1)
+
+    client.post(f"/comments/posts/{post_id}/comments", json={"content": "Lovely"}, headers=alice)
+    client.post(f"/comments/posts/{post_id}/comments", json={"content": "Again"}, headers=alice)
+    heart = client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "heart"}, headers=alice).json()
+    client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "heart"}, headers=alice)
+    client.post(f"/reactions/posts/{post_id}/reactions/toggle", json={"type": "star"}, headers=alice)
+
+    post = client.get(f"/posts/{post_id}").json()
+    assert post["comment_count"] == 2
+    assert post["reaction_counts"] == {"heart": 1, "star": 1}
+
+    client.delete(f"/reactions/{heart['id']}", headers=alice)
+    client.post(f"/reactions/posts/{post_id}/reactions/toggle", json={"type": "star"}, headers=alice)
+    assert client.get(f"/posts/{post_id}").json()["reaction_counts"] == {}
+
+
+def test_repair_post_counters_fixes_drift(client: TestClient, db_session):
+    """The repair job recomputes counters that drifted from the source rows."""
+    alice = register(client, "alice")
+    _, (post_id, other_id) = create_posts(client, alice, 2)
+    client.post(f"/comments/posts/{post_id}/comments", json={"content": "Hi"}, headers=alice)
+    client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "like"}, headers=alice)
+
+    db_session.query(PostModel).filter(PostModel.id == post_id).update(
+        {"comment_count": 7, "reaction_counts": {"like": 4, "boo": 1}}
+    )
+    db_session.commit()
+
+    assert repair_post_counters(db_session, batch_size=1) == 1
+    post = client.get(f"/posts/{post_id}").json()
+    assert post["comment_count"] == 1
+    assert post["reaction_counts"] == {"like": 1}
+    assert repair_post_counters(db_session) == 0
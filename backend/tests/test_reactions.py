@@ -0,0 +1,110 @@
+"""Tests for reaction endpoints."""
+from fastapi.testclient import TestClient
+
+from tests.helpers import TestingSessionLocal, create_posts, register
+
+
+def test_reaction_summary_batches_posts(client: TestClient):
+    """Summary returns per-type counts and the caller's reactions, in request order."""
+    alice = register(client, "alice")
+    bob = register(client, "bobby")
+    _, (first, second, third) = create_posts(client, alice, 3)
+
+    client.post(f"/reactions/posts/{first}/reactions", json={"type": "heart"}, headers=alice)
+    client.post(f"/reactions/posts/{first}/reactions", json={"type": "heart"}, headers=bob)
+    client.post(f"/reactions/posts/{second}/reactions", json={"type": "star"}, headers=bob)
+
+    response = client.get(
+        "/reactions/summary", params={"post_ids": f"{third},{first},{second}"}, headers=alice
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"post_id": third, "counts": {}, "my_reactions": []},
+        {"post_id": first, "counts": {"heart": 2}, "my_reactions": ["heart"]},
+        {"post_id": second, "counts": {"star": 1}, "my_reactions": []},
+    ]
+
+    too_many = ",".join(str(i) for i in range(1, 102))
+    assert client.get("/reactions/summary", params={"post_ids": too_many}).status_code == 422
+
+
+def test_realm_posts_include_reaction_summary(client: TestClient):
+    """Realm post listings can inline reaction summaries."""
+    alice = register(client, "alice")
+    realm_id, (post_id,) = create_posts(client, alice, 1)
+    client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "like"}, headers=alice)
+
+    plain = client.get(f"/posts/realms/{realm_id}/posts").json()
+    assert plain[0]["reaction_summary"] is None
+
+    inline = client.get(
+        f"/posts/realms/{realm_id}/posts", params={"include_reactions": True}, headers=alice
+    ).json()
+    assert inline[0]["reaction_summary"] == {
+        "post_id": post_id, "counts": {"like": 1}, "my_reactions": ["like"]
+    }
+
+
+def test_create_reaction_is_idempotent(client: TestClient):
+    """Reacting twice returns the same reaction; unknown posts 404."""
+    alice = register(client, "alice")
+    _, (post_id,) = create_posts(client, alice, 1)
+
+    first = client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "heart"}, headers=alice)
+    second = client.post(f"/reactions/posts/{post_id}/reactions", json={"type": "heart"}, headers=alice)
+    assert first.status_code == 201
+    assert second.json()["id"] == first.json()["id"]
+
+    missing = client.post("/reactions/posts/9999/reactions", json={"type": "heart"}, headers=alice)
+    assert missing.status_code == 404
+
+
+def test_toggle_reaction(client: TestClient):
+    """Toggle alternates between adding and removing a reaction."""
+    alice = register(client, "alice")
+    _, (post_id,) = create_posts(client, alice, 1)
+    url = f"/reactions/posts/{post_id}/reactions/toggle"
+
+    on = client.post(url, json={"type": "star"}, headers=alice).json()
+    assert on["reacted"] is True
+    assert on["reaction"]["type"] == "star"
+
+    off = client.post(url, json={"type": "star"}, headers=alice).json()
+    assert off == {"reacted": False, "reaction": None}
+
+    summary = client.get("/reactions/summary", params={"post_ids": str(post_id)}).json()
+    assert summary[0]["counts"] == {}
+
+
+def test_concurrent_reactions_never_duplicate(client: TestClient):
+    """Many threads reacting to one post at once leave one row per user and type."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.models.reaction import Reaction as ReactionModel
+    from app.services.reactions import insert_reaction
+
+    alice = register(client, "alice")
+    _, (post_id,) = create_posts(client, alice, 1)
+    for name in ("bobby", "carol", "dylan"):
+        register(client, name)
+    user_ids = [1, 2, 3, 4]
+
+    def tap(i: int) -> bool:
+        db = TestingSessionLocal()
+        try:
+            row = insert_reaction(db, post_id, user_ids[i % len(user_ids)], "heart")
+            db.commit()
+            return row is not None
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        inserted = list(pool.map(tap, range(200)))
+
+    db = TestingSessionLocal()
+    try:
+        rows = db.query(ReactionModel).filter(ReactionModel.post_id == post_id).all()
+    finally:
+        db.close()
+    assert sum(inserted) == len(user_ids)
+    assert sorted(r.user_id for r in rows) == user_ids
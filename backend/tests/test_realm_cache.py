@@ -0,0 +1,41 @@
+"""Tests for the cached realm directory."""
+from fastapi.testclient import TestClient
+
+from tests.helpers import count_queries, get_auth_token
+
+
+def test_repeated_realm_reads_hit_no_database(client: TestClient):
+    """Listing and fetching realms a second time issues zero queries."""
+    token = get_auth_token(client)
+    created = client.post(
+        "/realms/",
+        json={"name": "Owl Keep", "slug": "owl-keep"},
+        headers={"Authorization": f"Bearer {token}"}
+    ).json()
+
+    client.get("/realms/")
+    client.get(f"/realms/{created['id']}")
+    client.get("/realms/by-slug/owl-keep")
+
+    with count_queries() as statements:
+        listing = client.get("/realms/")
+        by_id = client.get(f"/realms/{created['id']}")
+        by_slug = client.get("/realms/by-slug/owl-keep")
+
+    assert statements == []
+    assert "owl-keep" in [r["slug"] for r in listing.json()]
+    assert by_id.json()["slug"] == "owl-keep"
+    assert by_slug.json()["id"] == created["id"]
+
+
+def test_create_realm_invalidates_listing(client: TestClient):
+    """A new realm shows up in the cached public listing immediately."""
+    token = get_auth_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/realms/", json={"name": "First", "slug": "first"}, headers=headers)
+    assert "first" in [r["slug"] for r in client.get("/realms/").json()]
+
+    client.post("/realms/", json={"name": "Second", "slug": "second"}, headers=headers)
+    slugs = [r["slug"] for r in client.get("/realms/").json()]
+    assert "first" in slugs
+    assert "second" in slugs
@@ -0,0 +1,28 @@
+"""Tests for fast JSON list responses."""
+import asyncio
+import json
+from typing import List
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from fastapi.testclient import TestClient
+
+from app.core.responses import dump_model_list
+from app.models.post import Post as PostModel
+from app.schemas.post import Post
+from tests.helpers import create_posts, register
+
+
+def test_direct_encoding_matches_response_model_output(client: TestClient, db_session):
+    """model_list_response produces what FastAPI's response_model path did."""
+    headers = register(client, "alice")
+    realm_id, _ = create_posts(client, headers, 3)
+    posts = db_session.query(PostModel).order_by(PostModel.id).all()
+
+    field = create_response_field(name="posts", type_=List[Post])
+    expected = asyncio.run(serialize_response(field=field, response_content=posts))
+    assert json.loads(dump_model_list(Post, posts)) == expected
+
+    listed = client.get(f"/posts/realms/{realm_id}/posts", headers=headers)
+    assert listed.headers["content-type"] == "application/json"
+    assert sorted(p["id"] for p in listed.json()) == [p["id"] for p in expected]
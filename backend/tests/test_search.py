@@ -0,0 +1,88 @@
+"""Tests for full-text search."""
+from fastapi.testclient import TestClient
+
+from tests.helpers import get_auth_token
+
+
+def create_realm_with_post(client: TestClient, token: str, slug: str, is_public: bool, content: str) -> int:
+    """Helper to create a realm containing one post."""
+    headers = {"Authorization": f"Bearer {token}"}
+    realm = client.post(
+        "/realms/",
+        json={"name": slug.title(), "slug": slug, "is_public": is_public},
+        headers=headers
+    ).json()
+    client.post(
+        f"/posts/realms/{realm['id']}/posts",
+        json={"title": "A tale", "content": content, "content_type": "narration"},
+        headers=headers
+    )
+    return realm["id"]
+
+
+def test_search_ranks_and_highlights_posts(client: TestClient):
+    """Matching posts come back with a highlighted snippet."""
+    token = get_auth_token(client)
+    create_realm_with_post(client, token, "skyreach", True, "The dragons circled the burning tower at dusk.")
+
+    response = client.get("/search/", params={"q": "dragon tower"})
+    assert response.status_code == 200
+    hits = response.json()
+    assert len(hits) == 1
+    assert hits[0]["kind"] == "post"
+    assert "<mark>" in hits[0]["snippet"]
+
+
+def test_search_respects_realm_visibility(client: TestClient):
+    """Posts in private realms are only visible to members."""
+    owner_token = get_auth_token(client, "owner")
+    realm_id = create_realm_with_post(client, owner_token, "hidden-vale", False, "A secret griffin nest.")
+    outsider_token = get_auth_token(client, "outsider")
+
+    assert client.get("/search/", params={"q": "griffin"}).json() == []
+    outsider = client.get(
+        "/search/", params={"q": "griffin"}, headers={"Authorization": f"Bearer {outsider_token}"}
+    ).json()
+    assert outsider == []
+
+    owner = client.get(
+        "/search/", params={"q": "griffin"}, headers={"Authorization": f"Bearer {owner_token}"}
+    ).json()
+    assert [h["realm_id"] for h in owner] == [realm_id]
+
+
+def test_search_filters_and_characters(client: TestClient):
+    """content_type filters posts; private characters stay hidden from others."""
+    token = get_auth_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    create_realm_with_post(client, token, "moonfall", True, "Moonlit wolves howl over the ridge.")
+    client.post(
+        "/characters/",
+        json={"name": "Wren", "short_bio": "Raised by moonlit wolves", "visibility": "private"},
+        headers=headers
+    )
+
+    assert client.get("/search/", params={"q": "wolves", "content_type": "ooc"}).json() == []
+    assert [h["kind"] for h in client.get("/search/", params={"q": "wolves"}).json()] == ["post"]
+
+    mine = client.get("/search/", params={"q": "wolves", "kinds": "character"}, headers=headers).json()
+    assert [h["title"] for h in mine] == ["Wren"]
+
+
+def test_scores_are_normalized_per_kind_before_merging(client: TestClient):
+    """Each kind's best hit ranks 1.0; weaker hits keep their order within the kind."""
+    token = get_auth_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    create_realm_with_post(client, token, "emberfall", True, "Ember ember ember: the ember drake wakes.")
+    create_realm_with_post(
+        client, token, "ashgrove", True,
+        "A long chronicle of the grove, its wardens, its rivers and its many songs, and once an ember.",
+    )
+    client.post("/characters/", json={"name": "Cinder", "short_bio": "Keeper of the ember"}, headers=headers)
+
+    hits = client.get("/search/", params={"q": "ember"}).json()
+    posts = [h["rank"] for h in hits if h["kind"] == "post"]
+    characters = [h["rank"] for h in hits if h["kind"] == "character"]
+    assert posts[0] == 1.0 and 0 < posts[1] < 1.0
+    assert characters == [1.0]
+    assert hits[-1]["rank"] == posts[1]
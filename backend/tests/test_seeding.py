@@ -0,0 +1,61 @@
+"""Tests for versioned startup seeding."""
+from app.core.seeding import applied_versions, run_seeds
+from app.core.starter_seed import STARTER_REALMS
+from app.models.post import Post
+from app.models.realm import Realm
+from app.models.user import User
+from tests.helpers import TestingSessionLocal, count_queries
+
+STARTER_POSTS = sum(len(realm["posts"]) for realm in STARTER_REALMS)
+
+
+def add_user(db) -> User:
+    """Helper to create a user directly."""
+    user = User(email="owl@example.com", username="owl", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_seeds_wait_for_a_user_then_run_once(db_session, monkeypatch):
+    """Seeds needing an owner stay pending; once done a boot costs one query."""
+    monkeypatch.delenv("ADMIN_EMAIL", raising=False)
+    assert run_seeds(TestingSessionLocal) == []
+    assert applied_versions(TestingSessionLocal) == {}
+
+    add_user(db_session)
+    assert run_seeds(TestingSessionLocal) == ["commons_realm", "starter_content"]
+    assert db_session.query(Realm).count() == len(STARTER_REALMS) + 1
+    assert db_session.query(Post).count() == STARTER_POSTS
+
+    with count_queries() as statements:
+        assert run_seeds(TestingSessionLocal) == []
+    assert len(statements) == 1
+
+
+def test_forced_rerun_only_fills_gaps(db_session, monkeypatch):
+    """Rerunning the starter seed restores missing posts without duplicates."""
+    monkeypatch.delenv("ADMIN_EMAIL", raising=False)
+    add_user(db_session)
+    run_seeds(TestingSessionLocal)
+    db_session.delete(db_session.query(Post).order_by(Post.id).first())
+    db_session.commit()
+
+    assert run_seeds(TestingSessionLocal, force=True) == ["commons_realm", "starter_content"]
+    assert db_session.query(Post).count() == STARTER_POSTS
+    assert db_session.query(Realm).count() == len(STARTER_REALMS) + 1
+
+
+def test_changing_admin_email_creates_the_new_admin(db_session, monkeypatch):
+    """The admin seed is pending again once the configured identity changes."""
+    monkeypatch.setenv("ADMIN_PASSWORD", "owlsecret123")
+    monkeypatch.setenv("ADMIN_EMAIL", "first@example.com")
+    first = run_seeds(TestingSessionLocal)
+    assert first[0].startswith("admin_user:")
+    assert run_seeds(TestingSessionLocal) == []
+
+    monkeypatch.setenv("ADMIN_EMAIL", "second@example.com")
+    monkeypatch.setenv("ADMIN_USERNAME", "admin2")
+    second = run_seeds(TestingSessionLocal)
+    assert len(second) == 1 and second[0] != first[0]
+    assert db_session.query(User).filter(User.email == "second@example.com").count() == 1
@@ -0,0 +1,27 @@
+"""Tests for the production launcher."""
+from app.core.config import settings
+from app.serve import default_workers, options, prepare_master
+
+
+def test_worker_count_follows_cpus_within_cap(monkeypatch):
+    """One worker per CPU up to the cap, unless WEB_CONCURRENCY is set."""
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 0)
+    monkeypatch.setattr(settings, "WEB_MAX_WORKERS", 8)
+    assert default_workers(cpus=1) == 1
+    assert default_workers(cpus=4) == 4
+    assert default_workers(cpus=64) == 8
+
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 3)
+    assert default_workers(cpus=64) == 3
+
+
+def test_master_seeds_then_workers_skip_seeding(monkeypatch):
+    """Seeding runs before fork and is turned off for the workers."""
+    calls = []
+    monkeypatch.setattr(settings, "SEED_ON_STARTUP", True)
+    monkeypatch.setattr("app.core.seeding.run_seeds", lambda: calls.append(1) or [])
+
+    prepare_master()
+    assert calls == [1]
+    assert settings.SEED_ON_STARTUP is False
+    assert options(2, "127.0.0.1:8000")["preload_app"] is True
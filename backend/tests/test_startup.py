@@ -0,0 +1,44 @@
+"""Tests for worker cold start."""
+import json
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from app.core.startup import startup_timings
+
+# Generous for CI machines; a fresh `import app.main` takes well under half this
+COLD_START_BUDGET_SECONDS = 5.0
+LAZY_MODULES = ["httpx", "passlib.context", "redis"]
+
+
+def test_cold_import_is_lazy_and_within_budget():
+    """Importing the app skips heavy optional subsystems and stays in budget."""
+    code = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import app.main\n"
+        "print(json.dumps({'seconds': time.perf_counter() - started,"
+        f" 'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    report = json.loads(result.stdout.splitlines()[-1])
+    assert report["loaded"] == []
+    assert report["seconds"] < COLD_START_BUDGET_SECONDS
+
+
+def test_routes_are_served_under_api_prefix(client: TestClient):
+    """Every route answers under /api too, and redirects keep the prefix."""
+    assert client.get("/api/health").json() == client.get("/health").json()
+    assert client.get("/api/realms/").status_code == 200
+
+    redirect = client.get("/api/realms", follow_redirects=False)
+    assert redirect.status_code == 307
+    assert redirect.headers["location"].endswith("/api/realms/")
+    assert client.get("/apix/realms/").status_code == 404
+
+
+def test_lifespan_steps_are_timed(client: TestClient):
+    """Startup steps are recorded for the profile report."""
+    assert "workers" in startup_timings
+    assert "seed" in startup_timings
@@ -55,8 +55,11 @@ export interface Post {
   content: string;
   content_type: 'ic' | 'ooc' | 'narration';
   post_kind?: 'general' | 'open_starter' | 'finished_piece';
+  comment_count?: number;
+  reaction_counts?: Record<string, number>;
   created_at: string;
   updated_at: string;
+  reaction_summary?: ReactionSummary | null;
 }
 
 export interface Comment {
@@ -64,12 +67,30 @@ export interface Comment {
   post_id: number;
   author_user_id: number;
   character_id?: number;
+  parent_comment_id?: number;
+  author_username?: string;
+  character_name?: string;
   content: string;
   content_type?: 'ic' | 'ooc' | 'narration';
   created_at: string;
   updated_at: string;
 }
 
+export interface PostCommentPreview {
+  post_id: number;
+  comments: Comment[];
+}
+
+export interface Notification {
+  id: number;
+  type: 'new_comment' | 'new_reaction' | 'new_scene_post';
+  payload?: Record<string, unknown>;
+  count: number;
+  is_read: boolean;
+  created_at: string;
+  updated_at: string;
+}
+
 export interface Reaction {
   id: number;
   post_id: number;
@@ -78,6 +99,12 @@ export interface Reaction {
   created_at: string;
 }
 
+export interface ReactionSummary {
+  post_id: number;
+  counts: Record<string, number>;
+  my_reactions: string[];
+}
+
 export interface Token {
   access_token: string;
   token_type: string;